@@ -0,0 +1,40 @@
+"""add permissions updated_at
+
+Revision ID: 20261019_0003
+Revises: 20260212_0002
+Create Date: 2026-10-19 00:00:03.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0003"
+down_revision = "20260212_0002"
+branch_labels = None
+depends_on = None
+
+
+def _recreate_mode() -> str:
+    # SQLite tidak mengizinkan ADD COLUMN dengan default non-konstan (CURRENT_TIMESTAMP).
+    return "always" if op.get_bind().dialect.name == "sqlite" else "auto"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("permissions", recreate=_recreate_mode()) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+        )
+    op.execute("UPDATE permissions SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("permissions", recreate=_recreate_mode()) as batch_op:
+        batch_op.drop_column("updated_at")
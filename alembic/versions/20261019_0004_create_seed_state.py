@@ -0,0 +1,30 @@
+"""create seed_state table
+
+Revision ID: 20261019_0004
+Revises: 20261019_0003
+Create Date: 2026-10-19 00:00:04.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0004"
+down_revision = "20261019_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "seed_state",
+        sa.Column("name", sa.String(length=80), primary_key=True, nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("applied_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("seed_state")
@@ -0,0 +1,34 @@
+"""create cache_epochs table
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19 00:00:07.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0007"
+down_revision = "20261019_0006"
+branch_labels = None
+depends_on = None
+
+# Harus sama dengan `app.core.cache_epochs.FAMILIES`.
+FAMILIES = ("menu", "rbac", "user", "permission")
+
+
+def upgrade() -> None:
+    table = op.create_table(
+        "cache_epochs",
+        sa.Column("family", sa.String(length=40), primary_key=True, nullable=False),
+        sa.Column("epoch", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.bulk_insert(table, [{"family": family, "epoch": 0} for family in FAMILIES])
+
+
+def downgrade() -> None:
+    op.drop_table("cache_epochs")
@@ -0,0 +1,51 @@
+"""align indexes with repository queries
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19 00:00:08.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261019_0008"
+down_revision = "20261019_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Index balik tabel relasi: primary key komposit hanya melayani pencarian dari
+    # kolom pertamanya (user_id / role_id).
+    op.create_index("ix_user_roles_role_id", "user_roles", ["role_id"])
+    op.create_index("ix_role_permissions_permission_id", "role_permissions", ["permission_id"])
+    # Urutan MenuRepository.list; menggantikan index tunggal section_title.
+    op.create_index(
+        "ix_menus_section_parent_sort",
+        "menus",
+        ["section_title", "parent_id", "sort_order", "id"],
+    )
+    op.drop_index("ix_menus_section_title", table_name="menus")
+    # Sorting datatables berdasarkan tanggal dibuat.
+    op.create_index("ix_users_created_at", "users", ["created_at"])
+
+    # Kolom unik sudah punya index dari unique constraint-nya.
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_roles_name", table_name="roles")
+    op.drop_index("ix_permissions_code", table_name="permissions")
+    op.drop_index("ix_menus_menu_key", table_name="menus")
+
+
+def downgrade() -> None:
+    op.create_index("ix_menus_menu_key", "menus", ["menu_key"], unique=False)
+    op.create_index("ix_permissions_code", "permissions", ["code"], unique=False)
+    op.create_index("ix_roles_name", "roles", ["name"], unique=False)
+    op.create_index("ix_users_email", "users", ["email"], unique=False)
+
+    op.drop_index("ix_users_created_at", table_name="users")
+    op.create_index("ix_menus_section_title", "menus", ["section_title"], unique=False)
+    op.drop_index("ix_menus_section_parent_sort", table_name="menus")
+    op.drop_index("ix_role_permissions_permission_id", table_name="role_permissions")
+    op.drop_index("ix_user_roles_role_id", table_name="user_roles")
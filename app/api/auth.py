@@ -7,13 +7,22 @@ Rute yang tersedia:
 - GET /auth/me: mengambil profil user dari access token aktif.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi_jwt_auth import AuthJWT
-from passlib.context import CryptContext
 from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
+from app.core.activity import activity_tracker
+from app.core.audit import audit_log
+from app.core.cache_epochs import bump_epochs
+from app.core.config import ClaimsSettings
 from app.core.database import get_db
+from app.core.http_cache import PROFILE_CACHE_CONTROL, not_modified, weak_etag
+from app.core.permission_registry import encode_permission_ids, get_registry
+from app.core.response_cache import response_cache
+from app.core.security import hash_password, verify_password
 from app.models import Role, User
 from app.schemas.auth import (
     LoginRequest,
@@ -22,9 +31,14 @@ from app.schemas.auth import (
     RegisterRequest,
     TokenResponse,
 )
+from app.service_container import get_rbac_service
+from app.services.rbac_service import RBACService
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+claims_settings = ClaimsSettings()
+# Role + permission user dalam satu query tambahan (selectin role, join permission),
+# sehingga login/refresh cukup dua statement.
+_WITH_ACCESS_PROFILE = selectinload(User.roles).joinedload(Role.permissions)
 
 
 def _serialize_access_profile(user: User) -> tuple[list[str], list[str]]:
@@ -36,12 +50,25 @@ def _serialize_access_profile(user: User) -> tuple[list[str], list[str]]:
     return role_names, permission_codes
 
 
-def _build_token_response(Authorize: AuthJWT, user: User) -> TokenResponse:
-    """Buat pasangan JWT access token dan refresh token untuk user."""
+def _build_access_claims(user: User, db: Session) -> dict[str, Any]:
+    """Claims access token: daftar string, atau bitmask compact jika diaktifkan."""
     roles, permissions = _serialize_access_profile(user)
-    claims = {"roles": roles, "permissions": permissions}
+    if not claims_settings.compact_permissions:
+        return {"roles": roles, "permissions": permissions}
+    permission_ids = {
+        permission.id for role in user.roles for permission in role.permissions
+    }
+    return {
+        "roles": roles,
+        "pv": get_registry(db).version,
+        "pm": encode_permission_ids(permission_ids),
+    }
+
+
+def _build_token_response(Authorize: AuthJWT, user: User, db: Session) -> TokenResponse:
+    """Buat pasangan JWT access token dan refresh token untuk user."""
     access_token = Authorize.create_access_token(
-        subject=str(user.id), user_claims=claims
+        subject=str(user.id), user_claims=_build_access_claims(user, db)
     )
     refresh_token = Authorize.create_refresh_token(subject=str(user.id))
     return TokenResponse(access_token=access_token, refresh_token=refresh_token)
@@ -65,11 +92,14 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> dict[st
     user = User(
         full_name=payload.full_name,
         email=payload.email,
-        password_hash=pwd_context.hash(payload.password),
+        password_hash=hash_password(payload.password),
         is_active=True,
     )
     db.add(user)
+    bump_epochs(db, "user")
     db.commit()
+    response_cache.invalidate("user")
+    audit_log.record("user.register", "user", user.id, {"email": user.email})
     return {"message": "User registered"}
 
 
@@ -86,11 +116,11 @@ def login(
     query = (
         select(User)
         .where(User.email == payload.email)
-        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .options(_WITH_ACCESS_PROFILE)
     )
     user = db.scalar(query)
 
-    if not user or not pwd_context.verify(payload.password, user.password_hash):
+    if not user or not verify_password(payload.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -101,7 +131,8 @@ def login(
             status_code=status.HTTP_403_FORBIDDEN, detail="User is inactive"
         )
 
-    return _build_token_response(Authorize, user)
+    activity_tracker.logged_in(user.id)
+    return _build_token_response(Authorize, user, db)
 
 
 @router.post("/refresh", response_model=RefreshResponse)
@@ -115,32 +146,51 @@ def refresh(
     user = db.scalar(
         select(User)
         .where(User.id == int(user_id))  # type: ignore
-        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .options(_WITH_ACCESS_PROFILE)
     )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
-    roles, permissions = _serialize_access_profile(user)
     access_token = Authorize.create_access_token(
-        subject=str(user.id), user_claims={"roles": roles, "permissions": permissions}
+        subject=str(user.id), user_claims=_build_access_claims(user, db)
     )
     return RefreshResponse(access_token=access_token)
 
 
 @router.get("/me", response_model=MeResponse)
-def me(Authorize: AuthJWT = Depends(), db: Session = Depends(get_db)) -> MeResponse:
+def me(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    rbac_service: RBACService = Depends(get_rbac_service),
+) -> MeResponse | Response:
     """Ambil profil user saat ini dari access token.
 
     Mengembalikan identitas dasar user serta daftar role dan permission.
+    ETag diturunkan dari `updated_at` user (ikut berubah saat assign/remove role)
+    dan versi RBAC global, sehingga polling tanpa perubahan cukup dibalas 304.
     """
-    Authorize.jwt_required()
-    user_id = Authorize.get_jwt_subject()
+    # Token sudah diverifikasi middleware autentikasi; cukup pakai claims-nya.
+    user_id = request.state.jwt_claims["sub"]
+    user_updated_at = db.scalar(
+        select(User.updated_at).where(User.id == int(user_id))  # type: ignore
+    )
+    if user_updated_at is not None:
+        etag = weak_etag(
+            "me", user_id, user_updated_at.isoformat(), rbac_service.get_version()
+        )
+        cached = not_modified(
+            request, response, etag, PROFILE_CACHE_CONTROL, vary="Authorization"
+        )
+        if cached:
+            return cached
+
     user = db.scalar(
         select(User)
         .where(User.id == int(user_id))  # type: ignore
-        .options(selectinload(User.roles).selectinload(Role.permissions))
+        .options(_WITH_ACCESS_PROFILE)
     )
     if not user:
         raise HTTPException(
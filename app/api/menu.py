@@ -1,47 +1,103 @@
 """Endpoint CRUD menu berbasis FastAPI."""
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
-from app.models.menu import MenuCreate, MenuResponse, MenuUpdate
+from app.core.authorization import require_permission
+from app.core.http_cache import MENU_CACHE_CONTROL, not_modified, weak_etag
+from app.core.response_cache import cached_json, json_response
+from app.core.serialization import plan_for
+from app.models.menu import (
+    MenuBulkResponse,
+    MenuBulkUpdate,
+    MenuCreate,
+    MenuResponse,
+    MenuUpdate,
+)
 from app.service_container import get_menu_service
 from app.services.menu_service import MenuService
 
 # Router utama untuk semua endpoint menu.
 router = APIRouter(prefix="/menu", tags=["Menu"])
+# Semua mutasi menu butuh permission `menus.manage`; baca menu cukup token valid.
+manage_menus = [Depends(require_permission("menus.manage"))]
+# Plan serialisasi langsung ORM -> JSON bytes (tanpa validasi ganda).
+menu_plan = plan_for(MenuResponse)
 
 
 @router.get("/", response_model=list[MenuResponse])
 def list_menus(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
     service: MenuService = Depends(get_menu_service),
-) -> list[MenuResponse]:
+) -> list[MenuResponse] | Response:
     """Ambil daftar menu dengan pagination sederhana."""
+    # Conditional GET: jika versi tree belum berubah, cukup balas 304.
+    etag = weak_etag("menu-list", service.get_tree_version(), skip, limit)
+    cached = not_modified(request, response, etag, MENU_CACHE_CONTROL)
+    if cached:
+        return cached
     # Route hanya mengatur input query + memanggil service.
-    # Output tetap mengikuti response_model (MenuResponse).
-    menus = service.list_menus(skip=skip, limit=limit)
-    return [MenuResponse.from_orm(menu) for menu in menus]
+    # Body JSON di-cache per (skip, limit) dan dibuang saat ada write menu.
+    body = cached_json(
+        ("menu-list", skip, limit),
+        "menu",
+        lambda: menu_plan.dumps_many(service.list_menus(skip=skip, limit=limit)),
+    )
+    return json_response(body, request, response)
 
 
 @router.get("/all", response_model=list[MenuResponse])
-def get_all_menus(service: MenuService = Depends(get_menu_service)) -> list[MenuResponse]:
+def get_all_menus(
+    request: Request,
+    response: Response,
+    service: MenuService = Depends(get_menu_service),
+) -> list[MenuResponse] | Response:
     """Endpoint kompatibilitas untuk rute lama `/menu/all`."""
+    etag = weak_etag("menu-all", service.get_tree_version())
+    cached = not_modified(request, response, etag, MENU_CACHE_CONTROL)
+    if cached:
+        return cached
     # Route kompatibilitas agar endpoint lama tetap jalan.
-    menus = service.list_menus(skip=0, limit=500)
-    return [MenuResponse.from_orm(menu) for menu in menus]
+    body = cached_json(
+        ("menu-all",),
+        "menu",
+        lambda: menu_plan.dumps_many(service.list_menus(skip=0, limit=500)),
+    )
+    return json_response(body, request, response)
 
 
 @router.get("/{menu_id}", response_model=MenuResponse)
 def get_menu(
-    menu_id: int, service: MenuService = Depends(get_menu_service)
-) -> MenuResponse:
+    menu_id: int,
+    request: Request,
+    response: Response,
+    service: MenuService = Depends(get_menu_service),
+) -> MenuResponse | Response:
     """Ambil detail satu menu berdasarkan id."""
+    # Validator per baris: cukup baca kolom updated_at menu tersebut.
+    updated_at = service.get_menu_updated_at(menu_id)
+    if updated_at is not None:
+        etag = weak_etag("menu", menu_id, updated_at.isoformat())
+        cached = not_modified(request, response, etag, MENU_CACHE_CONTROL)
+        if cached:
+            return cached
     # `menu_id` diteruskan ke service untuk validasi + ambil data.
-    menu = service.get_menu(menu_id)
-    return MenuResponse.from_orm(menu)
+    body = cached_json(
+        ("menu", menu_id),
+        "menu",
+        lambda: menu_plan.dumps(service.get_menu(menu_id)),
+    )
+    return json_response(body, request, response)
 
 
-@router.post("/", response_model=MenuResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=MenuResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=manage_menus,
+)
 def create_menu(
     payload: MenuCreate,
     service: MenuService = Depends(get_menu_service),
@@ -52,7 +108,18 @@ def create_menu(
     return MenuResponse.from_orm(menu)
 
 
-@router.patch("/{menu_id}", response_model=MenuResponse)
+@router.patch("/bulk", response_model=MenuBulkResponse, dependencies=manage_menus)
+def bulk_update_menus(
+    payload: MenuBulkUpdate,
+    service: MenuService = Depends(get_menu_service),
+) -> MenuBulkResponse:
+    """Update banyak menu sekaligus (reorder/pindah parent) dalam satu transaksi."""
+    # Didaftarkan sebelum `/{menu_id}` agar path `bulk` tidak dianggap id.
+    updated = service.bulk_update_menus(payload)
+    return MenuBulkResponse(updated=updated, version=service.get_tree_version())
+
+
+@router.patch("/{menu_id}", response_model=MenuResponse, dependencies=manage_menus)
 def update_menu(
     menu_id: int,
     payload: MenuUpdate,
@@ -64,7 +131,9 @@ def update_menu(
     return MenuResponse.from_orm(menu)
 
 
-@router.delete("/{menu_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{menu_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=manage_menus
+)
 def delete_menu(
     menu_id: int, service: MenuService = Depends(get_menu_service)
 ) -> None:
@@ -0,0 +1,32 @@
+"""Endpoint unduh hasil profiler per request (lihat `app.core.profiler`)."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core.authorization import require_permission
+from app.core.profiler import PROFILE_PERMISSION, profile_store
+
+router = APIRouter(
+    prefix="/profiles",
+    tags=["Profiling"],
+    dependencies=[Depends(require_permission(PROFILE_PERMISSION))],
+)
+
+
+@router.get("/")
+def list_profiles() -> list[dict[str, Any]]:
+    """Daftar profile di ring (terbaru dulu) tanpa isi stack/SQL."""
+    return profile_store.recent()
+
+
+@router.get("/{profile_id}")
+def download_profile(profile_id: str) -> FileResponse:
+    """Unduh satu profile JSON (stack folded + daftar statement SQL)."""
+    path = profile_store.path_for(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
+        )
+    return FileResponse(path, media_type="application/json", filename=path.name)
@@ -1,42 +1,78 @@
 """Endpoint CRUD role/permission dan relasi RBAC."""
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
+from app.core.authorization import require_permission
+from app.core.http_cache import RBAC_CACHE_CONTROL, not_modified, weak_etag
+from app.core.response_cache import cached_json, json_response
+from app.core.serialization import plan_for
 from app.models.roles_permission import (
+    BulkAssignResponse,
     PermissionCreate,
     PermissionResponse,
     PermissionSummary,
     PermissionUpdate,
     RoleCreate,
+    RolePermissionBulkAssign,
+    RolePermissionReplace,
     RolePermissionResponse,
     RoleResponse,
     RoleSummary,
     RoleUpdate,
+    UserRoleBulkAssign,
     UserRoleResponse,
 )
 from app.service_container import get_rbac_service
 from app.services.rbac_service import RBACService
 
 router = APIRouter(prefix="/roles-permission", tags=["Roles & Permissions"])
+# Seluruh perubahan RBAC termasuk manajemen akses user.
+manage_access = [Depends(require_permission("users.manage"))]
+role_plan = plan_for(RoleResponse)
+permission_plan = plan_for(PermissionResponse)
 
 
 @router.get("/roles", response_model=list[RoleResponse])
 def list_roles(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
     service: RBACService = Depends(get_rbac_service),
-) -> list[RoleResponse]:
-    roles = service.list_roles(skip=skip, limit=limit)
-    return [RoleResponse.from_orm(role) for role in roles]
+) -> list[RoleResponse] | Response:
+    etag = weak_etag("roles", service.get_version(), skip, limit)
+    cached = not_modified(request, response, etag, RBAC_CACHE_CONTROL)
+    if cached:
+        return cached
+    body = cached_json(
+        ("roles", skip, limit),
+        "rbac",
+        lambda: role_plan.dumps_many(service.list_roles(skip=skip, limit=limit)),
+    )
+    return json_response(body, request, response)
 
 
 @router.get("/roles/{role_id}", response_model=RoleResponse)
-def get_role(role_id: int, service: RBACService = Depends(get_rbac_service)) -> RoleResponse:
-    role = service.get_role(role_id)
-    return RoleResponse.from_orm(role)
+def get_role(
+    role_id: int,
+    request: Request,
+    response: Response,
+    service: RBACService = Depends(get_rbac_service),
+) -> RoleResponse | Response:
+    body = cached_json(
+        ("role", role_id),
+        "rbac",
+        lambda: role_plan.dumps(service.get_role(role_id)),
+    )
+    return json_response(body, request, response)
 
 
-@router.post("/roles", response_model=RoleResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/roles",
+    response_model=RoleResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=manage_access,
+)
 def create_role(
     payload: RoleCreate, service: RBACService = Depends(get_rbac_service)
 ) -> RoleResponse:
@@ -44,7 +80,11 @@ def create_role(
     return RoleResponse.from_orm(role)
 
 
-@router.patch("/roles/{role_id}", response_model=RoleResponse)
+@router.patch(
+    "/roles/{role_id}",
+    response_model=RoleResponse,
+    dependencies=manage_access,
+)
 def update_role(
     role_id: int,
     payload: RoleUpdate,
@@ -54,33 +94,57 @@ def update_role(
     return RoleResponse.from_orm(role)
 
 
-@router.delete("/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/roles/{role_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=manage_access,
+)
 def delete_role(role_id: int, service: RBACService = Depends(get_rbac_service)) -> None:
     service.delete_role(role_id)
 
 
 @router.get("/permissions", response_model=list[PermissionResponse])
 def list_permissions(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
     service: RBACService = Depends(get_rbac_service),
-) -> list[PermissionResponse]:
-    permissions = service.list_permissions(skip=skip, limit=limit)
-    return [PermissionResponse.from_orm(permission) for permission in permissions]
+) -> list[PermissionResponse] | Response:
+    etag = weak_etag("permissions", service.get_version(), skip, limit)
+    cached = not_modified(request, response, etag, RBAC_CACHE_CONTROL)
+    if cached:
+        return cached
+    body = cached_json(
+        ("permissions", skip, limit),
+        "rbac",
+        lambda: permission_plan.dumps_many(
+            service.list_permissions(skip=skip, limit=limit)
+        ),
+    )
+    return json_response(body, request, response)
 
 
 @router.get("/permissions/{permission_id}", response_model=PermissionResponse)
 def get_permission(
-    permission_id: int, service: RBACService = Depends(get_rbac_service)
-) -> PermissionResponse:
-    permission = service.get_permission(permission_id)
-    return PermissionResponse.from_orm(permission)
+    permission_id: int,
+    request: Request,
+    response: Response,
+    service: RBACService = Depends(get_rbac_service),
+) -> PermissionResponse | Response:
+    body = cached_json(
+        ("permission", permission_id),
+        "rbac",
+        lambda: permission_plan.dumps(service.get_permission(permission_id)),
+    )
+    return json_response(body, request, response)
 
 
 @router.post(
     "/permissions",
     response_model=PermissionResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=manage_access,
 )
 def create_permission(
     payload: PermissionCreate,
@@ -90,7 +154,11 @@ def create_permission(
     return PermissionResponse.from_orm(permission)
 
 
-@router.patch("/permissions/{permission_id}", response_model=PermissionResponse)
+@router.patch(
+    "/permissions/{permission_id}",
+    response_model=PermissionResponse,
+    dependencies=manage_access,
+)
 def update_permission(
     permission_id: int,
     payload: PermissionUpdate,
@@ -100,7 +168,11 @@ def update_permission(
     return PermissionResponse.from_orm(permission)
 
 
-@router.delete("/permissions/{permission_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/permissions/{permission_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=manage_access,
+)
 def delete_permission(
     permission_id: int, service: RBACService = Depends(get_rbac_service)
 ) -> None:
@@ -118,29 +190,37 @@ def get_user_roles(
     )
 
 
-@router.post("/users/{user_id}/roles/{role_id}", response_model=UserRoleResponse)
+@router.post(
+    "/users/{user_id}/roles/{role_id}",
+    response_model=UserRoleResponse,
+    dependencies=manage_access,
+)
 def assign_role_to_user(
     user_id: int,
     role_id: int,
     service: RBACService = Depends(get_rbac_service),
 ) -> UserRoleResponse:
-    user = service.assign_role_to_user(user_id, role_id)
+    roles = service.assign_role_to_user(user_id, role_id)
     return UserRoleResponse(
-        user_id=user.id,
-        roles=[RoleSummary.from_orm(role) for role in user.roles],
+        user_id=user_id,
+        roles=[RoleSummary.from_orm(role) for role in roles],
     )
 
 
-@router.delete("/users/{user_id}/roles/{role_id}", response_model=UserRoleResponse)
+@router.delete(
+    "/users/{user_id}/roles/{role_id}",
+    response_model=UserRoleResponse,
+    dependencies=manage_access,
+)
 def remove_role_from_user(
     user_id: int,
     role_id: int,
     service: RBACService = Depends(get_rbac_service),
 ) -> UserRoleResponse:
-    user = service.remove_role_from_user(user_id, role_id)
+    roles = service.remove_role_from_user(user_id, role_id)
     return UserRoleResponse(
-        user_id=user.id,
-        roles=[RoleSummary.from_orm(role) for role in user.roles],
+        user_id=user_id,
+        roles=[RoleSummary.from_orm(role) for role in roles],
     )
 
 
@@ -160,17 +240,18 @@ def get_role_permissions(
 @router.post(
     "/roles/{role_id}/permissions/{permission_id}",
     response_model=RolePermissionResponse,
+    dependencies=manage_access,
 )
 def assign_permission_to_role(
     role_id: int,
     permission_id: int,
     service: RBACService = Depends(get_rbac_service),
 ) -> RolePermissionResponse:
-    role = service.assign_permission_to_role(role_id, permission_id)
+    permissions = service.assign_permission_to_role(role_id, permission_id)
     return RolePermissionResponse(
-        role_id=role.id,
+        role_id=role_id,
         permissions=[
-            PermissionSummary.from_orm(permission) for permission in role.permissions
+            PermissionSummary.from_orm(permission) for permission in permissions
         ],
     )
 
@@ -178,13 +259,58 @@ def assign_permission_to_role(
 @router.delete(
     "/roles/{role_id}/permissions/{permission_id}",
     response_model=RolePermissionResponse,
+    dependencies=manage_access,
 )
 def remove_permission_from_role(
     role_id: int,
     permission_id: int,
     service: RBACService = Depends(get_rbac_service),
 ) -> RolePermissionResponse:
-    role = service.remove_permission_from_role(role_id, permission_id)
+    permissions = service.remove_permission_from_role(role_id, permission_id)
+    return RolePermissionResponse(
+        role_id=role_id,
+        permissions=[
+            PermissionSummary.from_orm(permission) for permission in permissions
+        ],
+    )
+
+
+@router.post(
+    "/user-roles/bulk",
+    response_model=BulkAssignResponse,
+    dependencies=manage_access,
+)
+def bulk_assign_roles_to_users(
+    payload: UserRoleBulkAssign, service: RBACService = Depends(get_rbac_service)
+) -> BulkAssignResponse:
+    inserted = service.bulk_assign_roles_to_users(payload)
+    return BulkAssignResponse(requested=len(payload.pairs), inserted=inserted)
+
+
+@router.post(
+    "/role-permissions/bulk",
+    response_model=BulkAssignResponse,
+    dependencies=manage_access,
+)
+def bulk_assign_permissions_to_roles(
+    payload: RolePermissionBulkAssign,
+    service: RBACService = Depends(get_rbac_service),
+) -> BulkAssignResponse:
+    inserted = service.bulk_assign_permissions_to_roles(payload)
+    return BulkAssignResponse(requested=len(payload.pairs), inserted=inserted)
+
+
+@router.put(
+    "/roles/{role_id}/permissions",
+    response_model=RolePermissionResponse,
+    dependencies=manage_access,
+)
+def replace_role_permissions(
+    role_id: int,
+    payload: RolePermissionReplace,
+    service: RBACService = Depends(get_rbac_service),
+) -> RolePermissionResponse:
+    role = service.replace_role_permissions(role_id, payload)
     return RolePermissionResponse(
         role_id=role.id,
         permissions=[
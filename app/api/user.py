@@ -1,28 +1,59 @@
 """Endpoint CRUD user berbasis FastAPI."""
 
-from fastapi import APIRouter, Depends, Query, Request, status
+import anyio
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import select
 
+from app.core.authorization import require_permission
+from app.core.deadline import request_deadline
+from app.core.response_cache import cached_json, json_response
+from app.core.serialization import plan_for
 from app.models import User as UserEntity
-from app.models.user import UserCreate, UserResponse, UserUpdate
-from app.service_container import get_datatables_service, get_user_service
+from app.models.user import UserCreate, UserImportReport, UserResponse, UserUpdate
+from app.service_container import (
+    get_datatables_service,
+    get_user_import_service,
+    get_user_service,
+)
+from app.services import user_import_service
 from app.services.datatables_service import DataTablesService
+from app.services.user_import_service import UserImportService
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/user", tags=["User"])
+manage_users = [Depends(require_permission("users.manage"))]
+user_plan = plan_for(UserResponse)
 
 
 @router.get("/", response_model=list[UserResponse])
 def list_users(
+    request: Request,
+    response: Response,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
     service: UserService = Depends(get_user_service),
-) -> list[UserResponse]:
-    users = service.list_users(skip=skip, limit=limit)
-    return [UserResponse.from_orm(user) for user in users]
+) -> list[UserResponse] | Response:
+    body = cached_json(
+        ("users", skip, limit),
+        "user",
+        lambda: user_plan.dumps_many(service.list_users(skip=skip, limit=limit)),
+    )
+    return json_response(body, request, response)
 
 
-@router.get("/datatables")
+# Search datatables memakai LIKE di semua kolom: dibatasi ketat agar query liar tidak
+# menahan koneksi pool.
+@router.get("/datatables", dependencies=[Depends(request_deadline(5))])
 def list_users_datatables(
     request: Request,
     datatables_service: DataTablesService = Depends(get_datatables_service),
@@ -42,6 +73,8 @@ def list_users_datatables(
         "email": UserEntity.email,
         "is_active": UserEntity.is_active,
         "created_at": UserEntity.created_at,
+        "last_login_at": UserEntity.last_login_at,
+        "last_seen_at": UserEntity.last_seen_at,
     }
 
     return datatables_service.build_response(
@@ -57,19 +90,89 @@ def list_users_datatables(
             "email": row.email,
             "is_active": row.is_active,
             "created_at": row.created_at.isoformat() if row.created_at else None,
+            "last_login_at": row.last_login_at.isoformat() if row.last_login_at else None,
+            "last_seen_at": row.last_seen_at.isoformat() if row.last_seen_at else None,
         },
     )
 
 
+@router.post(
+    "/import",
+    response_model=UserImportReport,
+    dependencies=[*manage_users, Depends(request_deadline(None))],
+)
+async def import_users(
+    request: Request,
+    source_format: str | None = Query(default=None, alias="format", regex="^(csv|ndjson)$"),
+    x_import_id: str | None = Header(default=None, max_length=64),
+    service: UserImportService = Depends(get_user_import_service),
+) -> UserImportReport:
+    """Import user massal dari body CSV atau NDJSON yang dibaca secara streaming.
+
+    Format diambil dari query `format`, atau dari `Content-Type`
+    (`application/x-ndjson` / `text/csv`). Progress bisa dipantau lewat
+    `GET /user/import/{import_id}`; id bisa ditentukan client via `X-Import-Id`
+    (`409` jika id tersebut sudah dipakai).
+    """
+    content_type = request.headers.get("content-type", "")
+    fmt = source_format or ("ndjson" if "json" in content_type else "csv")
+    report = await run_in_threadpool(service.start, x_import_id)
+    batch_size = user_import_service.settings.batch_size
+    outcome = "failed"
+    try:
+        chunk = []
+        async for record in user_import_service.iter_records(request.stream(), fmt):
+            chunk.append(record)
+            if len(chunk) >= batch_size:
+                await run_in_threadpool(service.import_chunk, report, chunk)
+                chunk = []
+        if chunk:
+            await run_in_threadpool(service.import_chunk, report, chunk)
+        outcome = "completed"
+    finally:
+        # Termasuk saat client putus (CancelledError): laporan tidak boleh tertinggal
+        # "running", jadi status akhir ditulis di scope yang tidak ikut dibatalkan.
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(service.finish, report, outcome)
+    return report
+
+
+@router.get(
+    "/import/{import_id}", response_model=UserImportReport, dependencies=manage_users
+)
+def get_import_report(
+    import_id: str, service: UserImportService = Depends(get_user_import_service)
+) -> UserImportReport:
+    """Ambil progress/hasil import user berdasarkan id import."""
+    report = service.get_report(import_id)
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Import not found"
+        )
+    return report
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
-    user_id: int, service: UserService = Depends(get_user_service)
-) -> UserResponse:
-    user = service.get_user(user_id)
-    return UserResponse.from_orm(user)
+    user_id: int,
+    request: Request,
+    response: Response,
+    service: UserService = Depends(get_user_service),
+) -> UserResponse | Response:
+    body = cached_json(
+        ("user", user_id),
+        "user",
+        lambda: user_plan.dumps(service.get_user(user_id)),
+    )
+    return json_response(body, request, response)
 
 
-@router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=manage_users,
+)
 def create_user(
     payload: UserCreate,
     service: UserService = Depends(get_user_service),
@@ -78,7 +181,7 @@ def create_user(
     return UserResponse.from_orm(user)
 
 
-@router.patch("/{user_id}", response_model=UserResponse)
+@router.patch("/{user_id}", response_model=UserResponse, dependencies=manage_users)
 def update_user(
     user_id: int,
     payload: UserUpdate,
@@ -88,7 +191,9 @@ def update_user(
     return UserResponse.from_orm(user)
 
 
-@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{user_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=manage_users
+)
 def delete_user(
     user_id: int, service: UserService = Depends(get_user_service)
 ) -> None:
@@ -0,0 +1 @@
+"""Benchmark performa aplikasi (dijalankan manual, bukan bagian dari runtime API)."""
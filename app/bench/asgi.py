@@ -0,0 +1,71 @@
+"""Client ASGI minimal untuk benchmark: memanggil aplikasi langsung tanpa server/HTTP."""
+
+import json
+from typing import Any
+from urllib.parse import urlencode
+
+from starlette.types import ASGIApp
+
+
+class AsgiResponse:
+    def __init__(self, status_code: int, headers: list[tuple[bytes, bytes]], body: bytes) -> None:
+        self.status_code = status_code
+        self.headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in headers}
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+async def call(
+    app: ASGIApp,
+    method: str,
+    path: str,
+    *,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    json_body: Any = None,
+) -> AsgiResponse:
+    """Kirim satu request HTTP ke `app` dan kumpulkan response lengkapnya."""
+    body = b""
+    raw_headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in (headers or {}).items()
+    ]
+    if json_body is not None:
+        body = json.dumps(json_body).encode("utf-8")
+        raw_headers.append((b"content-type", b"application/json"))
+    raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "query_string": urlencode(params or {}).encode("latin-1"),
+        "root_path": "",
+        "headers": raw_headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = iter([{"type": "http.request", "body": body, "more_body": False}])
+    status_code = 0
+    response_headers: list[tuple[bytes, bytes]] = []
+    chunks: list[bytes] = []
+
+    async def receive() -> dict[str, Any]:
+        # Setelah body habis, client dianggap disconnect (seperti server ASGI).
+        return next(messages, {"type": "http.disconnect"})
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status_code, response_headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return AsgiResponse(status_code, response_headers, b"".join(chunks))
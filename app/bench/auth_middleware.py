@@ -0,0 +1,129 @@
+"""Benchmark middleware autentikasi: `@app.middleware("http")` lama vs ASGI murni.
+
+Jalankan:
+
+    python -m app.bench.auth_middleware --requests 5000
+
+Dua aplikasi FastAPI minimal (satu endpoint JSON kecil dan satu streaming) dipanggil
+langsung lewat antarmuka ASGI tanpa server/HTTP client, sehingga yang diukur murni
+overhead middleware. Skenario: request dengan token valid, tanpa token (401), dan
+path publik. Output berupa JSON berisi mikrodetik per request untuk masing-masing
+implementasi beserta rasio percepatannya.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi_jwt_auth import AuthJWT
+from fastapi_jwt_auth.exceptions import AuthJWTException
+
+from app.bench.asgi import call
+from app.core.auth_middleware import JWTAuthMiddleware
+from app.core.config import JWTSettings
+
+PUBLIC_PATHS = {"/health", "/docs", "/docs/*"}
+
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping(request: Request) -> dict[str, Any]:
+        return {"sub": request.state.jwt_claims["sub"]}
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"x" * 1024] * 16), media_type="text/plain")
+
+    @app.get("/health")
+    def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def legacy_app() -> FastAPI:
+    """Replika middleware lama berbasis BaseHTTPMiddleware (AuthJWT per request)."""
+    app = _base_app()
+    public_paths = {path for path in PUBLIC_PATHS if not path.endswith("/*")}
+
+    @app.middleware("http")
+    async def require_authenticated_user(request: Request, call_next):
+        path = request.url.path
+        if request.method == "OPTIONS" or path in public_paths:
+            return await call_next(request)
+        try:
+            authorize = AuthJWT(req=request)
+            authorize.jwt_required()
+        except AuthJWTException:
+            return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
+        request.state.jwt_claims = authorize.get_raw_jwt()
+        return await call_next(request)
+
+    return app
+
+
+def asgi_app() -> FastAPI:
+    app = _base_app()
+    app.add_middleware(JWTAuthMiddleware, public_paths=PUBLIC_PATHS)
+    return app
+
+
+async def _call(app: FastAPI, path: str, headers: dict[str, str]) -> int:
+    return (await call(app, "GET", path, headers=headers)).status_code
+
+
+async def _measure(
+    app: FastAPI, path: str, headers: dict[str, str], requests: int
+) -> tuple[float, int]:
+    status_code = await _call(app, path, headers)  # warmup + validasi status
+    started = time.perf_counter()
+    for _ in range(requests):
+        await _call(app, path, headers)
+    return (time.perf_counter() - started) / requests, status_code
+
+
+def run(requests: int) -> dict[str, Any]:
+    AuthJWT.load_config(lambda: list(JWTSettings()))
+    token = AuthJWT().create_access_token(subject="1", user_claims={"roles": ["admin"]})
+    bearer = {"Authorization": f"Bearer {token}"}
+    scenarios: dict[str, tuple[str, dict[str, str], int]] = {
+        "authenticated_json": ("/ping", bearer, 200),
+        "authenticated_stream": ("/stream", bearer, 200),
+        "missing_token": ("/ping", {}, 401),
+        "public_path": ("/health", {}, 200),
+    }
+    apps: dict[str, Callable[[], FastAPI]] = {"legacy": legacy_app, "asgi": asgi_app}
+    built = {name: factory() for name, factory in apps.items()}
+
+    results: dict[str, Any] = {"requests": requests, "scenarios": {}}
+    for name, (path, headers, expected) in scenarios.items():
+        timings: dict[str, float] = {}
+        for label, app in built.items():
+            elapsed, status_code = asyncio.run(_measure(app, path, headers, requests))
+            if status_code != expected:
+                raise AssertionError(f"{label} {name}: status {status_code}, harap {expected}")
+            timings[label] = elapsed
+        results["scenarios"][name] = {
+            "legacy_us": round(timings["legacy"] * 1e6, 1),
+            "asgi_us": round(timings["asgi"] * 1e6, 1),
+            "speedup": round(timings["legacy"] / timings["asgi"], 2) if timings["asgi"] else None,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.requests), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Pemeriksaan regresi plan query dan jumlah statement SQL per endpoint.
+
+Pemeriksaan berjalan sebagai test:
+
+    pytest tests/test_query_plans.py tests/test_statement_counts.py
+
+dan CLI-nya hanya dipakai untuk menulis ulang snapshot setelah perubahan disengaja:
+
+    poetry run plan-check --update
+
+Seperti `index-report`, pemeriksaan berjalan terhadap database SQLite temporary
+yang dimigrasi, di-seed, dan diisi user dummy (`prepare_database`). Yang diperiksa:
+
+1. Plan setiap query repository (`query_plans.CASES`) dan query DataTables user
+   (`DATATABLES_CASES`). Scan tanpa index pada tabel besar (`LARGE_TABLES`) gagal,
+   kecuali scan berurutan yang dihentikan `LIMIT` (tanpa sort temp B-tree) atau
+   yang tercantum di `ALLOWED_SCANS`.
+2. Jumlah statement SQL per skenario suite benchmark, diukur tanpa response cache.
+   Melewati `STATEMENT_BUDGETS` berarti gagal (misal N+1 baru di `/auth/login`).
+3. Keduanya disimpan sebagai snapshot JSON di `app/bench/snapshots/` (satu file per
+   dialect). Perbedaan dengan snapshot membuat test gagal sampai snapshot
+   diperbarui dengan `--update` dan ikut di-review.
+
+Skenario endpoint login dan menulis (misal `rbac_assign`), dan `prepare_database`
+menulis seed sample plus user dummy `@bench.dev` berpassword diketahui. Karena itu
+`--database-url` hanya diterima bersama `--seed`, untuk database sekali pakai.
+
+Writer audit dan tracker aktivitas dimatikan, serta pengecekan `cache_epochs` dibuat
+jarang, agar hitungan statement tidak tercampur penulisan latar belakang.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from app.bench.query_plans import CASES, StatementPlan
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+
+# Tabel yang tumbuh mengikuti jumlah user/aktivitas; tabel konfigurasi kecil
+# (menus, roles, permissions) boleh di-scan.
+LARGE_TABLES = frozenset({"users", "user_roles", "role_permissions", "audit_log"})
+# Search DataTables memakai `LIKE '%kata%'` di semua kolom: scan tidak terhindarkan
+# dan dibatasi deadline route.
+ALLOWED_SCANS: dict[str, frozenset[str]] = {"datatables.search": frozenset({"users"})}
+STATEMENT_BUDGETS = {
+    "login": 2,
+    "refresh": 2,
+    "me": 4,
+    "menu_all": 2,
+    "datatables_search": 4,
+    "datatables_deep": 4,
+    "rbac_assign": 5,
+}
+
+
+def _datatables(query_string: str) -> Callable[[Any, Any], Any]:
+    def run(db: Any, fixtures: Any) -> Any:
+        from starlette.requests import Request
+
+        from app.api.user import list_users_datatables
+        from app.services.datatables_service import DataTablesService
+
+        request = Request(
+            {"type": "http", "query_string": query_string.encode("latin-1"), "headers": []}
+        )
+        return list_users_datatables(request, DataTablesService(db))
+
+    return run
+
+
+DATATABLES_CASES = {
+    "datatables.default": _datatables("draw=1&start=0&length=10"),
+    "datatables.deep_page": _datatables("draw=1&start=4000&length=10"),
+    "datatables.order_created_at": _datatables(
+        "draw=1&start=0&length=10&order[0][column]=0&order[0][dir]=desc"
+        "&columns[0][data]=created_at"
+    ),
+    "datatables.search": _datatables("draw=1&start=0&length=10&search[value]=user12"),
+}
+
+
+def prepare_database(database_url: str | None = None, users: int = 5000) -> str:
+    """Siapkan database pemeriksaan (migrasi, seed, user dummy); kembalikan dialect-nya.
+
+    Harus dipanggil sebelum modul app lain di-import karena setting dibaca dari
+    environment saat import.
+    """
+    os.environ["AUDIT_ENABLED"] = "false"
+    os.environ["ACTIVITY_TRACKING_ENABLED"] = "false"
+    os.environ["CACHE_EPOCH_CHECK_MS"] = "3600000"
+
+    from app.bench.suite import _prepare_database, _seed_bench_users
+
+    _prepare_database(database_url)
+
+    from app.bootstrap import init_db
+    from app.core.database import engine
+
+    init_db()
+    _seed_bench_users(users)
+    return engine.dialect.name
+
+
+def snapshot_path(dialect: str) -> Path:
+    return SNAPSHOT_DIR / f"query_plans.{dialect}.json"
+
+
+def load_snapshot(dialect: str) -> dict[str, Any]:
+    return json.loads(snapshot_path(dialect).read_text(encoding="utf-8"))
+
+
+def normalize_sql(sql: str) -> str:
+    # Panjang daftar IN (...) bergantung data; cukup bentuk query yang disnapshot.
+    return re.sub(r"IN \(\?(?:, \?)*\)", "IN (?, ...)", " ".join(sql.split()))
+
+
+def scan_violations(name: str, statement: StatementPlan) -> list[str]:
+    bounded = " LIMIT " in statement.sql and not statement.temp_sort
+    allowed = ALLOWED_SCANS.get(name, frozenset())
+    return [
+        f"{name}: scan tabel {table} tanpa index: {normalize_sql(statement.sql)}"
+        for table in statement.full_scans
+        if table in LARGE_TABLES and table not in allowed and not bounded
+    ]
+
+
+def check_plans() -> tuple[dict[str, Any], list[str]]:
+    from app.bench.query_plans import collect_plans
+
+    plans = collect_plans({**CASES, **DATATABLES_CASES})
+    # Urutan antar query selectin tidak dijamin; urutkan agar snapshot stabil.
+    snapshot = {
+        name: sorted(
+            ({"sql": normalize_sql(item.sql), "plan": item.plan} for item in statements),
+            key=lambda entry: entry["sql"],
+        )
+        for name, statements in plans.items()
+    }
+    violations = [
+        violation
+        for name, statements in plans.items()
+        for statement in statements
+        for violation in scan_violations(name, statement)
+    ]
+    return snapshot, violations
+
+
+def count_statements() -> tuple[dict[str, int], list[str]]:
+    from app.bench.suite import StatementCounter, _build_context, _scenarios
+    from app.core.response_cache import response_cache
+    from app.main import app
+
+    async def execute() -> dict[str, int]:
+        handlers = _scenarios(await _build_context(app))
+        counter = StatementCounter()
+        counts = {}
+        for name in STATEMENT_BUDGETS:
+            await handlers[name](0)  # pemanasan: registry permission, epoch, pool
+            response_cache.clear()
+            counter.count = 0
+            status_code = await handlers[name](1)
+            if status_code >= 400:
+                raise RuntimeError(f"Skenario {name} gagal: HTTP {status_code}")
+            counts[name] = counter.count
+        return counts
+
+    counts = asyncio.run(execute())
+    violations = [
+        f"{name}: {count} statement, budget {STATEMENT_BUDGETS[name]}"
+        for name, count in counts.items()
+        if count > STATEMENT_BUDGETS[name]
+    ]
+    return counts, violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tulis ulang snapshot plan-check.")
+    parser.add_argument("--update", action="store_true", help="Tulis ulang snapshot.")
+    parser.add_argument("--users", type=int, default=5000, help="Jumlah user dummy.")
+    parser.add_argument("--database-url", default=None, help="Default: SQLite temporary baru.")
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="Wajib bersama --database-url: database itu akan di-seed dan ditulisi.",
+    )
+    args = parser.parse_args()
+    if not args.update:
+        parser.error(
+            "pemeriksaan berjalan lewat pytest (tests/test_query_plans.py, "
+            "tests/test_statement_counts.py); gunakan --update untuk menulis ulang snapshot"
+        )
+    if args.database_url and not args.seed:
+        parser.error(
+            "--database-url akan di-seed dan ditulisi; tambahkan --seed (DB sekali pakai)"
+        )
+
+    dialect = prepare_database(args.database_url, args.users)
+    plans, violations = check_plans()
+    counts, budget_violations = count_statements()
+    violations += budget_violations
+
+    # Snapshot hanya boleh merekam plan yang lolos pemeriksaan.
+    for violation in violations:
+        print(f"GAGAL {violation}")
+    if violations:
+        sys.exit(1)
+
+    path = snapshot_path(dialect)
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    path.write_text(
+        json.dumps({"plans": plans, "statements": counts}, indent=2) + "\n", encoding="utf-8"
+    )
+    print(f"Snapshot ditulis: {path} ({len(plans)} kasus query, {len(counts)} skenario endpoint)")
+
+
+if __name__ == "__main__":
+    main()
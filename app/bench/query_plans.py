@@ -0,0 +1,302 @@
+"""Laporan query repository beserta index yang dipakai database.
+
+Jalankan:
+
+    poetry run index-report                  # SQLite temporary baru + seed
+    poetry run index-report --json
+    poetry run index-report --database-url postgresql+psycopg2://...          # hanya baca
+    poetry run index-report --database-url postgresql+psycopg2://... --seed   # DB sekali pakai
+
+Setiap kasus di `CASES` memanggil satu method repository terhadap database yang
+sudah dimigrasi dan di-seed: method baca, dan method tulis yang statement-nya
+mencari baris (UPDATE/DELETE by kondisi, `_touch`, `bump_epochs`). Kasus berjalan
+di dalam transaksi luar yang selalu di-rollback, jadi commit method tulis tidak
+mengubah data. Semua statement SQL yang dieksekusi (termasuk query
+`selectinload` dan relasi `lazy="selectin"`) ditangkap lewat event engine, lalu
+plan-nya diambil dengan `EXPLAIN QUERY PLAN` (SQLite) atau `EXPLAIN` (PostgreSQL).
+Laporan menampilkan index yang dipakai per statement dan menandai full scan tabel
+serta sort tanpa index (`USE TEMP B-TREE`).
+
+Database dari `--database-url` hanya dibaca: migrasi, seed sample, dan user dummy
+`@bench.dev` (password diketahui) baru ditulis jika `--seed` diberikan, jadi opsi
+itu hanya untuk database sekali pakai. SQLite temporary default selalu di-seed.
+
+Seperti suite benchmark, modul app di-import setelah `DATABASE_URL` di-set.
+"""
+
+import argparse
+import json
+import re
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\S+)")
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)$")
+_PG_INDEX = re.compile(r"(?:Index (?:Only )?Scan(?: Backward)? using|Bitmap Index Scan on) (\S+)")
+_PG_SCAN = re.compile(r"Seq Scan on (\w+)")
+_EXPLAINED = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class Fixtures:
+    """Id dan kunci baris hasil seed yang dipakai sebagai parameter query."""
+
+    user_id: int
+    email: str
+    role_id: int
+    role_name: str
+    permission_id: int
+    permission_code: str
+    menu_id: int
+    menu_key: str
+
+
+@dataclass
+class StatementPlan:
+    sql: str
+    plan: list[str]
+    indexes: list[str] = field(default_factory=list)
+    full_scans: list[str] = field(default_factory=list)
+    temp_sort: bool = False
+
+
+def _menu(db: Any) -> Any:
+    from app.repository import MenuRepository
+
+    return MenuRepository(db)
+
+
+def _rbac(db: Any) -> Any:
+    from app.repository import RBACRepository
+
+    return RBACRepository(db)
+
+
+def _user(db: Any) -> Any:
+    from app.repository import UserRepository
+
+    return UserRepository(db)
+
+
+def _entities_exist(db: Any, fx: Fixtures) -> Any:
+    from app.models import Role, User
+
+    return _rbac(db).entities_exist((User, fx.user_id), (Role, fx.role_id))
+
+
+CASES: dict[str, Callable[[Any, Fixtures], Any]] = {
+    "menu.list": lambda db, fx: _menu(db).list(0, 100),
+    "menu.get_by_id": lambda db, fx: _menu(db).get_by_id(fx.menu_id),
+    "menu.get_updated_at": lambda db, fx: _menu(db).get_updated_at(fx.menu_id),
+    "menu.get_by_key": lambda db, fx: _menu(db).get_by_key(fx.menu_key),
+    "menu.get_tree_snapshot": lambda db, fx: _menu(db).get_tree_snapshot(),
+    "menu.get_version_signal": lambda db, fx: _menu(db).get_version_signal(),
+    "rbac.get_version_signal": lambda db, fx: _rbac(db).get_version_signal(),
+    "rbac.list_roles": lambda db, fx: _rbac(db).list_roles(0, 100),
+    "rbac.get_role_by_id": lambda db, fx: _rbac(db).get_role_by_id(fx.role_id),
+    "rbac.get_role_by_name": lambda db, fx: _rbac(db).get_role_by_name(fx.role_name),
+    "rbac.list_permissions": lambda db, fx: _rbac(db).list_permissions(0, 100),
+    "rbac.get_permission_by_id": lambda db, fx: _rbac(db).get_permission_by_id(
+        fx.permission_id
+    ),
+    "rbac.get_permission_by_code": lambda db, fx: _rbac(db).get_permission_by_code(
+        fx.permission_code
+    ),
+    "rbac.get_user_with_roles": lambda db, fx: _rbac(db).get_user_with_roles(fx.user_id),
+    "rbac.entities_exist": _entities_exist,
+    "rbac.list_user_role_summaries": lambda db, fx: _rbac(db).list_user_role_summaries(
+        fx.user_id
+    ),
+    "rbac.list_role_permission_summaries": lambda db, fx: _rbac(
+        db
+    ).list_role_permission_summaries(fx.role_id),
+    "rbac.existing_user_ids": lambda db, fx: _rbac(db).existing_user_ids([fx.user_id]),
+    "rbac.existing_role_ids": lambda db, fx: _rbac(db).existing_role_ids([fx.role_id]),
+    "rbac.existing_permission_ids": lambda db, fx: _rbac(db).existing_permission_ids(
+        [fx.permission_id]
+    ),
+    "user.list": lambda db, fx: _user(db).list(0, 100),
+    "user.get_by_id": lambda db, fx: _user(db).get_by_id(fx.user_id),
+    "user.get_by_email": lambda db, fx: _user(db).get_by_email(fx.email),
+    "user.existing_emails": lambda db, fx: _user(db).existing_emails([fx.email]),
+    # Method tulis (INSERT tidak di-explain, hanya statement yang mencari baris).
+    "menu.bulk_update": lambda db, fx: _menu(db).bulk_update(
+        [{"id": fx.menu_id, "sort_order": 1}]
+    ),
+    "rbac.remove_role_from_user": lambda db, fx: _rbac(db).remove_role_from_user(
+        fx.user_id, fx.role_id
+    ),
+    "rbac.remove_permission_from_role": lambda db, fx: _rbac(
+        db
+    ).remove_permission_from_role(fx.role_id, fx.permission_id),
+    "rbac.bulk_assign_roles_to_users": lambda db, fx: _rbac(db).bulk_assign_roles_to_users(
+        [(fx.user_id, fx.role_id)]
+    ),
+    "rbac.bulk_assign_permissions_to_roles": lambda db, fx: _rbac(
+        db
+    ).bulk_assign_permissions_to_roles([(fx.role_id, fx.permission_id)]),
+    "rbac.replace_role_permissions": lambda db, fx: _rbac(db).replace_role_permissions(
+        fx.role_id, [fx.permission_id]
+    ),
+}
+
+
+def load_fixtures(db: Any) -> Fixtures:
+    from sqlalchemy import select
+
+    from app.models import Menu, Permission, Role, User
+
+    user = db.scalars(select(User).order_by(User.id).limit(1)).one()
+    role = db.scalars(select(Role).order_by(Role.id).limit(1)).one()
+    permission = db.scalars(select(Permission).order_by(Permission.id).limit(1)).one()
+    menu = db.scalars(select(Menu).order_by(Menu.id).limit(1)).one()
+    return Fixtures(
+        user_id=user.id,
+        email=user.email,
+        role_id=role.id,
+        role_name=role.name,
+        permission_id=permission.id,
+        permission_code=permission.code,
+        menu_id=menu.id,
+        menu_key=menu.menu_key,
+    )
+
+
+def capture_statements(run: Callable[[], Any]) -> list[tuple[str, Any]]:
+    """Jalankan `run()` dan kembalikan statement (SQL, parameter) yang dieksekusi engine."""
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    statements: list[tuple[str, Any]] = []
+
+    def on_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if statement.lstrip().upper().startswith(_EXPLAINED):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    return statements
+
+
+def explain(connection: Any, sql: str, parameters: Any) -> StatementPlan:
+    """Plan satu statement beserta index yang dipakai dan tabel yang di-scan penuh."""
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters).all()
+        plan = [row[3] for row in rows]
+        result = StatementPlan(sql=sql, plan=plan)
+        for detail in plan:
+            result.indexes += _SQLITE_INDEX.findall(detail)
+            if "INTEGER PRIMARY KEY" in detail:
+                result.indexes.append("rowid")
+            result.full_scans += _SQLITE_SCAN.findall(detail)
+            result.temp_sort = result.temp_sort or "USE TEMP B-TREE" in detail
+        return result
+
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}", parameters).all()
+    plan = [row[0] for row in rows]
+    result = StatementPlan(sql=sql, plan=plan)
+    for detail in plan:
+        result.indexes += _PG_INDEX.findall(detail)
+        result.full_scans += _PG_SCAN.findall(detail)
+        result.temp_sort = result.temp_sort or detail.lstrip(" ->").startswith("Sort ")
+    return result
+
+
+def collect_plans(
+    cases: dict[str, Callable[[Any, Fixtures], Any]],
+    fixtures: Fixtures | None = None,
+) -> dict[str, list[StatementPlan]]:
+    """Tangkap dan explain semua statement tiap kasus, masing-masing di session baru.
+
+    Session tiap kasus terikat ke transaksi koneksi yang di-rollback di akhir;
+    `commit()` method tulis tidak diteruskan ke transaksi itu (`rollback_only`).
+    Savepoint tidak dipakai karena driver pysqlite meng-commit saat savepoint
+    terluar dilepas.
+    """
+    from app.core.database import SessionLocal, engine
+
+    if fixtures is None:
+        db = SessionLocal()
+        try:
+            fixtures = load_fixtures(db)
+        finally:
+            db.close()
+
+    plans: dict[str, list[StatementPlan]] = {}
+    for name, case in cases.items():
+        with engine.connect() as connection:
+            transaction = connection.begin()
+            db = SessionLocal(bind=connection, join_transaction_mode="rollback_only")
+            try:
+                statements = capture_statements(lambda: case(db, fixtures))
+            finally:
+                db.close()
+                transaction.rollback()
+        with engine.connect() as connection:
+            plans[name] = [explain(connection, sql, params) for sql, params in statements]
+    return plans
+
+
+def format_report(plans: dict[str, list[StatementPlan]]) -> str:
+    lines = []
+    for name, statements in plans.items():
+        lines.append(name)
+        for statement in statements:
+            sql = " ".join(statement.sql.split())
+            lines.append(f"  {sql if len(sql) <= 120 else sql[:117] + '...'}")
+            for detail in statement.plan:
+                lines.append(f"    {detail}")
+            notes = [f"index: {', '.join(dict.fromkeys(statement.indexes)) or '-'}"]
+            if statement.full_scans:
+                notes.append(f"scan tabel: {', '.join(statement.full_scans)}")
+            if statement.temp_sort:
+                notes.append("sort tanpa index")
+            lines.append(f"    => {'; '.join(notes)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=None, help="Default: SQLite temporary baru.")
+    parser.add_argument("--users", type=int, default=5000, help="Jumlah user dummy.")
+    parser.add_argument("--json", action="store_true", help="Output JSON.")
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="Migrasi dan seed --database-url (hanya untuk database sekali pakai).",
+    )
+    args = parser.parse_args()
+
+    from app.bench.suite import _prepare_database, _seed_bench_users
+
+    _prepare_database(args.database_url)
+
+    if args.database_url is None or args.seed:
+        from app.bootstrap import init_db
+
+        init_db()
+        _seed_bench_users(args.users)
+
+    plans = collect_plans(CASES)
+    if args.json:
+        output = {name: [asdict(plan) for plan in items] for name, items in plans.items()}
+        print(json.dumps(output, indent=2))
+    else:
+        print(format_report(plans))
+
+
+if __name__ == "__main__":
+    main()
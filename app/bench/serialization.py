@@ -0,0 +1,140 @@
+"""Benchmark serialisasi list endpoint: jalur `from_orm` + validasi FastAPI vs plan.
+
+Jalankan:
+
+    python -m app.bench.serialization --rows 500 --repeat 50
+
+Data dibuat sebagai objek ORM transient (tanpa database), sehingga yang diukur
+murni biaya serialisasi. Output berupa JSON berisi waktu per halaman untuk
+masing-masing jalur beserta rasio percepatannya. Benchmark juga memastikan kedua
+jalur menghasilkan bytes yang identik.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.serialization import plan_for
+from app.models import Menu, Permission, Role, User
+from app.models.menu import MenuResponse
+from app.models.roles_permission import RoleResponse
+from app.models.user import UserResponse
+
+
+def _fake_menus(rows: int, now: datetime) -> list[Menu]:
+    return [
+        Menu(
+            id=index + 1,
+            menu_key=f"section.{index}-item-{index}",
+            section_title="Finance" if index % 2 else "Settings",
+            parent_id=index // 10 or None,
+            label=f"Menu item {index}",
+            href=f"/finance/item/{index}",
+            icon="folder",
+            list_id=None,
+            badge_text=None,
+            badge_class_name=None,
+            is_active=bool(index % 3),
+            is_hidden=False,
+            show_more_toggle=False,
+            initially_open=False,
+            depth=index % 3,
+            sort_order=index,
+            created_at=now,
+            updated_at=now + timedelta(microseconds=index),
+        )
+        for index in range(rows)
+    ]
+
+
+def _fake_users(rows: int, now: datetime) -> list[User]:
+    return [
+        User(
+            id=index + 1,
+            full_name=f"User {index}",
+            email=f"user{index}@baldas.dev",
+            password_hash="x",
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(rows)
+    ]
+
+
+def _fake_roles(rows: int, now: datetime) -> list[Role]:
+    permissions = [
+        Permission(id=index + 1, code=f"perm.{index}", description=None, created_at=now)
+        for index in range(10)
+    ]
+    return [
+        Role(
+            id=index + 1,
+            name=f"role-{index}",
+            description="Generated role",
+            created_at=now,
+            updated_at=now,
+            permissions=permissions[: index % 10],
+        )
+        for index in range(rows)
+    ]
+
+
+def _legacy_bytes(model: Any, objs: list[Any]) -> bytes:
+    """Jalur lama: from_orm per baris, validasi ulang response_model, lalu render."""
+    field = create_response_field(name=f"Response_{model.__name__}", type_=list[model])
+    content = [model.from_orm(obj) for obj in objs]
+    encoded = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(content=encoded).body
+
+
+def _measure(func: Callable[[], bytes], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run(rows: int, repeat: int) -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    scenarios = {
+        "menus": (MenuResponse, _fake_menus(rows, now)),
+        "users": (UserResponse, _fake_users(rows, now)),
+        "roles": (RoleResponse, _fake_roles(rows, now)),
+    }
+    results: dict[str, Any] = {"rows": rows, "repeat": repeat, "scenarios": {}}
+    for name, (model, objs) in scenarios.items():
+        plan = plan_for(model)
+        if _legacy_bytes(model, objs) != plan.dumps_many(objs):
+            raise AssertionError(f"Output plan berbeda dari jalur from_orm untuk {name}")
+        legacy = _measure(lambda: _legacy_bytes(model, objs), repeat)
+        fast = _measure(lambda: plan.dumps_many(objs), repeat)
+        results["scenarios"][name] = {
+            "legacy_ms": round(legacy * 1000, 3),
+            "plan_ms": round(fast * 1000, 3),
+            "speedup": round(legacy / fast, 2) if fast else None,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark cold start: waktu dari proses baru sampai request pertama terlayani.
+
+Jalankan:
+
+    python -m app.bench.startup --runs 5 --budget-ms 2500
+
+Setiap run adalah subprocess Python baru (seperti instance yang dibangunkan dari
+sleep) yang menjalankan `init_db`, meng-import aplikasi, lalu melayani satu
+`GET /health` lewat ASGI. Database SQLite temporary dimigrasi sekali lewat run
+pemanasan, sehingga run terukur menguji jalur "database sudah di head". Output
+berupa JSON median durasi per fase; exit code 1 jika median total melewati
+`--budget-ms`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+def _child() -> None:
+    started = time.perf_counter()
+
+    from app.core.startup import startup_phase, startup_timings
+
+    with startup_phase("import_bootstrap"):
+        from app.bootstrap import init_db
+    init_db()
+    with startup_phase("import_app"):
+        from app.main import app
+    with startup_phase("first_request"):
+        from app.bench.asgi import call
+
+        response = asyncio.run(call(app, "GET", "/health"))
+    if response.status_code != 200:
+        raise SystemExit(f"/health gagal: {response.status_code}")
+
+    timings = startup_timings()
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    timings["heavy_modules_loaded"] = sorted(
+        name for name in ("alembic.command", "passlib.context") if name in sys.modules
+    )
+    print(json.dumps(timings))
+
+
+def _spawn(database_url: str) -> dict[str, Any]:
+    env = {**os.environ, "DATABASE_URL": database_url}
+    result = subprocess.run(
+        [sys.executable, "-m", "app.bench.startup", "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int, database_url: str | None) -> dict[str, Any]:
+    if database_url is None:
+        path = Path(tempfile.gettempdir()) / "baldas-startup-bench.db"
+        path.unlink(missing_ok=True)
+        database_url = f"sqlite:///{path}"
+
+    warmup = _spawn(database_url)  # migrasi + seed pertama, tidak dihitung
+    samples = [_spawn(database_url) for _ in range(runs)]
+    phases = [name for name in samples[0] if name != "heavy_modules_loaded"]
+    return {
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "first_boot_ms": warmup["total"],
+        "median_ms": {
+            name: round(statistics.median(sample[name] for sample in samples), 1)
+            for name in phases
+        },
+        "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2500.0)
+    parser.add_argument("--database-url", default=None, help="Default: SQLite temporary baru.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child()
+        return
+
+    results = run(args.runs, args.database_url)
+    results["budget_ms"] = args.budget_ms
+    results["within_budget"] = results["median_ms"]["total"] <= args.budget_ms
+    print(json.dumps(results, indent=2))
+    if not results["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""Suite benchmark end-to-end aplikasi lewat transport ASGI in-process.
+
+Jalankan:
+
+    poetry run bench --concurrency 8 --requests 200
+    poetry run bench --save-baseline            # simpan hasil sebagai baseline
+    poetry run bench --baseline bench-baseline.json --tolerance 0.25
+
+Secara default suite membuat database SQLite baru di direktori temporary,
+menjalankan migrasi + seed sample, lalu menambah `--users` user dummy agar
+datatables punya halaman dalam. Aplikasi dipanggil langsung lewat ASGI (tanpa
+server/socket), dengan `--concurrency` worker asyncio per skenario; endpoint sync
+tetap berjalan paralel di thread pool seperti di server sungguhan.
+
+Per skenario dilaporkan throughput, latensi p50/p95/p99, jumlah error, dan rata-rata
+statement SQL per request dalam JSON. Jika baseline tersedia, hasil dibandingkan
+dan skenario yang melewati toleransi ditandai sebagai regresi (exit code 1).
+
+Modul app di-import setelah `DATABASE_URL` di-set, karena engine database dibuat
+saat import.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_SCENARIOS = (
+    "login",
+    "refresh",
+    "me",
+    "menu_all",
+    "datatables_search",
+    "datatables_deep",
+    "rbac_assign",
+)
+BENCH_EMAIL_DOMAIN = "bench.dev"
+
+
+@dataclass
+class Context:
+    app: Any
+    access_headers: dict[str, str]
+    refresh_headers: dict[str, str]
+    user_ids: list[int]
+    role_id: int
+
+
+def _prepare_database(database_url: str | None) -> str:
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+        return database_url
+    path = Path(tempfile.gettempdir()) / "baldas-bench.db"
+    path.unlink(missing_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+
+def _seed_bench_users(count: int) -> None:
+    from sqlalchemy import func, insert, select
+
+    from app.core.database import SessionLocal
+    from app.core.security import hash_password
+    from app.models import User
+
+    db = SessionLocal()
+    try:
+        existing = db.scalar(
+            select(func.count(User.id)).where(
+                User.email.like(f"%@{BENCH_EMAIL_DOMAIN}")
+            )
+        )
+        if existing >= count:
+            return
+        # Satu hash dipakai semua user dummy: bcrypt per baris hanya memperlambat setup.
+        password_hash = hash_password("bench123")
+        rows = [
+            {
+                "full_name": f"Bench User {index}",
+                "email": f"user{index}@{BENCH_EMAIL_DOMAIN}",
+                "password_hash": password_hash,
+                "is_active": True,
+            }
+            for index in range(existing, count)
+        ]
+        for offset in range(0, len(rows), 1000):
+            db.execute(insert(User), rows[offset : offset + 1000])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _build_context(app: Any) -> Context:
+    from sqlalchemy import select
+
+    from app.bench.asgi import call
+    from app.core.database import SessionLocal
+    from app.models import Role, User
+
+    login = await call(
+        app,
+        "POST",
+        "/auth/login",
+        json_body={"email": "admin@baldas.dev", "password": "admin123"},
+    )
+    if login.status_code != 200:
+        raise RuntimeError(f"Login admin gagal: {login.status_code} {login.body!r}")
+    tokens = login.json()
+    db = SessionLocal()
+    try:
+        user_ids = list(
+            db.scalars(
+                select(User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+            )
+        )
+        role_id = db.scalar(select(Role.id).where(Role.name == "writer"))
+    finally:
+        db.close()
+    return Context(
+        app=app,
+        access_headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        refresh_headers={"Authorization": f"Bearer {tokens['refresh_token']}"},
+        user_ids=user_ids or [1],
+        role_id=role_id,
+    )
+
+
+def _scenarios(ctx: Context) -> dict[str, Callable[[int], Awaitable[int]]]:
+    from app.bench.asgi import call
+
+    app = ctx.app
+    total_users = len(ctx.user_ids)
+
+    async def login(_: int) -> int:
+        body = {"email": "admin@baldas.dev", "password": "admin123"}
+        return (await call(app, "POST", "/auth/login", json_body=body)).status_code
+
+    async def refresh(_: int) -> int:
+        response = await call(app, "POST", "/auth/refresh", headers=ctx.refresh_headers)
+        return response.status_code
+
+    async def me(_: int) -> int:
+        response = await call(app, "GET", "/auth/me", headers=ctx.access_headers)
+        return response.status_code
+
+    async def menu_all(_: int) -> int:
+        response = await call(app, "GET", "/menu/all", headers=ctx.access_headers)
+        return response.status_code
+
+    async def datatables_search(index: int) -> int:
+        params = {
+            "draw": 1,
+            "start": 0,
+            "length": 10,
+            "search[value]": f"user{index % 100}",
+        }
+        response = await call(
+            app, "GET", "/user/datatables", headers=ctx.access_headers, params=params
+        )
+        return response.status_code
+
+    async def datatables_deep(index: int) -> int:
+        # Offset di 10% halaman terakhir: menguji biaya OFFSET besar.
+        start = max(0, total_users - 10 - (index % max(1, total_users // 10)))
+        params = {
+            "draw": 1,
+            "start": start,
+            "length": 10,
+            "order[0][column]": 0,
+            "columns[0][data]": "id",
+        }
+        response = await call(
+            app, "GET", "/user/datatables", headers=ctx.access_headers, params=params
+        )
+        return response.status_code
+
+    async def rbac_assign(index: int) -> int:
+        user_id = ctx.user_ids[index % total_users]
+        path = f"/roles-permission/users/{user_id}/roles/{ctx.role_id}"
+        return (await call(app, "POST", path, headers=ctx.access_headers)).status_code
+
+    return {
+        "login": login,
+        "refresh": refresh,
+        "me": me,
+        "menu_all": menu_all,
+        "datatables_search": datatables_search,
+        "datatables_deep": datatables_deep,
+        "rbac_assign": rbac_assign,
+    }
+
+
+class StatementCounter:
+    """Hitung statement SQL yang dieksekusi engine selama skenario berjalan."""
+
+    def __init__(self) -> None:
+        from sqlalchemy import event
+
+        from app.core.database import engine
+
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+
+async def _run_scenario(
+    handler: Callable[[int], Awaitable[int]], requests: int, concurrency: int
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index, errors
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            status_code = await handler(index)
+            latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def _summarize(
+    latencies: list[float], errors: int, elapsed: float, statements: int
+) -> dict[str, Any]:
+    if len(latencies) > 1:
+        cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    else:
+        cut_points = latencies * 99
+
+    def percentile_ms(index: int) -> float | None:
+        return round(cut_points[index] * 1000, 3) if cut_points else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": percentile_ms(49),
+        "p95_ms": percentile_ms(94),
+        "p99_ms": percentile_ms(98),
+        "statements_per_request": (
+            round(statements / len(latencies), 2) if latencies else None
+        ),
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Daftar regresi dibanding baseline.
+
+    Regresi: latensi/throughput di luar toleransi, statement bertambah, error bertambah.
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        # Skenario tanpa request (nilai None) tidak bisa dibandingkan.
+        if previous is None or not current["requests"] or not previous.get("requests"):
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms"
+            )
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']}"
+                f" -> {current['throughput_rps']} rps"
+            )
+        if current["statements_per_request"] > previous["statements_per_request"]:
+            regressions.append(
+                f"{name}: statements/request {previous['statements_per_request']}"
+                f" -> {current['statements_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(
+                f"{name}: errors {previous['errors']} -> {current['errors']}"
+            )
+    return regressions
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    database_url = _prepare_database(args.database_url)
+
+    from app.bootstrap import init_db
+
+    init_db()
+    _seed_bench_users(args.users)
+
+    from app.main import app
+
+    async def execute() -> dict[str, Any]:
+        ctx = await _build_context(app)
+        handlers = _scenarios(ctx)
+        counter = StatementCounter()
+        results: dict[str, Any] = {
+            "meta": {
+                "database_url": database_url,
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "users": len(ctx.user_ids),
+                "python": sys.version.split()[0],
+            },
+            "scenarios": {},
+        }
+        for name in args.scenarios:
+            await handlers[name](0)  # warmup (cache, koneksi pool, plan serialisasi)
+            counter.count = 0
+            latencies, errors, elapsed = await _run_scenario(
+                handlers[name], args.requests, args.concurrency
+            )
+            results["scenarios"][name] = _summarize(
+                latencies, errors, elapsed, counter.count
+            )
+        return results
+
+    return asyncio.run(execute())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Request per skenario."
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=5000, help="Jumlah user dummy.")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        default=list(DEFAULT_SCENARIOS),
+        help="Daftar skenario dipisah koma.",
+    )
+    parser.add_argument(
+        "--database-url", default=None, help="Default: SQLite temporary baru."
+    )
+    parser.add_argument("--baseline", default="bench-baseline.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output", default=None, help="Tulis hasil JSON ke file ini.")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(DEFAULT_SCENARIOS)
+    if unknown:
+        parser.error(f"Skenario tidak dikenal: {', '.join(sorted(unknown))}")
+
+    results = run(args)
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    elif baseline_path.is_file():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        results["regressions"] = compare(results, baseline, args.tolerance)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    print(output)
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,111 @@
+"""Inisialisasi database saat startup: migrasi Alembic lalu seed sample.
+
+Jalur cepat untuk cold start: revisi head dibaca langsung dari file di
+`alembic/versions` dan dibandingkan dengan isi tabel `alembic_version` lewat
+satu query. Jika database sudah di head, Alembic (yang import-nya mahal) tidak
+dimuat sama sekali.
+"""
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
-from alembic import command
-from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, engine
+from app.core.startup import startup_phase
 from app.seeds.sample_data import run_seed
 
+# Key advisory lock PostgreSQL untuk migrasi (nilai bebas, asal konsisten).
+MIGRATION_LOCK_KEY = 0x62616C646173
 
-def init_db() -> None:
-    project_root = Path(__file__).resolve().parents[1]
-    alembic_cfg = Config(str(project_root / "alembic.ini"))
-    alembic_cfg.set_main_option("script_location", str(project_root / "alembic"))
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+_REVISION_PATTERN = re.compile(r"^revision\s*(?::[^=]+)?=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_PATTERN = re.compile(r"^down_revision\s*(?::[^=]+)?=\s*(.+)$", re.MULTILINE)
+
+
+def script_heads() -> set[str]:
+    """Revisi head dari file migrasi: revisi yang tidak dirujuk sebagai `down_revision`."""
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in (PROJECT_ROOT / "alembic" / "versions").glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_PATTERN.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION_PATTERN.search(source)
+        if down_revision is not None:
+            # Mendukung bentuk string tunggal maupun tuple (merge revision).
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+
+def current_revisions() -> set[str]:
+    """Isi tabel `alembic_version`; set kosong jika tabel belum ada."""
+    try:
+        with engine.connect() as connection:
+            return set(connection.scalars(text("SELECT version_num FROM alembic_version")))
+    except DBAPIError:
+        return set()
+
+
+def needs_migration() -> bool:
+    heads = script_heads()
+    return not heads or current_revisions() != heads
+
+
+def _run_alembic_upgrade() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_cfg = Config(str(PROJECT_ROOT / "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
     command.upgrade(alembic_cfg, "head")
 
-    db = SessionLocal()
+
+def init_db() -> None:
+    with startup_phase("migrations"):
+        if needs_migration():
+            _run_alembic_upgrade()
+
+    with startup_phase("seed"):
+        db = SessionLocal()
+        try:
+            run_seed(db)
+        finally:
+            db.close()
+
+
+@contextmanager
+def migration_lock(lock_file: str) -> Iterator[None]:
+    """Pastikan migrasi + seed hanya dijalankan satu proses pada satu waktu.
+
+    PostgreSQL memakai advisory lock (berlaku lintas host); database lain memakai
+    `flock` pada `lock_file` (berlaku untuk semua proses di host yang sama).
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+        return
+
     try:
-        run_seed(db)
-    finally:
-        db.close()
+        import fcntl
+    except ImportError:  # pragma: no cover - Windows tidak punya flock
+        yield
+        return
+    Path(lock_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_file, "a+") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
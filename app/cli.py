@@ -1,10 +1,12 @@
+import argparse
 import os
 
 import uvicorn
 
-from app.bootstrap import init_db
 from app.core.database import SessionLocal
+from app.launcher import serve
 from app.seeds.sample_data import run_seed
+from app.seeds.synthetic import SyntheticSeeder, parse_scale
 
 
 def _port() -> int:
@@ -16,13 +18,30 @@ def dev() -> None:
 
 
 def prod() -> None:
-    init_db()
-    uvicorn.run("app.main:app", host="0.0.0.0", port=_port(), reload=False)
+    serve()
 
 
 def seed() -> None:
+    parser = argparse.ArgumentParser(description="Seed data sample atau dataset sintetis.")
+    parser.add_argument(
+        "--scale",
+        help="Dataset sintetis, contoh: users=1e6,roles=200,permissions=2000,menus=5000",
+    )
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
     db = SessionLocal()
     try:
-        run_seed(db)
+        if args.scale is None:
+            run_seed(db)
+            return
+        try:
+            scale = parse_scale(args.scale)
+        except ValueError as exc:
+            parser.error(str(exc))
+        SyntheticSeeder(
+            db, random_seed=args.random_seed, batch_size=args.batch_size
+        ).run(scale)
     finally:
         db.close()
@@ -0,0 +1,184 @@
+"""Tracker aktivitas user (`last_login_at`, `last_seen_at`) dengan penulisan batch.
+
+Menulis kolom aktivitas langsung saat login dan di setiap request terautentikasi
+akan menjadikan semua request sebagai write. Sebagai gantinya, middleware
+autentikasi dan endpoint login hanya memperbarui dict in-memory per user (update
+beruntun untuk user yang sama digabung), lalu thread flusher menulis semuanya
+tiap `ACTIVITY_FLUSH_INTERVAL` detik sebagai satu `UPDATE ... SET kolom = CASE ...
+END WHERE id IN (...)` per `ACTIVITY_BATCH_SIZE` user.
+
+CASE hanya memajukan timestamp (nilai di database tidak pernah dimundurkan), sehingga
+flush dari beberapa worker yang saling mendahului tetap menghasilkan nilai terbaru.
+`updated_at` sengaja tidak disentuh: aktivitas bukan perubahan data user. Batch yang
+gagal ditulis (misal SQLite "database is locked") digabung kembali ke antrean dan
+dicoba lagi di flush berikutnya. Sisa update ditulis saat shutdown aplikasi atau
+`atexit`.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, case, or_, update
+
+from app.core.config import ActivitySettings
+from app.core.database import SessionLocal, utcnow
+from app.core.metrics import Labels, registry
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+settings = ActivitySettings()
+
+# Posisi timestamp di entri pending: [last_login_at, last_seen_at].
+_LOGIN, _SEEN = 0, 1
+
+
+def _newest(column: Any, values: dict[int, datetime]) -> Any:
+    """CASE yang mengisi `column` dengan nilai baru hanya jika lebih baru dari yang ada."""
+    if not values:
+        return column
+    users = User.__table__.c
+    return case(
+        *(
+            (and_(users.id == user_id, or_(column.is_(None), column < value)), value)
+            for user_id, value in values.items()
+        ),
+        else_=column,
+    )
+
+
+class ActivityTracker:
+    """Penggabung update aktivitas per user dengan satu thread flusher per proses."""
+
+    def __init__(self, *, enabled: bool, flush_interval: float, batch_size: int) -> None:
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: dict[int, list[datetime | None]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def seen(self, user_id: int) -> None:
+        """Catat bahwa user baru saja melakukan request terautentikasi."""
+        self._touch(user_id, login=False)
+
+    def logged_in(self, user_id: int) -> None:
+        self._touch(user_id, login=True)
+
+    def _touch(self, user_id: int, *, login: bool) -> None:
+        if not self.enabled:
+            return
+        self._ensure_started()
+        now = utcnow()
+        with self._lock:
+            entry = self._pending.get(user_id)
+            if entry is None:
+                entry = self._pending[user_id] = [None, None]
+            entry[_SEEN] = now
+            if login:
+                entry[_LOGIN] = now
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Proses hasil fork tidak mewarisi thread flusher: mulai ulang dengan state kosong.
+            self._pending = {}
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="activity-flusher", daemon=True)
+            self._thread.start()
+            self._pid = pid
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> None:
+        """Tulis semua update tertunda (dipanggil periodik oleh thread flusher)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        items = list(pending.items())
+        for offset in range(0, len(items), self.batch_size):
+            batch = items[offset : offset + self.batch_size]
+            try:
+                self._write(batch)
+            except Exception:  # noqa: BLE001 - flusher tidak boleh mati karena satu batch
+                logger.exception("Failed to write user activity; retrying on next flush")
+                self._requeue(batch)
+
+    def _requeue(self, items: list[tuple[int, list[datetime | None]]]) -> None:
+        # Gabungkan kembali batch gagal ke pending; per kolom simpan timestamp terbaru
+        # karena update baru mungkin sudah masuk selama penulisan.
+        with self._lock:
+            for user_id, entry in items:
+                current = self._pending.get(user_id)
+                if current is None:
+                    self._pending[user_id] = entry
+                    continue
+                for field in (_LOGIN, _SEEN):
+                    if entry[field] is not None and (
+                        current[field] is None or entry[field] > current[field]
+                    ):
+                        current[field] = entry[field]
+
+    def _write(self, items: list[tuple[int, list[datetime | None]]]) -> None:
+        users = User.__table__.c
+        logins = {user_id: entry[_LOGIN] for user_id, entry in items if entry[_LOGIN]}
+        seen = {user_id: entry[_SEEN] for user_id, entry in items if entry[_SEEN]}
+        statement = (
+            update(User.__table__)
+            .where(users.id.in_([user_id for user_id, _ in items]))
+            .values(
+                last_login_at=_newest(users.last_login_at, logins),
+                last_seen_at=_newest(users.last_seen_at, seen),
+                # Nilai eksplisit mencegah `onupdate` mengubah updated_at.
+                updated_at=users.updated_at,
+            )
+        )
+        db = SessionLocal()
+        try:
+            db.execute(statement)
+            db.commit()
+        finally:
+            db.close()
+        registry.inc("activity_users_written_total", amount=len(items))
+
+    def shutdown(self) -> None:
+        """Hentikan flusher dan tulis update yang tersisa."""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(self.flush_interval + 5)
+        self.flush()
+        self._thread = None
+        self._pid = None
+
+
+activity_tracker = ActivityTracker(
+    enabled=settings.enabled,
+    flush_interval=settings.flush_interval,
+    batch_size=settings.batch_size,
+)
+atexit.register(activity_tracker.shutdown)
+
+
+def _pending_samples() -> Iterable[tuple[str, str, Labels, float]]:
+    yield "gauge", "activity_pending_users", (), float(activity_tracker.pending())
+
+
+registry.register_collector(_pending_samples)
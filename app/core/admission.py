@@ -0,0 +1,182 @@
+"""Admission control (load shedding) dan readiness probe.
+
+Saat overload, request yang tetap diterima hanya mengantre di threadpool sampai
+client timeout. Middleware di sini menolak request lebih awal dengan `503` +
+`Retry-After` ketika:
+- request in-flight untuk kelas route-nya sudah mencapai batas
+  (`ADMISSION_LIMITS`, contoh `auth=8,import=2,write=24,read=48`), atau
+- rata-rata waktu tunggu koneksi pool database melewati
+  `ADMISSION_MAX_POOL_WAIT_MS`.
+
+Kelas route: `auth` (login/register/refresh, mahal karena bcrypt), `import`
+(import user massal), `read` (GET/HEAD), dan `write` (method lain). Kelas tanpa
+batas tidak dibatasi. Probe (`/health`, `/ready`, `/metrics`) dan preflight
+OPTIONS tidak pernah ditolak maupun dihitung.
+
+`readiness()` dipakai endpoint `/ready`: tidak siap jika ada kelas yang penuh,
+pool database jenuh, atau ping database gagal/timeout, sehingga load balancer
+bisa mengalihkan trafik sebelum request menumpuk.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+import anyio
+from sqlalchemy import text
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import AdmissionSettings
+from app.core.database import engine, pool_wait
+from app.core.metrics import registry
+
+settings = AdmissionSettings()
+
+EXEMPT_PATHS = frozenset({"/health", "/ready", "/metrics"})
+_AUTH_PATHS = frozenset({"/auth/login", "/auth/register", "/auth/refresh"})
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+_SHED_BODY = b'{"detail":"Server is overloaded, retry later"}'
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    """Parse `auth=8,read=48` menjadi dict batas in-flight per kelas route."""
+    limits: dict[str, int] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, value = part.partition("=")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+def route_class(method: str, path: str) -> str:
+    if path in _AUTH_PATHS:
+        return "auth"
+    if path == "/user/import":
+        return "import"
+    return "read" if method in _READ_METHODS else "write"
+
+
+class AdmissionController:
+    """Penghitung request in-flight per kelas route dan keputusan admit/shed.
+
+    Dipanggil hanya dari event loop, sehingga counter tidak butuh lock.
+    """
+
+    def __init__(self, limits: dict[str, int], max_pool_wait_ms: float) -> None:
+        self.limits = limits
+        self.max_pool_wait = max_pool_wait_ms / 1000
+        self.in_flight: dict[str, int] = {name: 0 for name in limits}
+
+    def rejection_reason(self, klass: str) -> str | None:
+        limit = self.limits.get(klass)
+        if limit is not None and self.in_flight.get(klass, 0) >= limit:
+            return "concurrency"
+        if self.max_pool_wait > 0 and pool_wait.current() > self.max_pool_wait:
+            return "pool_wait"
+        return None
+
+    def saturated_classes(self) -> list[str]:
+        return [
+            name for name, limit in self.limits.items() if self.in_flight.get(name, 0) >= limit
+        ]
+
+    def acquire(self, klass: str) -> None:
+        self.in_flight[klass] = self.in_flight.get(klass, 0) + 1
+
+    def release(self, klass: str) -> None:
+        self.in_flight[klass] -= 1
+
+
+admission = AdmissionController(parse_limits(settings.limits), settings.max_pool_wait_ms)
+
+
+class AdmissionMiddleware:
+    """Tolak request dengan `503` + `Retry-After` saat kelas route atau pool jenuh."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController = admission,
+        retry_after: int = settings.retry_after,
+        exempt_paths: Iterable[str] = EXEMPT_PATHS,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.exempt_paths = frozenset(exempt_paths)
+        self.headers = [
+            (b"content-length", str(len(_SHED_BODY)).encode("latin-1")),
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(retry_after).encode("latin-1")),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in self.exempt_paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        klass = route_class(scope["method"], scope["path"])
+        reason = self.controller.rejection_reason(klass)
+        if reason is not None:
+            registry.inc("http_requests_shed_total", (("class", klass), ("reason", reason)))
+            await send({"type": "http.response.start", "status": 503, "headers": self.headers})
+            await send({"type": "http.response.body", "body": _SHED_BODY})
+            return
+
+        self.controller.acquire(klass)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(klass)
+
+
+def _pool_status() -> dict[str, Any]:
+    pool = engine.pool
+    status: dict[str, Any] = {"wait_ms": round(pool_wait.current() * 1000, 2)}
+    if hasattr(pool, "checkedout"):
+        # `max_overflow` negatif berarti overflow tak terbatas (pool tidak pernah penuh).
+        max_overflow = getattr(pool, "_max_overflow", -1)
+        capacity = pool.size() + max_overflow if max_overflow >= 0 else None
+        status.update(checked_out=pool.checkedout(), capacity=capacity)
+        status["saturated"] = capacity is not None and pool.checkedout() >= capacity
+    else:
+        status["saturated"] = False
+    if admission.max_pool_wait > 0 and pool_wait.current() > admission.max_pool_wait:
+        status["saturated"] = True
+    return status
+
+
+def _ping() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def _database_status() -> dict[str, Any]:
+    try:
+        with anyio.fail_after(settings.ready_ping_timeout):
+            # Thread ping ditinggalkan jika timeout; hasilnya tidak ditunggu.
+            await anyio.to_thread.run_sync(_ping, abandon_on_cancel=True)
+    except TimeoutError:
+        return {"ok": False, "error": "timeout"}
+    except Exception as exc:  # noqa: BLE001 - semua kegagalan ping berarti tidak siap
+        return {"ok": False, "error": exc.__class__.__name__}
+    return {"ok": True}
+
+
+async def readiness() -> tuple[bool, dict[str, Any]]:
+    """Status kesiapan menerima trafik beserta detail tiap pemeriksaan."""
+    saturated = admission.saturated_classes() if settings.enabled else []
+    pool = _pool_status()
+    # Pool yang jenuh sudah cukup untuk menyatakan tidak siap; ping hanya akan mengantre.
+    database = {"ok": False, "error": "skipped"} if pool["saturated"] else await _database_status()
+    ready = not saturated and not pool["saturated"] and database["ok"]
+    checks = {
+        "admission": {"saturated_classes": saturated, "in_flight": dict(admission.in_flight)},
+        "db_pool": pool,
+        "database": database,
+    }
+    return ready, checks
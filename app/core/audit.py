@@ -0,0 +1,189 @@
+"""Audit log write-behind untuk mutasi user dan RBAC.
+
+Service memanggil `audit_log.record(...)` setelah mutasi berhasil di-commit. Event
+hanya dimasukkan ke antrean in-memory berukuran tetap (`AUDIT_QUEUE_SIZE`), lalu
+thread writer menuliskannya ke tabel `audit_log` dengan INSERT multi-row saat
+batch mencapai `AUDIT_BATCH_SIZE` atau `AUDIT_FLUSH_INTERVAL` detik sejak event
+pertama di batch, mana yang lebih dulu. Request tidak menunggu insert audit.
+
+Backpressure: jika antrean penuh, producer menunggu paling lama
+`AUDIT_ENQUEUE_TIMEOUT` detik; bila masih penuh, event ditulis langsung oleh
+producer (caller-runs) sehingga tidak ada event yang dibuang dan laju mutasi
+melambat mengikuti kemampuan database.
+
+Saat shutdown (event shutdown aplikasi atau `atexit`) antrean dikuras dan semua
+event tersisa ditulis sebelum proses berhenti. Pelaku (actor) diambil dari
+`current_actor`, ContextVar yang diisi middleware autentikasi dengan `sub` token.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Iterable
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.core.config import AuditSettings
+from app.core.database import SessionLocal, utcnow
+from app.core.metrics import Labels, registry
+from app.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+settings = AuditSettings()
+
+current_actor: ContextVar[int | None] = ContextVar("audit_actor", default=None)
+
+_STOP = object()
+_WRITE_ATTEMPTS = 3
+
+
+class AuditWriter:
+    """Antrean event audit berukuran tetap dengan satu thread writer per proses."""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        enqueue_timeout: float,
+    ) -> None:
+        self.enabled = enabled
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        action: str,
+        entity_type: str,
+        entity_id: Any = None,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        """Catat satu event audit, contoh `record("role.update", "role", 3, {...})`."""
+        if not self.enabled:
+            return
+        event = {
+            "occurred_at": utcnow(),
+            "actor_id": current_actor.get(),
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": None if entity_id is None else str(entity_id),
+            "details": details,
+        }
+        self._ensure_started()
+        try:
+            self._queue.put(event, timeout=self.enqueue_timeout)
+        except queue.Full:
+            registry.inc("audit_events_backpressure_total")
+            self._write([event])
+
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Proses hasil fork mewarisi antrean tanpa thread writer: mulai baru.
+            self._queue = queue.Queue(maxsize=self.queue_size)
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            self._pid = pid
+
+    def _next_batch(self) -> tuple[list[dict[str, Any]], bool]:
+        """Kumpulkan batch berikutnya; `True` kedua berarti writer diminta berhenti."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _write(self, events: list[dict[str, Any]]) -> None:
+        for attempt in range(1, _WRITE_ATTEMPTS + 1):
+            db = SessionLocal()
+            try:
+                db.execute(insert(AuditLog.__table__), events)
+                db.commit()
+                registry.inc("audit_events_written_total", amount=len(events))
+                return
+            except Exception:  # noqa: BLE001 - writer tidak boleh mati karena satu batch
+                db.rollback()
+                if attempt == _WRITE_ATTEMPTS:
+                    registry.inc("audit_events_failed_total", amount=len(events))
+                    logger.exception("Failed to write %d audit events", len(events))
+                    return
+                time.sleep(0.5 * attempt)
+            finally:
+                db.close()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Kuras antrean dan tulis semua event tersisa (dipanggil saat shutdown)."""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        for offset in range(0, len(leftovers), self.batch_size):
+            self._write(leftovers[offset : offset + self.batch_size])
+        self._thread = None
+        self._pid = None
+
+
+audit_log = AuditWriter(
+    enabled=settings.enabled,
+    queue_size=settings.queue_size,
+    batch_size=settings.batch_size,
+    flush_interval=settings.flush_interval,
+    enqueue_timeout=settings.enqueue_timeout,
+)
+atexit.register(audit_log.shutdown)
+
+
+def _queue_samples() -> Iterable[tuple[str, str, Labels, float]]:
+    yield "gauge", "audit_queue_depth", (), float(audit_log.pending())
+
+
+registry.register_collector(_queue_samples)
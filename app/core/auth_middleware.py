@@ -0,0 +1,106 @@
+"""Middleware autentikasi JWT berbasis ASGI murni.
+
+Berbeda dengan `@app.middleware("http")` (BaseHTTPMiddleware), middleware ini
+tidak membungkus request/response dalam objek Starlette maupun task tambahan:
+header `Authorization` dibaca langsung dari `scope["headers"]`, token diverifikasi
+dengan PyJWT memakai konfigurasi `JWTSettings`, lalu claims disimpan di
+`scope["state"]["jwt_claims"]` (terbaca sebagai `request.state.jwt_claims`).
+Response endpoint diteruskan apa adanya, termasuk streaming response. Aktivitas
+user (`last_seen_at`) hanya dicatat ke tracker in-memory (`app.core.activity`).
+
+Path publik dikompilasi sekali menjadi set path eksak dan tuple prefix; entri
+berakhiran `/*` (misal `/docs/*`) dicocokkan sebagai prefix.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+import jwt
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.activity import activity_tracker
+from app.core.audit import current_actor
+from app.core.config import JWTSettings
+
+_UNAUTHORIZED_BODY = b'{"detail":"Unauthorized"}'
+_UNAUTHORIZED_HEADERS = [
+    (b"content-length", str(len(_UNAUTHORIZED_BODY)).encode("latin-1")),
+    (b"content-type", b"application/json"),
+]
+
+
+def compile_public_paths(paths: Iterable[str]) -> tuple[frozenset[str], tuple[str, ...]]:
+    """Pisahkan path publik menjadi set path eksak dan tuple prefix (`/x/*` -> `/x/`)."""
+    exact: set[str] = set()
+    prefixes: set[str] = set()
+    for path in paths:
+        if path.endswith("/*"):
+            prefixes.add(path[:-1])
+        else:
+            exact.add(path)
+    # Prefix terpanjang lebih dulu; `str.startswith(tuple)` berhenti di match pertama.
+    return frozenset(exact), tuple(sorted(prefixes, key=len, reverse=True))
+
+
+def _subject_id(claims: dict[str, Any]) -> int | None:
+    try:
+        return int(claims["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class JWTAuthMiddleware:
+    """Tolak request non-publik tanpa access token valid dengan HTTP 401."""
+
+    def __init__(self, app: ASGIApp, public_paths: Iterable[str]) -> None:
+        self.app = app
+        self.exact_paths, self.prefix_paths = compile_public_paths(public_paths)
+        settings = JWTSettings()
+        self.secret_key = settings.authjwt_secret_key
+        self.algorithms = [settings.authjwt_algorithm]
+
+    def is_public(self, path: str) -> bool:
+        return path in self.exact_paths or (
+            bool(self.prefix_paths) and path.startswith(self.prefix_paths)
+        )
+
+    def decode_access_token(self, headers: Iterable[tuple[bytes, bytes]]) -> dict[str, Any] | None:
+        """Ambil dan verifikasi access token dari header `Authorization: Bearer <token>`."""
+        for name, value in headers:
+            if name == b"authorization":
+                parts = value.split()
+                if len(parts) != 2 or parts[0] != b"Bearer":
+                    return None
+                try:
+                    claims = jwt.decode(parts[1], self.secret_key, algorithms=self.algorithms)
+                except jwt.PyJWTError:
+                    return None
+                return claims if claims.get("type") == "access" else None
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or self.is_public(
+            scope["path"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        claims = self.decode_access_token(scope["headers"])
+        if claims is None:
+            await send(
+                {"type": "http.response.start", "status": 401, "headers": _UNAUTHORIZED_HEADERS}
+            )
+            await send({"type": "http.response.body", "body": _UNAUTHORIZED_BODY})
+            return
+
+        # Simpan claims yang sudah di-decode agar otorisasi tidak perlu decode ulang.
+        scope.setdefault("state", {})["jwt_claims"] = claims
+        user_id = _subject_id(claims)
+        if user_id is not None:
+            activity_tracker.seen(user_id)
+        # Pelaku untuk audit log; ContextVar ikut tersalin ke threadpool endpoint.
+        token = current_actor.set(user_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_actor.reset(token)
@@ -0,0 +1,93 @@
+"""Otorisasi berbasis claims JWT tanpa query database.
+
+Middleware autentikasi menyimpan claims token yang sudah di-decode ke
+`request.state.jwt_claims`. Dependency `require_permission(...)` lalu cukup
+mengecek claim `permissions` terhadap kode yang dibutuhkan route.
+
+Semua kode permission yang dipakai route didaftarkan saat modul router di-import,
+lalu dibekukan menjadi satu `frozenset` (index) saat aplikasi start. Per request,
+permission dari token dipotong ke index itu sekali (`index & token_permissions`)
+dan disimpan di `request.state`, sehingga setiap pengecekan hanyalah tes subset
+antar frozenset kecil. Token dengan claim compact (`pm` bitmask) di-decode lewat
+snapshot registry permission yang di-cache (lihat `app.core.permission_registry`);
+token yang versi registry-nya (`pv`) tidak sama dengan snapshot memicu
+`OutdatedClaimsError`, yang oleh `require_permission` dijawab 401 agar klien
+melakukan refresh token.
+"""
+
+import sys
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+
+from app.core.permission_registry import get_registry
+
+_registered_codes: set[str] = set()
+_permission_index: frozenset[str] | None = None
+
+
+class OutdatedClaimsError(Exception):
+    """Claim compact diterbitkan untuk versi registry permission yang lain."""
+
+
+def freeze_permission_index() -> frozenset[str]:
+    """Bekukan kode permission yang dipakai route menjadi index frozenset."""
+    global _permission_index
+    _permission_index = frozenset(_registered_codes)
+    return _permission_index
+
+
+def permission_index() -> frozenset[str]:
+    return _permission_index if _permission_index is not None else freeze_permission_index()
+
+
+def claims_permissions(claims: dict[str, Any]) -> frozenset[str]:
+    """Permission dari claims token yang ada di index (format daftar maupun compact).
+
+    Claim compact bisa memuat ulang registry dari database, jadi panggil dari thread
+    pool, bukan langsung di event loop.
+    """
+    if "pm" in claims:
+        # Claim compact: cukup cek bit milik kode yang ada di index. Bit hanya
+        # bermakna terhadap registry versi yang sama dengan saat token diterbitkan.
+        registry = get_registry(expected_version=claims.get("pv"))
+        if registry.version != claims.get("pv"):
+            raise OutdatedClaimsError(claims.get("pv"))
+        return registry.decode(claims["pm"], permission_index())
+    return permission_index().intersection(claims.get("permissions") or ())
+
+
+def granted_permissions(request: Request) -> frozenset[str]:
+    """Permission token yang relevan untuk route (irisan dengan index), sekali per request."""
+    granted = getattr(request.state, "granted_permissions", None)
+    if granted is None:
+        claims: dict[str, Any] = getattr(request.state, "jwt_claims", None) or {}
+        granted = claims_permissions(claims)
+        request.state.granted_permissions = granted
+    return granted
+
+
+def require_permission(*codes: str) -> Callable[[Request], None]:
+    """Dependency FastAPI: tolak request (403) jika token tidak punya semua `codes`.
+
+    Contoh: `@router.delete(..., dependencies=[Depends(require_permission("users.manage"))])`.
+    """
+    required = frozenset(sys.intern(code) for code in codes)
+    _registered_codes.update(required)
+
+    def dependency(request: Request) -> None:
+        try:
+            granted = granted_permissions(request)
+        except OutdatedClaimsError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Permission claims are outdated, refresh the token",
+            )
+        if not required <= granted:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions",
+            )
+
+    return dependency
@@ -0,0 +1,100 @@
+"""Invalidasi cache in-process lintas worker lewat tabel `cache_epochs`.
+
+Setiap family entitas (`menu`, `rbac`, `user`, `permission`) punya satu baris
+berisi counter `epoch`. Repository menaikkan epoch family yang terdampak di
+transaksi yang sama dengan write-nya (`bump_epochs` sebelum commit), sehingga
+epoch baru terlihat tepat saat data barunya terlihat.
+
+Tiap proses menyimpan epoch terakhir yang diketahuinya. `sync_cache_epochs()`
+dipanggil sebelum membaca cache lokal (response cache, registry permission); paling
+sering sekali per `CACHE_EPOCH_CHECK_MS` milidetik ia membaca tabel kecil ini
+dengan satu query, lalu menjalankan callback invalidasi untuk family yang epoch-nya
+berubah. Data basi di worker lain karenanya paling lama bertahan selama interval
+tersebut, tanpa Redis atau pub/sub.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.config import CacheEpochSettings
+from app.core.database import engine, utcnow
+from app.models import CacheEpoch
+
+logger = logging.getLogger(__name__)
+
+settings = CacheEpochSettings()
+
+# Baris untuk family ini dibuat oleh migrasi `20261019_0007`.
+FAMILIES = ("menu", "rbac", "user", "permission")
+
+
+def bump_epochs(db: Session, *families: str) -> None:
+    """Naikkan epoch `families` di transaksi `db`; panggil sebelum `db.commit()`."""
+    if not settings.enabled:
+        return
+    db.execute(
+        update(CacheEpoch)
+        .where(CacheEpoch.family.in_(families))
+        .values(epoch=CacheEpoch.epoch + 1, updated_at=utcnow())
+    )
+
+
+class EpochWatcher:
+    """Pembanding epoch lokal vs database dengan pengecekan ber-throttle."""
+
+    def __init__(self, *, enabled: bool, check_interval: float) -> None:
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self._known: dict[str, int] | None = None
+        self._checked_at = float("-inf")
+        self._callbacks: dict[str, list[Callable[[], None]]] = {}
+        self._lock = threading.Lock()
+
+    def on_change(self, family: str, callback: Callable[[], None]) -> None:
+        """Daftarkan callback invalidasi lokal untuk `family`."""
+        self._callbacks.setdefault(family, []).append(callback)
+
+    def sync(self) -> None:
+        if not self.enabled or time.monotonic() - self._checked_at < self.check_interval:
+            return
+        # Satu thread cukup melakukan pengecekan; thread lain memakai cache apa adanya.
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                with engine.connect() as connection:
+                    rows = connection.execute(select(CacheEpoch.family, CacheEpoch.epoch)).all()
+                current = {family: epoch for family, epoch in rows}
+            except DBAPIError:
+                logger.warning("Cannot read cache_epochs; local caches rely on TTL", exc_info=True)
+                return
+            known, self._known = self._known, current
+            if known is None:
+                return
+            for family, epoch in current.items():
+                if known.get(family) != epoch:
+                    for callback in self._callbacks.get(family, ()):
+                        callback()
+        finally:
+            self._lock.release()
+
+
+cache_epochs = EpochWatcher(
+    enabled=settings.enabled, check_interval=settings.check_interval_ms / 1000
+)
+
+
+def on_epoch_change(family: str, callback: Callable[[], None]) -> None:
+    cache_epochs.on_change(family, callback)
+
+
+def sync_cache_epochs() -> None:
+    """Invalidasi cache lokal yang epoch-nya sudah dinaikkan proses lain."""
+    cache_epochs.sync()
@@ -0,0 +1,60 @@
+"""Kompresi gzip ter-negosiasi untuk response API.
+
+`GZipMiddleware` bawaan Starlette hanya mengecek substring `gzip` pada header
+`Accept-Encoding`, sehingga `gzip;q=0` tetap dikompresi. Middleware di sini
+memakai negosiasi yang benar, dan helper yang sama dipakai response cache untuk
+memilih payload gzip yang sudah disiapkan sebelumnya.
+"""
+
+import gzip
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import CompressionSettings
+
+settings = CompressionSettings()
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """True jika `Accept-Encoding` menerima gzip (atau `*`) dengan q > 0."""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def gzip_bytes(body: bytes) -> bytes:
+    """Kompresi deterministik (mtime=0) agar payload identik antar worker."""
+    return gzip.compress(body, compresslevel=settings.compress_level, mtime=0)
+
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware dengan negosiasi `Accept-Encoding` yang menghormati q-value."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(
+            app,
+            minimum_size=settings.minimum_size,
+            compresslevel=settings.compress_level,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and accepts_gzip(
+            Headers(scope=scope).get("accept-encoding")
+        ):
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from pydantic import BaseModel
 
@@ -9,3 +10,107 @@ class JWTSettings(BaseModel):
     authjwt_access_token_expires: int = int(os.getenv("JWT_ACCESS_EXPIRES", "3600"))
     authjwt_refresh_token_expires: int = int(os.getenv("JWT_REFRESH_EXPIRES", "86400"))
 
+
+class HTTPCacheSettings(BaseModel):
+    menu_max_age: int = int(os.getenv("HTTP_CACHE_MENU_MAX_AGE", "0"))
+    rbac_max_age: int = int(os.getenv("HTTP_CACHE_RBAC_MAX_AGE", "0"))
+
+
+class ResponseCacheSettings(BaseModel):
+    enabled: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+    max_bytes: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    ttl_seconds: float = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+
+class CompressionSettings(BaseModel):
+    minimum_size: int = int(os.getenv("GZIP_MINIMUM_SIZE", "500"))
+    compress_level: int = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+
+
+class UserImportSettings(BaseModel):
+    batch_size: int = int(os.getenv("USER_IMPORT_BATCH_SIZE", "500"))
+    hash_workers: int = int(os.getenv("USER_IMPORT_HASH_WORKERS", str(os.cpu_count() or 1)))
+    max_errors: int = int(os.getenv("USER_IMPORT_MAX_ERRORS", "1000"))
+
+
+class ClaimsSettings(BaseModel):
+    compact_permissions: bool = os.getenv("JWT_COMPACT_CLAIMS", "false").lower() in {
+        "1",
+        "true",
+        "yes",
+    }
+    registry_refresh_seconds: float = float(os.getenv("PERMISSION_REGISTRY_REFRESH", "30"))
+
+
+class MetricsSettings(BaseModel):
+    enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() in {"1", "true", "yes"}
+    multiproc_dir: str = os.getenv("METRICS_MULTIPROC_DIR", "")
+    flush_interval: float = float(os.getenv("METRICS_FLUSH_INTERVAL", "1"))
+    # Bearer statis untuk scraper; kosong = `/metrics` butuh access token user.
+    token: str = os.getenv("METRICS_TOKEN", "")
+
+
+class ProfilerSettings(BaseModel):
+    enabled: bool = os.getenv("PROFILER_ENABLED", "true").lower() in {"1", "true", "yes"}
+    directory: str = os.getenv(
+        "PROFILE_DIR", os.path.join(tempfile.gettempdir(), "baldas-profiles")
+    )
+    ring_size: int = int(os.getenv("PROFILE_RING_SIZE", "20"))
+    sample_interval: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))
+
+
+def _optional_int(name: str) -> int | None:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else None
+
+
+class ServerSettings(BaseModel):
+    host: str = os.getenv("HOST", "0.0.0.0")
+    port: int = int(os.getenv("PORT", "8000"))
+    workers: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    backlog: int = int(os.getenv("UVICORN_BACKLOG", "2048"))
+    keep_alive: int = int(os.getenv("UVICORN_KEEP_ALIVE", "5"))
+    limit_concurrency: int | None = _optional_int("UVICORN_LIMIT_CONCURRENCY")
+    loop: str = os.getenv("UVICORN_LOOP", "auto")
+    http: str = os.getenv("UVICORN_HTTP", "auto")
+    migration_lock_file: str = os.getenv(
+        "MIGRATION_LOCK_FILE", os.path.join(tempfile.gettempdir(), "baldas-migrate.lock")
+    )
+
+
+class AdmissionSettings(BaseModel):
+    enabled: bool = os.getenv("ADMISSION_ENABLED", "true").lower() in {"1", "true", "yes"}
+    # Batas request in-flight per kelas route, format `kelas=jumlah` dipisah koma.
+    limits: str = os.getenv("ADMISSION_LIMITS", "auth=8,import=2,write=24,read=48")
+    max_pool_wait_ms: float = float(os.getenv("ADMISSION_MAX_POOL_WAIT_MS", "250"))
+    retry_after: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    ready_ping_timeout: float = float(os.getenv("READY_PING_TIMEOUT", "2"))
+
+
+class DeadlineSettings(BaseModel):
+    enabled: bool = os.getenv("REQUEST_DEADLINE_ENABLED", "true").lower() in {"1", "true", "yes"}
+    # Deadline default (detik) untuk route tanpa `request_deadline`; 0 = tanpa batas.
+    default_seconds: float = float(os.getenv("REQUEST_DEADLINE_DEFAULT", "30"))
+    # Interval progress handler SQLite dalam instruksi VM (makin kecil makin presisi).
+    sqlite_progress_steps: int = int(os.getenv("SQLITE_PROGRESS_STEPS", "1000"))
+
+
+class AuditSettings(BaseModel):
+    enabled: bool = os.getenv("AUDIT_ENABLED", "true").lower() in {"1", "true", "yes"}
+    queue_size: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    flush_interval: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1"))
+    # Lama producer menunggu saat antrean penuh sebelum menulis event-nya sendiri.
+    enqueue_timeout: float = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT", "0.05"))
+
+
+class ActivitySettings(BaseModel):
+    enabled: bool = os.getenv("ACTIVITY_TRACKING_ENABLED", "true").lower() in {"1", "true", "yes"}
+    flush_interval: float = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "5"))
+    batch_size: int = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+
+
+class CacheEpochSettings(BaseModel):
+    enabled: bool = os.getenv("CACHE_EPOCHS_ENABLED", "true").lower() in {"1", "true", "yes"}
+    # Jeda minimum antar pengecekan tabel cache_epochs per proses (milidetik).
+    check_interval_ms: float = float(os.getenv("CACHE_EPOCH_CHECK_MS", "250"))
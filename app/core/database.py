@@ -1,15 +1,73 @@
+import math
 import os
+import threading
+import time
 from collections.abc import Generator
+from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./baldas_blog.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
+
+class PoolWaitTracker:
+    """Rata-rata bergerak (EWMA) waktu tunggu checkout koneksi dari pool.
+
+    Nilai meluruh menuju nol dengan `half_life` detik sejak observasi terakhir,
+    sehingga estimasi tidak "macet" tinggi ketika request sedang ditolak dan
+    tidak ada checkout baru yang memperbaruinya.
+    """
+
+    def __init__(self, alpha: float = 0.2, half_life: float = 1.0) -> None:
+        self.alpha = alpha
+        self.half_life = half_life
+        self._average = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _decayed(self, now: float) -> float:
+        return self._average * math.pow(0.5, (now - self._updated_at) / self.half_life)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._average = self._decayed(now) * (1 - self.alpha) + seconds * self.alpha
+            self._updated_at = now
+
+    def current(self) -> float:
+        with self._lock:
+            return self._decayed(time.monotonic())
+
+
+pool_wait = PoolWaitTracker()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool yang mencatat lama menunggu koneksi ke `pool_wait`."""
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - started)
+
+
+def _engine_options(url: str) -> dict[str, Any]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {"poolclass": TimedQueuePool}
+    options: dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    # SQLite in-memory tetap memakai pool default (satu koneksi per thread).
+    if parsed.database not in (None, "", ":memory:"):
+        options["poolclass"] = TimedQueuePool
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -18,6 +76,11 @@ class Base(DeclarativeBase):
     pass
 
 
+def utcnow() -> datetime:
+    """Timestamp UTC beresolusi mikrodetik (CURRENT_TIMESTAMP SQLite hanya detik)."""
+    return datetime.now(timezone.utc)
+
+
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
     try:
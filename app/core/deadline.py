@@ -0,0 +1,187 @@
+"""Deadline per route: timeout request dan statement timeout database.
+
+Deadline dideklarasikan di router sebagai dependency, misalnya:
+
+    @router.get("/datatables", dependencies=[Depends(request_deadline(5))])
+
+Route tanpa deklarasi memakai `REQUEST_DEADLINE_DEFAULT` detik; `None` berarti
+tanpa deadline (misal import massal). Deadline ditegakkan di dua lapis:
+
+1. Database: statement yang berjalan melewati sisa waktu dihentikan oleh database
+   sendiri, sehingga koneksi pool langsung bebas. PostgreSQL memakai
+   `SET LOCAL statement_timeout` di awal tiap transaksi; SQLite memakai progress
+   handler yang meng-interrupt query (`sqlite3.OperationalError: interrupted`).
+2. Request: `DeadlineMiddleware` menjalankan aplikasi di dalam cancel scope anyio
+   yang deadline-nya diperbarui oleh dependency; saat lewat, request dibatalkan
+   dan dijawab `504`.
+
+Batasan: cancel scope hanya bisa membatalkan kode async. Endpoint sync (misal
+`/user/datatables`) berjalan di threadpool dan thread-nya tidak bisa dihentikan;
+cancel scope menunggu thread selesai, sehingga untuk route sync yang benar-benar
+membebaskan koneksi dan mengakhiri request adalah statement timeout (lapis 1).
+Waktu yang dihabiskan di luar query (misal serialisasi) tidak dibatasi.
+
+Kedua jenis timeout dicatat di metrics `http_request_timeouts_total` dengan label
+`source` (`request` atau `statement`).
+"""
+
+import math
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+
+import anyio
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import DeadlineSettings
+from app.core.database import engine
+from app.core.metrics import registry, route_template
+
+settings = DeadlineSettings()
+
+# Batas waktu absolut (`time.monotonic()`) untuk statement database request ini.
+# ContextVar ikut tersalin ke threadpool tempat endpoint sync dan query berjalan.
+_statement_deadline: ContextVar[float | None] = ContextVar("statement_deadline", default=None)
+
+_TIMEOUT_BODY = b'{"detail":"Request deadline exceeded"}'
+_TIMEOUT_HEADERS = [
+    (b"content-length", str(len(_TIMEOUT_BODY)).encode("latin-1")),
+    (b"content-type", b"application/json"),
+]
+# SQLSTATE `query_canceled` PostgreSQL (termasuk karena statement_timeout).
+_PG_QUERY_CANCELED = "57014"
+
+
+def remaining_ms() -> int | None:
+    """Sisa waktu deadline statement dalam milidetik (minimal 1), atau None."""
+    deadline = _statement_deadline.get()
+    if deadline is None:
+        return None
+    return max(1, math.ceil((deadline - time.monotonic()) * 1000))
+
+
+def is_statement_timeout(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    return getattr(orig, "pgcode", None) == _PG_QUERY_CANCELED or str(orig) == "interrupted"
+
+
+# --- Enforcement di database -------------------------------------------------------
+
+
+def _sqlite_progress() -> int:
+    deadline = _statement_deadline.get()
+    return 1 if deadline is not None and time.monotonic() > deadline else 0
+
+
+def _install_sqlite_handler(dbapi_connection: Any, connection_record: Any, proxy: Any) -> None:
+    # Dipasang saat checkout (sekali per koneksi) agar koneksi yang sudah ada di pool
+    # sebelum modul ini di-import juga ikut terpasang.
+    if not connection_record.info.get("deadline_handler"):
+        dbapi_connection.set_progress_handler(_sqlite_progress, settings.sqlite_progress_steps)
+        connection_record.info["deadline_handler"] = True
+
+
+def _set_postgres_timeout(conn: Connection) -> None:
+    timeout = remaining_ms()
+    if timeout is None:
+        return
+    # Event `begin` terjadi sebelum transaksi aktif di Connection: pakai cursor DBAPI
+    # langsung. `SET LOCAL` otomatis kembali ke default saat transaksi selesai.
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET LOCAL statement_timeout = {timeout}")
+    finally:
+        cursor.close()
+
+
+if settings.enabled:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "checkout", _install_sqlite_handler)
+    elif engine.dialect.name == "postgresql":
+        event.listen(engine, "begin", _set_postgres_timeout)
+
+
+# --- Deklarasi di router -----------------------------------------------------------
+
+
+def _apply(request: Request, seconds: float | None) -> None:
+    cancel_scope: anyio.CancelScope | None = getattr(request.state, "deadline_scope", None)
+    if cancel_scope is None:
+        return
+    if seconds is None:
+        cancel_scope.deadline = math.inf
+        _statement_deadline.set(None)
+        return
+    cancel_scope.deadline = anyio.current_time() + seconds
+    _statement_deadline.set(time.monotonic() + seconds)
+
+
+def request_deadline(seconds: float | None) -> Callable[[Request], Awaitable[None]]:
+    """Dependency FastAPI: ganti deadline request ini menjadi `seconds` dari sekarang.
+
+    Contoh: `@router.get(..., dependencies=[Depends(request_deadline(5))])`.
+    Dependency async agar berjalan di task request (bukan threadpool), sehingga
+    cancel scope dan ContextVar yang diubah adalah milik request itu.
+    """
+
+    async def dependency(request: Request) -> None:
+        _apply(request, seconds)
+
+    return dependency
+
+
+# --- Middleware --------------------------------------------------------------------
+
+
+class DeadlineMiddleware:
+    """Batalkan request yang melewati deadline dan jawab `504` (ASGI murni)."""
+
+    def __init__(self, app: ASGIApp, default_seconds: float = settings.default_seconds) -> None:
+        self.app = app
+        self.default_seconds = default_seconds if default_seconds > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        seconds = self.default_seconds
+        cancel_scope = anyio.CancelScope(
+            deadline=math.inf if seconds is None else anyio.current_time() + seconds
+        )
+        scope.setdefault("state", {})["deadline_scope"] = cancel_scope
+        token = _statement_deadline.set(None if seconds is None else time.monotonic() + seconds)
+        try:
+            with cancel_scope:
+                await self.app(scope, receive, send_wrapper)
+        except DBAPIError as exc:
+            if response_started or not is_statement_timeout(exc):
+                raise
+            source = "statement"
+        else:
+            if not cancel_scope.cancelled_caught:
+                return
+            source = "request"
+        finally:
+            _statement_deadline.reset(token)
+
+        registry.inc(
+            "http_request_timeouts_total",
+            (("route", route_template(scope)), ("source", source)),
+        )
+        if not response_started:
+            await send({"type": "http.response.start", "status": 504, "headers": _TIMEOUT_HEADERS})
+            await send({"type": "http.response.body", "body": _TIMEOUT_BODY})
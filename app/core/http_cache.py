@@ -0,0 +1,71 @@
+"""Helper HTTP caching: weak ETag, conditional GET (`If-None-Match`), dan Cache-Control.
+
+Pola pemakaian di endpoint:
+
+    etag = weak_etag("menu-list", version, skip, limit)
+    cached = not_modified(request, response, etag, MENU_CACHE_CONTROL)
+    if cached:
+        return cached
+
+ETag dihitung dari sinyal versi murah (jumlah baris + updated_at terbaru),
+sehingga response 304 tidak perlu query ORM maupun serialisasi pydantic.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.config import HTTPCacheSettings
+
+_settings = HTTPCacheSettings()
+
+
+def private_cache_control(max_age: int) -> str:
+    """Policy untuk data per-user: boleh di-cache browser, wajib revalidasi saat kadaluarsa."""
+    if max_age <= 0:
+        return "private, no-cache"
+    return f"private, max-age={max_age}, must-revalidate"
+
+
+# Policy Cache-Control per kelompok route.
+MENU_CACHE_CONTROL = private_cache_control(_settings.menu_max_age)
+RBAC_CACHE_CONTROL = private_cache_control(_settings.rbac_max_age)
+PROFILE_CACHE_CONTROL = private_cache_control(0)
+
+
+def weak_etag(*parts: object) -> str:
+    """Bangun weak ETag (`W/"..."`) dari sinyal versi dan parameter request."""
+    raw = "|".join(str(part) for part in parts)
+    digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison sesuai RFC 9110: abaikan prefix `W/` di kedua sisi."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str,
+    *,
+    vary: str | None = None,
+) -> Response | None:
+    """Pasang header validator; kembalikan response 304 jika salinan client masih valid."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if vary:
+        headers["Vary"] = vary
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,398 @@
+"""Registry metrics in-process dengan output format teks Prometheus.
+
+Metrics yang dikumpulkan:
+- `http_requests_total` dan histogram `http_request_duration_seconds` per
+  method, template route (misal `/user/{user_id}`), dan status.
+- `http_requests_in_flight`: request yang sedang diproses.
+- `db_pool_*`: ukuran pool koneksi SQLAlchemy, koneksi terpakai, overflow, dan
+  rata-rata waktu tunggu checkout.
+- `http_request_timeouts_total`: request yang melewati deadline route, baik
+  dibatalkan di level request maupun dihentikan statement timeout database.
+- `http_requests_shed_total`: request yang ditolak admission control per kelas
+  route dan alasan.
+- `response_cache_*`: hit, miss, eviction, ukuran bytes, dan hit ratio.
+- `audit_*`: event audit yang ditulis, gagal, kena backpressure, dan panjang antrean.
+- `activity_*`: update last login/last seen user yang tertunda dan yang sudah ditulis.
+
+Mode multi-worker (`METRICS_MULTIPROC_DIR` diisi): tiap proses worker menulis
+snapshot metrics-nya ke file `metrics_<pid>.json` di direktori itu (atomik via
+rename, paling lambat tiap `METRICS_FLUSH_INTERVAL` detik). `/metrics` di worker
+mana pun menggabungkan semua file: counter dan histogram dijumlahkan (termasuk
+milik worker yang sudah mati agar counter tetap monoton), gauge hanya dari proses
+yang masih hidup. Direktori dikosongkan saat server start (`reset_multiprocess_dir`).
+
+Akses `/metrics`: jika `METRICS_TOKEN` diisi, scraper cukup mengirim
+`Authorization: Bearer <METRICS_TOKEN>` (`require_metrics_token`); tanpa itu route
+membutuhkan access token user dengan permission `system.metrics`.
+"""
+
+import bisect
+import hmac
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import MetricsSettings
+from app.core.database import engine, pool_wait
+from app.core.response_cache import response_cache
+
+settings = MetricsSettings()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+METRICS_PERMISSION = "system.metrics"
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def require_metrics_token(request: Request) -> None:
+    """Dependency `/metrics`: tolak (401) jika bearer bukan `METRICS_TOKEN`."""
+    scheme, _, credential = request.headers.get("authorization", "").partition(" ")
+    if scheme != "Bearer" or not hmac.compare_digest(
+        credential.encode("utf-8"), settings.token.encode("utf-8")
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+
+_HELP = {
+    "http_requests_total": ("counter", "Total request HTTP per method, route, dan status."),
+    "http_request_duration_seconds": (
+        "histogram",
+        "Latensi request HTTP per method, route, dan status.",
+    ),
+    "http_requests_in_flight": ("gauge", "Request HTTP yang sedang diproses."),
+    "db_pool_size": ("gauge", "Ukuran pool koneksi database."),
+    "db_pool_checked_out": ("gauge", "Koneksi database yang sedang dipakai."),
+    "db_pool_overflow": ("gauge", "Koneksi overflow di atas ukuran pool."),
+    "db_pool_wait_seconds": ("gauge", "Rata-rata bergerak waktu tunggu checkout koneksi."),
+    "http_request_timeouts_total": (
+        "counter",
+        "Request yang melewati deadline per route dan sumber (request/statement).",
+    ),
+    "http_requests_shed_total": (
+        "counter",
+        "Request yang ditolak admission control (503) per kelas route dan alasan.",
+    ),
+    "audit_events_written_total": ("counter", "Event audit yang berhasil ditulis."),
+    "audit_events_failed_total": ("counter", "Event audit yang gagal ditulis setelah retry."),
+    "audit_events_backpressure_total": (
+        "counter",
+        "Event audit yang ditulis langsung oleh producer karena antrean penuh.",
+    ),
+    "audit_queue_depth": ("gauge", "Event audit yang menunggu ditulis."),
+    "activity_pending_users": ("gauge", "User dengan aktivitas yang belum ditulis ke database."),
+    "activity_users_written_total": ("counter", "Update aktivitas user yang sudah ditulis."),
+    "response_cache_hits_total": ("counter", "Cache hit response cache in-process."),
+    "response_cache_misses_total": ("counter", "Cache miss response cache in-process."),
+    "response_cache_evictions_total": ("counter", "Entry response cache yang di-evict."),
+    "response_cache_bytes": ("gauge", "Ukuran payload di response cache (bytes)."),
+    "response_cache_hit_ratio": ("gauge", "Rasio hit response cache."),
+}
+
+
+class MetricsRegistry:
+    """Penyimpan counter, gauge, dan histogram milik satu proses."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], list[Any]] = {}
+        self._gauges: dict[tuple[str, Labels], float] = {}
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, Labels, float]]]] = []
+        self._dirty = False
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1.0) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+            self._dirty = True
+
+    def add_gauge(self, name: str, amount: float, labels: Labels = ()) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0.0) + amount
+            self._dirty = True
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        index = bisect.bisect_left(LATENCY_BUCKETS, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # [jumlah per bucket (non-kumulatif, + bucket +Inf), sum, count]
+                histogram = self._histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+            self._dirty = True
+
+    def register_collector(
+        self, collector: Callable[[], Iterable[tuple[str, str, Labels, float]]]
+    ) -> None:
+        """Collector dipanggil saat snapshot; menghasilkan `(tipe, nama, label, nilai)`."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict[str, Any]:
+        counters = []
+        gauges = []
+        for kind, name, labels, value in (
+            sample for collector in self._collectors for sample in collector()
+        ):
+            (counters if kind == "counter" else gauges).append([name, list(labels), value])
+        with self._lock:
+            self._dirty = False
+            counters.extend(
+                [name, list(labels), value]
+                for (name, labels), value in self._counters.items()
+            )
+            gauges.extend(
+                [name, list(labels), value] for (name, labels), value in self._gauges.items()
+            )
+            histograms = [
+                [name, list(labels), list(data[0]), data[1], data[2]]
+                for (name, labels), data in self._histograms.items()
+            ]
+        return {
+            "pid": os.getpid(),
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+        }
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+
+registry = MetricsRegistry()
+
+
+def _pool_samples() -> Iterable[tuple[str, str, Labels, float]]:
+    pool = engine.pool
+    # Hanya QueuePool yang punya ukuran; pool lain (misal NullPool) dilewati.
+    for name, method in (
+        ("db_pool_size", "size"),
+        ("db_pool_checked_out", "checkedout"),
+        ("db_pool_overflow", "overflow"),
+    ):
+        getter = getattr(pool, method, None)
+        if getter is not None:
+            yield "gauge", name, (), float(getter())
+    yield "gauge", "db_pool_wait_seconds", (), pool_wait.current()
+
+
+def _cache_samples() -> Iterable[tuple[str, str, Labels, float]]:
+    stats = response_cache.stats()
+    yield "counter", "response_cache_hits_total", (), float(stats["hits"])
+    yield "counter", "response_cache_misses_total", (), float(stats["misses"])
+    yield "counter", "response_cache_evictions_total", (), float(stats["evictions"])
+    yield "gauge", "response_cache_bytes", (), float(stats["bytes"])
+
+
+registry.register_collector(_pool_samples)
+registry.register_collector(_cache_samples)
+
+
+# --- Mode multi-proses -----------------------------------------------------------
+
+_flusher_started = False
+_flusher_lock = threading.Lock()
+
+
+def _snapshot_path(pid: int) -> Path:
+    return Path(settings.multiproc_dir) / f"metrics_{pid}.json"
+
+
+def flush() -> None:
+    """Tulis snapshot proses ini ke direktori multiproses (atomik)."""
+    if not settings.multiproc_dir:
+        return
+    path = _snapshot_path(os.getpid())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(registry.snapshot()), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(settings.flush_interval)
+        if registry.dirty:
+            flush()
+
+
+def ensure_flusher() -> None:
+    """Jalankan thread flush periodik (sekali per proses) bila mode multiproses aktif."""
+    global _flusher_started
+    if not settings.multiproc_dir or _flusher_started:
+        return
+    with _flusher_lock:
+        if _flusher_started:
+            return
+        Path(settings.multiproc_dir).mkdir(parents=True, exist_ok=True)
+        threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+        _flusher_started = True
+
+
+def reset_multiprocess_dir() -> None:
+    """Hapus snapshot lama; dipanggil proses induk sebelum worker dijalankan."""
+    if not settings.multiproc_dir:
+        return
+    directory = Path(settings.multiproc_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("metrics_*.json"):
+        path.unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect_snapshots() -> list[dict[str, Any]]:
+    if not settings.multiproc_dir:
+        return [registry.snapshot()]
+    flush()
+    snapshots = []
+    for path in Path(settings.multiproc_dir).glob("metrics_*.json"):
+        try:
+            snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            # File bisa terhapus/terganti bersamaan dengan reset; lewati.
+            continue
+    return snapshots
+
+
+# --- Render format teks Prometheus ----------------------------------------------
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_latest() -> str:
+    """Gabungkan snapshot semua proses dan render ke format eksposisi Prometheus."""
+    current_pid = os.getpid()
+    counters: dict[tuple[str, Labels], float] = {}
+    gauges: dict[tuple[str, Labels], float] = {}
+    histograms: dict[tuple[str, Labels], list[Any]] = {}
+    for snapshot in _collect_snapshots():
+        alive = snapshot["pid"] == current_pid or _pid_alive(snapshot["pid"])
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0.0) + value
+        if alive:
+            for name, labels, value in snapshot["gauges"]:
+                key = (name, tuple(map(tuple, labels)))
+                gauges[key] = gauges.get(key, 0.0) + value
+        for name, labels, buckets, total, count in snapshot["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.setdefault(key, [[0] * len(buckets), 0.0, 0])
+            merged[0] = [left + right for left, right in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+
+    hits = counters.get(("response_cache_hits_total", ()), 0.0)
+    misses = counters.get(("response_cache_misses_total", ()), 0.0)
+    gauges[("response_cache_hit_ratio", ())] = hits / (hits + misses) if hits + misses else 0.0
+
+    samples: dict[str, list[str]] = {}
+    for (name, labels), value in sorted({**counters, **gauges}.items()):
+        samples.setdefault(name, []).append(
+            f"{name}{_format_labels(labels)} {_format_value(value)}"
+        )
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        lines = samples.setdefault(name, [])
+        cumulative = 0
+        for bound, bucket_count in zip((*LATENCY_BUCKETS, float("inf")), buckets):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels((*labels, ('le', le)))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    output = []
+    for name in sorted(samples):
+        kind, help_text = _HELP.get(name, ("untyped", name))
+        output.append(f"# HELP {name} {help_text}")
+        output.append(f"# TYPE {name} {kind}")
+        output.extend(samples[name])
+    return "\n".join(output) + "\n"
+
+
+# --- Middleware ------------------------------------------------------------------
+
+
+_route_templates: dict[Any, str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """Template path route yang menangani request (misal `/user/{user_id}`)."""
+    # Router Starlette menulis `endpoint` ke scope saat route cocok.
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    template = _route_templates.get(endpoint)
+    if template is None:
+        template = UNMATCHED_ROUTE
+        for route in getattr(scope.get("app"), "routes", ()):
+            if getattr(route, "endpoint", None) is endpoint:
+                template = route.path
+                break
+        _route_templates[endpoint] = template
+    return template
+
+
+class MetricsMiddleware:
+    """Catat jumlah request, latensi, dan in-flight per template route (ASGI murni)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ensure_flusher()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.add_gauge("http_requests_in_flight", 1)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.add_gauge("http_requests_in_flight", -1)
+            labels = (
+                ("method", scope["method"]),
+                ("route", route_template(scope)),
+                ("status", str(status_code)),
+            )
+            registry.inc("http_requests_total", labels)
+            registry.observe("http_request_duration_seconds", labels, elapsed)
@@ -0,0 +1,116 @@
+"""Registry permission terversi untuk encoding claim permission berbentuk bitmask.
+
+Format claim compact (aktif jika `JWT_COMPACT_CLAIMS=true`):
+- `pv`: versi registry (hash pendek dari daftar `id:code` tabel permissions).
+- `pm`: bitmask base64url; bit ke-N menyala jika token punya permission `id=N`.
+
+Posisi bit memakai primary key permission sehingga stabil walau ada permission
+baru/terhapus. Registry di-cache per proses dan hanya dimuat ulang dari database
+jika token membawa versi berbeda (dibatasi `PERMISSION_REGISTRY_REFRESH` detik),
+atau segera setelah epoch `permission` di `cache_epochs` berubah.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache_epochs import on_epoch_change, sync_cache_epochs
+from app.core.config import ClaimsSettings
+from app.core.database import SessionLocal
+from app.models import Permission
+
+settings = ClaimsSettings()
+
+
+@dataclass(frozen=True)
+class PermissionRegistry:
+    version: str
+    bits_by_code: dict[str, int]
+    _index_bits: dict[frozenset[str], tuple[tuple[str, int], ...]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def decode(self, mask_claim: str, index: frozenset[str]) -> frozenset[str]:
+        """Decode bitmask, dibatasi ke kode di `index` (cukup cek bit yang relevan)."""
+        padded = mask_claim + "=" * (-len(mask_claim) % 4)
+        mask = int.from_bytes(base64.urlsafe_b64decode(padded), "little")
+        return frozenset(code for code, bit in self._bits_for(index) if mask >> bit & 1)
+
+    def _bits_for(self, index: frozenset[str]) -> tuple[tuple[str, int], ...]:
+        bits = self._index_bits.get(index)
+        if bits is None:
+            bits = tuple(
+                (code, self.bits_by_code[code])
+                for code in sorted(index)
+                if code in self.bits_by_code
+            )
+            self._index_bits[index] = bits
+        return bits
+
+
+def encode_permission_ids(permission_ids: Iterable[int]) -> str:
+    """Encode id permission menjadi bitmask base64url (tanpa padding)."""
+    mask = 0
+    for permission_id in permission_ids:
+        mask |= 1 << permission_id
+    raw = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+_snapshot: PermissionRegistry | None = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def load_registry(db: Session) -> PermissionRegistry:
+    rows = db.execute(select(Permission.id, Permission.code).order_by(Permission.id)).all()
+    digest = hashlib.blake2b(
+        ",".join(f"{row.id}:{row.code}" for row in rows).encode("utf-8"), digest_size=6
+    )
+    return PermissionRegistry(
+        version=digest.hexdigest(), bits_by_code={row.code: row.id for row in rows}
+    )
+
+
+def get_registry(
+    db: Session | None = None, *, expected_version: str | None = None
+) -> PermissionRegistry:
+    """Ambil snapshot registry; muat ulang jika kadaluarsa atau versinya berbeda."""
+    global _snapshot, _loaded_at
+    sync_cache_epochs()
+    with _lock:
+        snapshot, age = _snapshot, time.monotonic() - _loaded_at
+    stale = snapshot is None or (
+        age >= settings.registry_refresh_seconds
+        and (expected_version is None or snapshot.version != expected_version)
+    )
+    if not stale:
+        return snapshot  # type: ignore[return-value]
+
+    if db is not None:
+        registry = load_registry(db)
+    else:
+        session = SessionLocal()
+        try:
+            registry = load_registry(session)
+        finally:
+            session.close()
+    with _lock:
+        _snapshot, _loaded_at = registry, time.monotonic()
+    return registry
+
+
+def invalidate_registry() -> None:
+    """Paksa snapshot dimuat ulang pada akses berikutnya (dipanggil setelah write permission)."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+on_epoch_change("permission", invalidate_registry)
@@ -0,0 +1,260 @@
+"""Profiler per request on-demand lewat header `X-Profile`.
+
+Header `X-Profile: 1` hanya dihormati untuk token yang punya permission
+`system.profile`; request lain diteruskan tanpa biaya tambahan selain mengecek
+keberadaan header. Untuk request yang diprofile:
+
+- Sampling profiler (stdlib, `sys._current_frames`) mengambil stack semua thread
+  tiap `PROFILE_SAMPLE_INTERVAL` detik dan hanya menyimpan stack yang sedang
+  menjalankan endpoint request ini. Sampling dipakai (bukan `cProfile`) karena
+  endpoint sync berjalan di thread pool, sedangkan `cProfile` hanya melihat
+  thread yang mengaktifkannya.
+- Statement SQL beserta durasinya dicatat lewat event engine SQLAlchemy; listener
+  hanya terpasang selama ada request yang diprofile.
+
+Hasilnya ditulis sebagai file JSON ke ring di `PROFILE_DIR` (maksimal
+`PROFILE_RING_SIZE` file, yang tertua dihapus) dan id-nya dikirim di header
+response `X-Profile-Id`. Parameter statement SQL tidak disimpan.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.authorization import OutdatedClaimsError, claims_permissions
+from app.core.config import ProfilerSettings
+from app.core.database import engine, utcnow
+
+settings = ProfilerSettings()
+
+PROFILE_PERMISSION = "system.profile"
+_PROFILE_HEADER = b"x-profile"
+_MAX_STACK_DEPTH = 64
+
+# Daftar statement SQL milik request yang sedang diprofile (ikut terbawa ke
+# thread pool karena context di-copy oleh anyio).
+_current_sql: ContextVar[list[dict[str, Any]] | None] = ContextVar(
+    "profile_sql", default=None
+)
+_active_profiles = 0
+_active_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_sql.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    statements = _current_sql.get()
+    if statements is None:
+        return
+    started = conn.info["profile_started"].pop()
+    statements.append(
+        {
+            "statement": statement,
+            "executemany": executemany,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+    )
+
+
+def _attach_sql_listeners() -> None:
+    global _active_profiles
+    with _active_lock:
+        _active_profiles += 1
+        if _active_profiles == 1:
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _detach_sql_listeners() -> None:
+    global _active_profiles
+    with _active_lock:
+        _active_profiles -= 1
+        if _active_profiles == 0:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class StackSampler(threading.Thread):
+    """Sampling stack thread yang sedang menjalankan endpoint milik `scope`."""
+
+    def __init__(self, scope: Scope, interval: float) -> None:
+        super().__init__(name="request-profiler", daemon=True)
+        self.scope = scope
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            # Router menulis endpoint ke scope setelah route cocok.
+            endpoint = self.scope.get("endpoint")
+            code = getattr(endpoint, "__code__", None)
+            if code is None:
+                continue
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    stack = _folded_stack(frame, code)
+                    if stack is not None:
+                        self.stacks[stack] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _folded_stack(frame: Any, endpoint_code: Any) -> str | None:
+    """Stack "folded" (root;...;leaf) mulai dari endpoint; None jika bukan milik endpoint."""
+    names: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        if code is endpoint_code:
+            return ";".join(reversed(names[-_MAX_STACK_DEPTH:]))
+        frame = frame.f_back
+    return None
+
+
+class ProfileStore:
+    """Ring file profile JSON di satu direktori (aman dipakai beberapa worker)."""
+
+    def __init__(self, directory: str, ring_size: int) -> None:
+        self.directory = Path(directory)
+        self.ring_size = ring_size
+
+    def save(self, profile: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile['id']}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(profile), encoding="utf-8")
+        os.replace(tmp_path, path)
+        for stale in self._files()[self.ring_size :]:
+            stale.unlink(missing_ok=True)
+
+    def path_for(self, profile_id: str) -> Path | None:
+        # Id dibatasi ke karakter aman agar tidak bisa keluar dari direktori ring.
+        if not profile_id.replace("-", "").isalnum():
+            return None
+        path = self.directory / f"{profile_id}.json"
+        return path if path.is_file() else None
+
+    def recent(self) -> list[dict[str, Any]]:
+        summaries = []
+        for path in self._files():
+            try:
+                profile = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            summaries.append({key: profile.get(key) for key in _SUMMARY_FIELDS})
+        return summaries
+
+    def _files(self) -> list[Path]:
+        # Nama file diawali timestamp, sehingga urutan nama = urutan waktu (terbaru dulu).
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("*.json"), reverse=True)
+
+
+_SUMMARY_FIELDS = ("id", "started_at", "method", "path", "endpoint", "status", "duration_ms")
+
+profile_store = ProfileStore(settings.directory, settings.ring_size)
+
+
+def _wants_profile(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == _PROFILE_HEADER:
+            return value.strip() not in (b"", b"0", b"false")
+    return False
+
+
+def _may_profile(claims: dict[str, Any]) -> bool:
+    try:
+        return PROFILE_PERMISSION in claims_permissions(claims)
+    except OutdatedClaimsError:
+        # Token basi tetap diproses endpoint (yang akan menolaknya bila perlu),
+        # hanya tanpa profiling.
+        return False
+
+
+class ProfilerMiddleware:
+    """Jalankan request ber-header `X-Profile` di bawah profiler (ASGI murni).
+
+    Harus dipasang di dalam middleware autentikasi agar claims token sudah ada di
+    `scope["state"]`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        claims = scope.get("state", {}).get("jwt_claims")
+        # Claim compact bisa memicu query registry: jangan blok event loop.
+        if not claims or not await run_in_threadpool(_may_profile, claims):
+            await self.app(scope, receive, send)
+            return
+
+        started_at = utcnow()
+        profile_id = f"{started_at:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        statements: list[dict[str, Any]] = []
+        token = _current_sql.set(statements)
+        _attach_sql_listeners()
+        sampler = StackSampler(scope, settings.sample_interval)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            _detach_sql_listeners()
+            _current_sql.reset(token)
+            endpoint = scope.get("endpoint")
+            await run_in_threadpool(
+                profile_store.save,
+                {
+                    "id": profile_id,
+                    "started_at": started_at.isoformat(),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "endpoint": getattr(endpoint, "__qualname__", None),
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 3),
+                    "sample_interval_ms": settings.sample_interval * 1000,
+                    "samples": sampler.samples,
+                    "stacks": [
+                        {"stack": stack, "count": count}
+                        for stack, count in sampler.stacks.most_common()
+                    ],
+                    "sql": statements,
+                },
+            )
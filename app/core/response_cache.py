@@ -0,0 +1,215 @@
+"""Cache response in-process untuk GET idempoten (listing & fetch satu entitas).
+
+Isi cache adalah body JSON yang sudah diserialisasi (bytes), di-key berdasarkan
+route + parameter, dan dikelompokkan per namespace entitas (`menu`, `rbac`,
+`user`). Method write di repository memanggil `response_cache.invalidate(...)`
+setelah commit sehingga entry basi langsung dibuang.
+
+Eviction memakai LRU dengan batas total ukuran bytes, ditambah TTL per entry.
+Payload yang cukup besar disimpan sekaligus dalam bentuk gzip, sehingga cache hit
+dari client yang mendukung gzip tidak perlu kompresi ulang sama sekali.
+Race "baca lama lalu simpan setelah invalidasi" dicegah dengan generation
+counter per namespace: entry hanya disimpan jika generation belum berubah sejak
+data mulai dibaca. Write di worker lain terdeteksi lewat tabel `cache_epochs`
+(lihat `app.core.cache_epochs`), yang dicek sebelum setiap pembacaan cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from fastapi import Request, Response
+
+from app.core.cache_epochs import on_epoch_change, sync_cache_epochs
+from app.core.compression import accepts_gzip, gzip_bytes
+from app.core.compression import settings as compression_settings
+from app.core.config import ResponseCacheSettings
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes
+    gzip_body: bytes | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"")
+
+
+@dataclass
+class _CacheEntry:
+    payload: CachedPayload
+    namespace: str
+    expires_at: float
+
+
+class ResponseCache:
+    """LRU cache berbatas ukuran bytes dengan TTL per entry dan invalidasi per namespace."""
+
+    def __init__(self, *, max_bytes: int, ttl_seconds: float, enabled: bool = True) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._namespaces: dict[str, set[Hashable]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def get(self, key: Hashable) -> CachedPayload | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.payload
+
+    def set(
+        self,
+        key: Hashable,
+        payload: CachedPayload,
+        *,
+        namespace: str,
+        generation: int,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        if not self.enabled or payload.size > self.max_bytes:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            # Ada write di namespace ini sejak data dibaca: jangan simpan data basi.
+            if self._generations.get(namespace, 0) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(
+                payload=payload, namespace=namespace, expires_at=time.monotonic() + ttl
+            )
+            self._namespaces.setdefault(namespace, set()).add(key)
+            self._bytes += payload.size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._evictions += 1
+
+    def invalidate(self, namespace: str) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in self._namespaces.pop(namespace, set()):
+                self._remove(key)
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in list(self._namespaces):
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._entries.clear()
+            self._namespaces.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        # Dipanggil saat lock sudah dipegang.
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.payload.size
+        keys = self._namespaces.get(entry.namespace)
+        if keys is not None:
+            keys.discard(key)
+
+
+_settings = ResponseCacheSettings()
+response_cache = ResponseCache(
+    max_bytes=_settings.max_bytes,
+    ttl_seconds=_settings.ttl_seconds,
+    enabled=_settings.enabled,
+)
+for _namespace in ("menu", "rbac", "user"):
+    on_epoch_change(_namespace, partial(response_cache.invalidate, _namespace))
+
+
+def build_payload(body: bytes) -> CachedPayload:
+    """Siapkan payload cache; body di atas ambang minimum ikut dikompresi sekali."""
+    if len(body) < compression_settings.minimum_size:
+        return CachedPayload(body=body)
+    return CachedPayload(body=body, gzip_body=gzip_bytes(body))
+
+
+def cached_json(
+    key: Hashable, namespace: str, build: Callable[[], bytes]
+) -> CachedPayload:
+    """Ambil payload JSON dari cache, atau bangun body lewat `build()` lalu simpan."""
+    sync_cache_epochs()
+    payload = response_cache.get(key)
+    if payload is None:
+        generation = response_cache.generation(namespace)
+        body = build()
+        if not response_cache.enabled:
+            # Tanpa cache, kompresi diserahkan ke middleware gzip.
+            return CachedPayload(body=body)
+        payload = build_payload(body)
+        response_cache.set(key, payload, namespace=namespace, generation=generation)
+    return payload
+
+
+def json_response(payload: CachedPayload, request: Request, response: Response) -> Response:
+    """Bungkus payload siap-kirim, membawa header yang sudah dipasang di `response`.
+
+    Jika client menerima gzip dan versi terkompresi tersedia, body gzip dikirim
+    langsung dengan `Content-Encoding: gzip` (middleware gzip melewatkannya).
+    """
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name.lower() != "content-length"
+    }
+    headers["Vary"] = ", ".join(
+        value for value in (headers.pop("vary", None), "Accept-Encoding") if value
+    )
+    if payload.gzip_body is not None and accepts_gzip(
+        request.headers.get("accept-encoding")
+    ):
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=payload.gzip_body, media_type="application/json", headers=headers
+        )
+    return Response(content=payload.body, media_type="application/json", headers=headers)
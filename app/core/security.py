@@ -0,0 +1,26 @@
+"""Hashing password bcrypt dengan konteks passlib yang dibuat saat pertama dipakai.
+
+Import passlib (dan inisialisasi backend bcrypt) ditunda sampai ada operasi
+password pertama, sehingga start aplikasi tidak membayar biaya itu.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=1)
+def password_context() -> "CryptContext":
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return password_context().hash(password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return password_context().verify(password, password_hash)
@@ -0,0 +1,111 @@
+"""Fast path serialisasi response: objek ORM / baris Core langsung ke JSON bytes.
+
+Jalur standar (`Model.from_orm(obj)` lalu FastAPI memvalidasi ulang terhadap
+`response_model` dan menjalankan `jsonable_encoder`) melakukan validasi dua kali
+untuk data yang berasal dari database kita sendiri, termasuk validasi ulang
+`EmailStr`. Di sini setiap model pydantic dikompilasi sekali menjadi "plan":
+daftar `(nama field, getter atribut, encoder)` sesuai urutan field model.
+Plan membaca atribut langsung dari objek ORM maupun `Row` Core, lalu hasilnya
+di-dump ke bytes identik dengan output `JSONResponse` FastAPI.
+
+Karena tidak ada validasi, plan hanya boleh dipakai untuk data yang sudah
+tervalidasi (baris dari database), bukan input client.
+"""
+
+import json
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time
+from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_SINGLETON
+
+_PASSTHROUGH_TYPES = (str, int, float, bool)
+_LIST_SHAPES = {SHAPE_LIST, SHAPE_SEQUENCE}
+
+Encoder = Callable[[Any], Any]
+
+
+def _encode_temporal(value: Any) -> Any:
+    return value.isoformat() if value is not None else None
+
+
+def _encode_enum(value: Any) -> Any:
+    return value.value if value is not None else None
+
+
+class ModelPlan:
+    """Plan serialisasi terkompilasi untuk satu model pydantic."""
+
+    def __init__(self, model: type[BaseModel]) -> None:
+        self.model = model
+        self.fields: tuple[tuple[str, Callable[[Any], Any], Encoder | None], ...] = tuple(
+            (field.alias, attrgetter(name), _compile_encoder(field.type_, field.shape))
+            for name, field in model.__fields__.items()
+        )
+
+    def dump(self, obj: Any) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        for key, getter, encoder in self.fields:
+            value = getter(obj)
+            result[key] = encoder(value) if encoder is not None else value
+        return result
+
+    def dump_many(self, objs: Iterable[Any]) -> list[dict[str, Any]]:
+        dump = self.dump
+        return [dump(obj) for obj in objs]
+
+    def dumps(self, obj: Any) -> bytes:
+        return _to_json_bytes(self.dump(obj))
+
+    def dumps_many(self, objs: Iterable[Any]) -> bytes:
+        return _to_json_bytes(self.dump_many(objs))
+
+
+def _compile_encoder(type_: Any, shape: int) -> Encoder | None:
+    item_encoder = _compile_item_encoder(type_)
+    if shape == SHAPE_SINGLETON:
+        return item_encoder
+    if shape in _LIST_SHAPES:
+        if item_encoder is None:
+            return lambda values: list(values) if values is not None else None
+        return lambda values: (
+            [item_encoder(value) for value in values] if values is not None else None
+        )
+    # Bentuk lain (dict, tuple, dst) jarang dipakai: serahkan ke jsonable_encoder.
+    return jsonable_encoder
+
+
+def _compile_item_encoder(type_: Any) -> Encoder | None:
+    if isinstance(type_, type):
+        if issubclass(type_, BaseModel):
+            nested = plan_for(type_)
+            return lambda value: nested.dump(value) if value is not None else None
+        if issubclass(type_, Enum):
+            return _encode_enum
+        if issubclass(type_, (datetime, date, time)):
+            return _encode_temporal
+        if issubclass(type_, _PASSTHROUGH_TYPES):
+            return None
+    return jsonable_encoder
+
+
+def _to_json_bytes(content: Any) -> bytes:
+    # Opsi sama dengan `JSONResponse.render` agar output byte-identik.
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def plan_for(model: type[BaseModel]) -> ModelPlan:
+    """Ambil (atau kompilasi sekali) plan serialisasi untuk `model`."""
+    return ModelPlan(model)
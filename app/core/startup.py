@@ -0,0 +1,27 @@
+"""Pencatat durasi fase startup (migrasi, seed, import aplikasi, dst)."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+_timings: dict[str, float] = {}
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[name] = (time.perf_counter() - started) * 1000
+
+
+def startup_timings() -> dict[str, float]:
+    """Durasi tiap fase dalam milidetik, sesuai urutan eksekusi."""
+    return {name: round(elapsed, 1) for name, elapsed in _timings.items()}
+
+
+def format_startup_timings() -> str:
+    timings = startup_timings()
+    phases = " ".join(f"{name}={elapsed}ms" for name, elapsed in timings.items())
+    return f"{phases} total={round(sum(timings.values()), 1)}ms"
@@ -0,0 +1,162 @@
+"""Launcher produksi multi-worker tanpa process manager eksternal.
+
+Alur:
+1. Migrasi + seed dijalankan sekali di proses induk di bawah migration lock
+   (advisory lock PostgreSQL atau file lock), sebelum worker dibuat.
+2. Aplikasi di-import (preload) dan socket di-bind di proses induk, lalu worker
+   di-fork sehingga kode aplikasi dibagi copy-on-write antar worker.
+3. Proses induk mengawasi worker: worker yang mati tidak sengaja di-restart
+   (dengan jeda jika crash beruntun), SIGTERM/SIGINT diteruskan ke semua worker
+   untuk graceful shutdown.
+
+Konfigurasi dari environment (`ServerSettings`): `WEB_CONCURRENCY`, `HOST`,
+`PORT`, `UVICORN_BACKLOG`, `UVICORN_KEEP_ALIVE`, `UVICORN_LIMIT_CONCURRENCY`,
+`UVICORN_LOOP`, `UVICORN_HTTP`, `MIGRATION_LOCK_FILE`. Dengan satu worker (atau
+di platform tanpa `fork`), server berjalan langsung di proses ini.
+"""
+
+import logging
+import os
+import signal
+import socket
+import time
+from types import FrameType
+
+import uvicorn
+
+from app.bootstrap import init_db, migration_lock
+from app.core.config import ServerSettings
+from app.core.metrics import reset_multiprocess_dir
+from app.core.startup import format_startup_timings, startup_phase
+
+logger = logging.getLogger("uvicorn.error")
+
+# Worker yang mati kurang dari sekian detik setelah start dianggap crash loop.
+_CRASH_LOOP_SECONDS = 1.0
+_SHUTDOWN_TIMEOUT = 30.0
+
+
+def build_config(settings: ServerSettings) -> uvicorn.Config:
+    # Import di sini agar aplikasi baru dimuat setelah migrasi selesai.
+    with startup_phase("import_app"):
+        from app.main import app
+
+    return uvicorn.Config(
+        app,
+        host=settings.host,
+        port=settings.port,
+        backlog=settings.backlog,
+        timeout_keep_alive=settings.keep_alive,
+        limit_concurrency=settings.limit_concurrency,
+        loop=settings.loop,
+        http=settings.http,
+        reload=False,
+    )
+
+
+class Supervisor:
+    """Fork dan awasi `workers` proses uvicorn yang berbagi satu listening socket."""
+
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        self.children: dict[int, float] = {}
+        self.should_exit = False
+
+    def run(self) -> None:
+        self.config.load()
+        sock = self.config.bind_socket()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._handle_exit)
+        logger.info("Starting %d workers (parent pid %d)", self.workers, os.getpid())
+        for _ in range(self.workers):
+            self._spawn(sock)
+        try:
+            self._supervise(sock)
+        finally:
+            self._shutdown()
+            sock.close()
+
+    def _spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = time.monotonic()
+            return
+        # Proses worker: kembalikan handler sinyal default (uvicorn memasang miliknya),
+        # dan buang koneksi pool warisan induk agar tidak dipakai bersama.
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        from app.core.database import engine
+
+        engine.dispose(close=False)
+        exit_code = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[sock])
+        except BaseException:  # noqa: BLE001 - worker tidak boleh kembali ke loop induk
+            logger.exception("Worker %d crashed", os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _supervise(self, sock: socket.socket) -> None:
+        while not self.should_exit:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                return
+            except InterruptedError:
+                continue
+            started = self.children.pop(pid, None)
+            if started is None or self.should_exit:
+                continue
+            logger.warning(
+                "Worker %d exited (status %s), restarting", pid, os.waitstatus_to_exitcode(status)
+            )
+            if time.monotonic() - started < _CRASH_LOOP_SECONDS:
+                time.sleep(_CRASH_LOOP_SECONDS)
+            if not self.should_exit:
+                self._spawn(sock)
+
+    def _handle_exit(self, signum: int, frame: FrameType | None) -> None:
+        self.should_exit = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+    def _shutdown(self) -> None:
+        deadline = time.monotonic() + _SHUTDOWN_TIMEOUT
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+        while self.children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                break
+            if pid:
+                self.children.pop(pid, None)
+            else:
+                time.sleep(0.1)
+        for pid in self.children:
+            logger.warning("Worker %d did not stop in time, killing", pid)
+            os.kill(pid, signal.SIGKILL)
+
+
+def serve() -> None:
+    settings = ServerSettings()
+    with migration_lock(settings.migration_lock_file):
+        init_db()
+    reset_multiprocess_dir()
+
+    config = build_config(settings)
+    # Dicatat setelah config dibuat: Alembic dan uvicorn sama-sama mengonfigurasi ulang logging.
+    logger.info("Startup phases: %s", format_startup_timings())
+    if settings.workers <= 1 or not hasattr(os, "fork"):
+        uvicorn.Server(config).run()
+        return
+    Supervisor(config, settings.workers).run()
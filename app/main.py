@@ -3,22 +3,50 @@
 File ini bertanggung jawab untuk:
 - Membuat instance aplikasi FastAPI.
 - Mengatur CORS origins dari environment variable.
+- Mengaktifkan kompresi gzip untuk response di atas ambang ukuran minimum.
 - Memuat konfigurasi JWT untuk `fastapi-jwt-auth`.
 - Mendaftarkan router API.
-- Menyediakan endpoint dasar (`/`) dan health check (`/health`).
+- Menyediakan endpoint dasar (`/`), health check (`/health`), readiness probe
+  (`/ready`), statistik cache, dan metrics Prometheus (`/metrics`).
 """
 
 import os
 from typing import Any
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi_jwt_auth import AuthJWT
-from fastapi_jwt_auth.exceptions import AuthJWTException
 
-from app.api import auth_router, menu_router, user_router, roles_permission_router
-from app.core.config import JWTSettings
+from app.api import (
+    auth_router,
+    menu_router,
+    profiling_router,
+    roles_permission_router,
+    user_router,
+)
+from app.core.activity import activity_tracker
+from app.core.admission import AdmissionMiddleware, readiness
+from app.core.audit import audit_log
+from app.core.auth_middleware import JWTAuthMiddleware
+from app.core.authorization import freeze_permission_index, require_permission
+from app.core.compression import NegotiatedGZipMiddleware
+from app.core.config import (
+    AdmissionSettings,
+    DeadlineSettings,
+    JWTSettings,
+    MetricsSettings,
+    ProfilerSettings,
+)
+from app.core.deadline import DeadlineMiddleware
+from app.core.metrics import (
+    METRICS_PERMISSION,
+    MetricsMiddleware,
+    render_latest,
+    require_metrics_token,
+)
+from app.core.profiler import ProfilerMiddleware
+from app.core.response_cache import response_cache
 
 
 def _parse_cors_origins() -> list[str]:
@@ -36,6 +64,19 @@ def _parse_cors_origins() -> list[str]:
     return [origin.strip() for origin in raw.split(",") if origin.strip()]
 
 
+admission_settings = AdmissionSettings()
+deadline_settings = DeadlineSettings()
+metrics_settings = MetricsSettings()
+profiler_settings = ProfilerSettings()
+# Scraper tidak bisa me-refresh access token, jadi `METRICS_TOKEN` (jika diisi)
+# menggantikan permission user. Dependency dibuat sebelum `freeze_permission_index()`
+# agar kode permission-nya ikut terdaftar.
+if metrics_settings.token:
+    metrics_access = [Depends(require_metrics_token)]
+else:
+    metrics_access = [Depends(require_permission(METRICS_PERMISSION))]
+
+
 app = FastAPI(
     title="API Baldas Blog",
     version="0.1.0",
@@ -44,6 +85,11 @@ app = FastAPI(
     ),
 )
 
+# Deadline per route (lihat `app.core.deadline`) dipasang paling dalam agar
+# response 504 tetap melewati CORS dan gzip.
+if deadline_settings.enabled:
+    app.add_middleware(DeadlineMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_parse_cors_origins(),
@@ -52,49 +98,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response yang sudah membawa Content-Encoding (payload gzip dari response cache)
+# dilewatkan apa adanya oleh middleware gzip, sehingga tidak dikompresi ulang.
+app.add_middleware(NegotiatedGZipMiddleware)
 
+
+# Entri berakhiran `/*` dicocokkan sebagai prefix (misal `/docs/oauth2-redirect`).
 PUBLIC_PATHS = {
     "/auth/register",
     "/auth/login",
     "/auth/refresh",
     "/docs",
+    "/docs/*",
     "/redoc",
     "/openapi.json",
     "/health",
+    "/ready",
     "/",
 }
+if metrics_settings.token:
+    # Bearer `METRICS_TOKEN` bukan JWT; dicek sendiri oleh route `/metrics`.
+    PUBLIC_PATHS.add("/metrics")
 
+# Profiler on-demand (header `X-Profile`); dipasang di dalam middleware autentikasi
+# karena butuh claims token untuk mengecek permission `system.profile`.
+if profiler_settings.enabled:
+    app.add_middleware(ProfilerMiddleware)
 
-@app.middleware("http")
-async def require_authenticated_user(request: Request, call_next):
-    """Middleware autentikasi global berbasis JWT access token.
-
-    Perilaku:
-    - Semua endpoint private wajib membawa access token yang valid.
-    - Endpoint yang ada di `PUBLIC_PATHS` dibiarkan lewat tanpa token.
-    - Jika token tidak ada/tidak valid, request dihentikan dengan HTTP 401.
-    - Jika token valid, request diteruskan dan response asli endpoint dikembalikan.
+# Autentikasi global berbasis JWT access token (ASGI murni, lihat
+# `app.core.auth_middleware`). Endpoint di `PUBLIC_PATHS` dan preflight OPTIONS
+# dilewatkan tanpa token; sisanya dibalas 401 sebelum endpoint dieksekusi.
+# Ditambahkan terakhir agar menjadi middleware terluar, sama seperti sebelumnya.
+app.add_middleware(JWTAuthMiddleware, public_paths=PUBLIC_PATHS)
 
-    Catatan:
-    - Karena validasi dilakukan *sebelum* endpoint dieksekusi, route private tidak
-      akan memproses logic bisnis ketika user belum login.
-    """
-    path = request.url.path
-    if request.method == "OPTIONS" or path in PUBLIC_PATHS:
-        return await call_next(request)
+# Load shedding dijalankan sebelum decode token agar request yang pasti ditolak
+# tidak memakan CPU; tetap di dalam metrics supaya 503 ikut tercatat.
+if admission_settings.enabled:
+    app.add_middleware(AdmissionMiddleware)
 
-    try:
-        AuthJWT(req=request).jwt_required()
-    except AuthJWTException:
-        return JSONResponse(status_code=401, content={"detail": "Unauthorized"})
-
-    return await call_next(request)
+# Metrics dipasang paling luar agar request yang ditolak 401 ikut tercatat.
+if metrics_settings.enabled:
+    app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(auth_router)
 app.include_router(menu_router)
 app.include_router(user_router)
 app.include_router(roles_permission_router)
+app.include_router(profiling_router)
+
+# Semua router sudah terdaftar: bekukan kode permission yang dipakai route.
+freeze_permission_index()
+
+
+@app.on_event("shutdown")
+def flush_background_writers() -> None:
+    """Tulis event audit dan update aktivitas user yang tertunda sebelum proses berhenti."""
+    audit_log.shutdown()
+    activity_tracker.shutdown()
 
 
 @AuthJWT.load_config
@@ -118,3 +179,34 @@ def read_root() -> dict[str, str]:
 def health_check() -> dict[str, str]:
     """Health check sederhana untuk monitoring/liveness probe."""
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def readiness_check() -> JSONResponse:
+    """Readiness probe: 503 jika kapasitas penuh atau database tidak bisa di-ping."""
+    ready, checks = await readiness()
+    return JSONResponse(
+        {"status": "ready" if ready else "unready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/cache/stats")
+def cache_stats() -> dict[str, Any]:
+    """Statistik response cache in-process (hit rate, ukuran bytes, eviction)."""
+    return response_cache.stats()
+
+
+@app.get(
+    "/metrics",
+    include_in_schema=False,
+    response_class=PlainTextResponse,
+    dependencies=metrics_access,
+)
+def metrics() -> PlainTextResponse:
+    """Metrics format teks Prometheus; butuh `METRICS_TOKEN` atau permission `system.metrics`."""
+    if not metrics_settings.enabled:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(
+        render_latest(), media_type="text/plain; version=0.0.4"
+    )
@@ -5,7 +5,29 @@ yang dipakai di aplikasi, misalnya:
 `from app.models import User, Role, Menu`.
 """
 
-from app.models.rbac import Menu, Permission, Role, RolePermission, User, UserRole
+from app.models.rbac import (
+    AuditLog,
+    CacheEpoch,
+    Menu,
+    Permission,
+    Role,
+    RolePermission,
+    SeedState,
+    User,
+    UserImport,
+    UserRole,
+)
 
 # Batasi simbol yang diexport saat memakai `from app.models import *`.
-__all__ = ["User", "Role", "Permission", "RolePermission", "UserRole", "Menu"]
+__all__ = [
+    "User",
+    "Role",
+    "Permission",
+    "RolePermission",
+    "UserRole",
+    "Menu",
+    "SeedState",
+    "AuditLog",
+    "CacheEpoch",
+    "UserImport",
+]
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 
 class MenuBase(BaseModel):
@@ -64,6 +64,47 @@ class MenuUpdate(BaseModel):
     depth: int | None = Field(default=None, ge=0)
     sort_order: int | None = Field(default=None, ge=0)
 
+    @validator(
+        "menu_key",
+        "section_title",
+        "label",
+        "is_active",
+        "is_hidden",
+        "show_more_toggle",
+        "initially_open",
+        "depth",
+        "sort_order",
+        pre=True,
+    )
+    def reject_null(cls, value: object) -> object:
+        # Field boleh tidak dikirim, tapi kolomnya NOT NULL: `null` eksplisit ditolak (422).
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
+
+class MenuBulkItem(MenuUpdate):
+    """Satu perubahan parsial di dalam payload bulk update menu."""
+
+    # ID menu yang akan diubah.
+    id: int
+
+
+class MenuBulkUpdate(BaseModel):
+    """Payload request untuk update banyak menu sekaligus (misal drag-and-drop)."""
+
+    # Daftar perubahan; tiap item hanya membawa field yang ingin diubah.
+    items: list[MenuBulkItem] = Field(min_items=1, max_items=1000)
+
+
+class MenuBulkResponse(BaseModel):
+    """Response hasil bulk update menu."""
+
+    # Jumlah menu yang diperbarui.
+    updated: int
+    # Versi tree menu terbaru setelah perubahan diterapkan.
+    version: str
+
 
 class MenuResponse(MenuBase):
     """Representasi response menu dari database."""
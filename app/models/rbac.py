@@ -1,9 +1,10 @@
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 
 class User(Base):
@@ -11,14 +12,25 @@ class User(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     full_name: Mapped[str] = mapped_column(String(120), nullable=False)
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Diisi tracker aktivitas secara batch (lihat `app.core.activity`), bukan per request.
+    last_login_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        nullable=False,
+        index=True,
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+        nullable=False,
     )
 
     roles: Mapped[list["Role"]] = relationship(
@@ -30,13 +42,17 @@ class Role(Base):
     __tablename__ = "roles"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(String(80), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(80), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+        nullable=False,
     )
 
     users: Mapped[list[User]] = relationship(
@@ -51,10 +67,17 @@ class Permission(Base):
     __tablename__ = "permissions"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    code: Mapped[str] = mapped_column(String(120), unique=True, nullable=False, index=True)
+    code: Mapped[str] = mapped_column(String(120), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+        nullable=False,
     )
 
     roles: Mapped[list[Role]] = relationship(
@@ -69,7 +92,7 @@ class RolePermission(Base):
         ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True
     )
     permission_id: Mapped[int] = mapped_column(
-        ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True
+        ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
 
@@ -80,16 +103,20 @@ class UserRole(Base):
         ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
     role_id: Mapped[int] = mapped_column(
-        ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True
+        ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
 
 class Menu(Base):
     __tablename__ = "menus"
+    # Mengikuti urutan MenuRepository.list (section -> parent -> sort -> id).
+    __table_args__ = (
+        Index("ix_menus_section_parent_sort", "section_title", "parent_id", "sort_order", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    menu_key: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
-    section_title: Mapped[str] = mapped_column(String(80), nullable=False, index=True)
+    menu_key: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    section_title: Mapped[str] = mapped_column(String(80), nullable=False)
     parent_id: Mapped[int | None] = mapped_column(
         ForeignKey("menus.id", ondelete="CASCADE"), nullable=True, index=True
     )
@@ -106,8 +133,70 @@ class Menu(Base):
     depth: Mapped[int] = mapped_column(default=0, nullable=False)
     sort_order: Mapped[int] = mapped_column(default=0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+        nullable=False,
+    )
+
+
+class SeedState(Base):
+    __tablename__ = "seed_state"
+
+    name: Mapped[str] = mapped_column(String(80), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+        nullable=False,
     )
+
+
+class CacheEpoch(Base):
+    __tablename__ = "cache_epochs"
+
+    family: Mapped[str] = mapped_column(String(40), primary_key=True)
+    epoch: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False
+    )
+
+
+class AuditLog(Base):
+    __tablename__ = "audit_log"
+    __table_args__ = (Index("ix_audit_log_entity", "entity_type", "entity_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False, index=True
+    )
+    # Tanpa foreign key: jejak audit harus tetap ada setelah user dihapus.
+    actor_id: Mapped[int | None] = mapped_column(nullable=True, index=True)
+    action: Mapped[str] = mapped_column(String(80), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(40), nullable=False)
+    entity_id: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    details: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+
+
+class UserImport(Base):
+    __tablename__ = "user_imports"
+
+    # Id dari header `X-Import-Id` atau uuid; primary key menjamin unik lintas worker.
+    import_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    processed: Mapped[int] = mapped_column(default=0, nullable=False)
+    created: Mapped[int] = mapped_column(default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(default=0, nullable=False)
+    chunks: Mapped[int] = mapped_column(default=0, nullable=False)
+    errors: Mapped[list[dict[str, Any]]] = mapped_column(JSON, default=list, nullable=False)
+    errors_truncated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
     )
@@ -94,3 +94,42 @@ class RolePermissionResponse(BaseModel):
 
     role_id: int
     permissions: list[PermissionSummary]
+
+
+class UserRolePair(BaseModel):
+    """Satu pasangan assignment user -> role."""
+
+    user_id: int
+    role_id: int
+
+
+class RolePermissionPair(BaseModel):
+    """Satu pasangan assignment role -> permission."""
+
+    role_id: int
+    permission_id: int
+
+
+class UserRoleBulkAssign(BaseModel):
+    """Payload assign banyak role ke banyak user sekaligus."""
+
+    pairs: list[UserRolePair] = Field(min_items=1, max_items=5000)
+
+
+class RolePermissionBulkAssign(BaseModel):
+    """Payload assign banyak permission ke banyak role sekaligus."""
+
+    pairs: list[RolePermissionPair] = Field(min_items=1, max_items=5000)
+
+
+class RolePermissionReplace(BaseModel):
+    """Payload untuk mengganti seluruh set permission milik satu role."""
+
+    permission_ids: list[int] = Field(default=[], max_items=5000)
+
+
+class BulkAssignResponse(BaseModel):
+    """Ringkasan hasil bulk assign (pasangan yang sudah ada diabaikan)."""
+
+    requested: int
+    inserted: int
@@ -35,3 +35,29 @@ class UserResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class UserImportRowError(BaseModel):
+    """Detail kegagalan satu baris data import."""
+
+    row: int
+    email: str | None = None
+    error: str
+
+
+class UserImportReport(BaseModel):
+    """Progress dan hasil akhir proses import user massal."""
+
+    import_id: str
+    status: str = "running"
+    processed: int = 0
+    created: int = 0
+    failed: int = 0
+    chunks: int = 0
+    errors: list[UserImportRowError] = []
+    errors_truncated: bool = False
+    started_at: datetime
+    finished_at: datetime | None = None
+
+    class Config:
+        orm_mode = True
@@ -2,6 +2,7 @@
 
 from app.repository.menu_repository import MenuRepository
 from app.repository.rbac_repository import RBACRepository
+from app.repository.user_import_repository import UserImportRepository
 from app.repository.user_repository import UserRepository
 
-__all__ = ["MenuRepository", "UserRepository", "RBACRepository"]
+__all__ = ["MenuRepository", "UserRepository", "RBACRepository", "UserImportRepository"]
@@ -1,8 +1,15 @@
 """Lapisan akses data (repository) untuk entitas menu."""
 
-from sqlalchemy import select
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
+from app.core.cache_epochs import bump_epochs
+from app.core.database import utcnow
+from app.core.response_cache import response_cache
 from app.models import Menu as MenuEntity
 from app.models.menu import MenuCreate, MenuUpdate
 
@@ -34,19 +41,41 @@ class MenuRepository:
         # Ambil satu menu berdasarkan primary key id.
         return self.db.get(MenuEntity, menu_id)
 
+    def get_updated_at(self, menu_id: int) -> datetime | None:
+        # Ambil hanya kolom updated_at satu menu untuk validator ETag.
+        return self.db.scalar(
+            select(MenuEntity.updated_at).where(MenuEntity.id == menu_id)
+        )
+
     def get_by_key(self, menu_key: str) -> MenuEntity | None:
         # Cari menu berdasarkan nilai unik menu_key.
         return self.db.scalar(
             select(MenuEntity).where(MenuEntity.menu_key == menu_key)
         )
 
+    def get_tree_snapshot(self) -> dict[int, tuple[str, int | None]]:
+        # Ambil snapshot ringan seluruh tree: id -> (menu_key, parent_id).
+        rows = self.db.execute(
+            select(MenuEntity.id, MenuEntity.menu_key, MenuEntity.parent_id)
+        )
+        return {row.id: (row.menu_key, row.parent_id) for row in rows}
+
+    def get_version_signal(self) -> tuple[int, datetime | None]:
+        # Sinyal versi murah: jumlah baris + updated_at terbaru.
+        row = self.db.execute(
+            select(func.count(MenuEntity.id), func.max(MenuEntity.updated_at))
+        ).one()
+        return int(row[0] or 0), row[1]
+
     def create(self, payload: MenuCreate) -> MenuEntity:
         # Buat objek model Menu dari payload request.
         menu = MenuEntity(**payload.dict())
         # Tambahkan objek ke session agar ditandai untuk insert.
         self.db.add(menu)
+        bump_epochs(self.db, "menu")
         # Commit transaksi agar data benar-benar tersimpan.
         self.db.commit()
+        response_cache.invalidate("menu")
         # Refresh objek untuk mengambil nilai terbaru dari DB (id/timestamp).
         self.db.refresh(menu)
         # Kembalikan objek menu yang sudah tersimpan.
@@ -58,15 +87,30 @@ class MenuRepository:
         # Terapkan setiap perubahan ke instance menu existing.
         for field_name, value in changes.items():
             setattr(menu, field_name, value)
+        bump_epochs(self.db, "menu")
         # Commit transaksi update.
         self.db.commit()
+        response_cache.invalidate("menu")
         # Refresh agar nilai terbaru sinkron dari DB.
         self.db.refresh(menu)
         # Kembalikan menu yang sudah diperbarui.
         return menu
 
+    def bulk_update(self, changes: Sequence[dict[str, Any]]) -> None:
+        # Set updated_at eksplisit (resolusi mikrodetik) agar versi tree berubah.
+        now = utcnow()
+        rows = [{**change, "updated_at": now} for change in changes]
+        # ORM bulk UPDATE by primary key: baris dikelompokkan per set kolom
+        # lalu dieksekusi sebagai executemany dalam satu transaksi.
+        self.db.execute(update(MenuEntity), rows)
+        bump_epochs(self.db, "menu")
+        self.db.commit()
+        response_cache.invalidate("menu")
+
     def delete(self, menu: MenuEntity) -> None:
         # Tandai objek menu untuk dihapus.
         self.db.delete(menu)
+        bump_epochs(self.db, "menu")
         # Commit transaksi delete.
         self.db.commit()
+        response_cache.invalidate("menu")
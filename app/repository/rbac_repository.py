@@ -1,11 +1,23 @@
 """Lapisan akses data (repository) untuk entitas RBAC."""
 
-from sqlalchemy import select
+from collections.abc import Collection, Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Table, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.cache_epochs import bump_epochs
+from app.core.database import utcnow
+from app.core.permission_registry import invalidate_registry
+from app.core.response_cache import response_cache
 from app.models import Permission as PermissionEntity
 from app.models import Role as RoleEntity
+from app.models import RolePermission as RolePermissionEntity
 from app.models import User as UserEntity
+from app.models import UserRole as UserRoleEntity
 from app.models.roles_permission import (
     PermissionCreate,
     PermissionUpdate,
@@ -14,12 +26,71 @@ from app.models.roles_permission import (
 )
 
 
+def insert_ignore(db: Session, table: Table, rows: list[dict[str, Any]]) -> int:
+    """INSERT multi-row yang mengabaikan baris duplikat primary key.
+
+    Mengembalikan jumlah baris yang benar-benar ditambahkan. Dialect tanpa sintaks
+    insert-or-ignore memakai fallback per baris di dalam SAVEPOINT.
+    """
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(table).values(rows).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        statement = insert(table).values(rows).prefix_with("OR IGNORE")
+    elif dialect in {"mysql", "mariadb"}:
+        statement = insert(table).values(rows).prefix_with("IGNORE")
+    else:
+        return _insert_each_ignoring_duplicates(db, table, rows)
+    return db.execute(statement).rowcount
+
+
+def _insert_each_ignoring_duplicates(
+    db: Session, table: Table, rows: list[dict[str, Any]]
+) -> int:
+    # Fallback portabel: baris duplikat hanya membatalkan SAVEPOINT-nya sendiri,
+    # transaksi luar tetap berjalan.
+    inserted = 0
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(table).values(row))
+        except IntegrityError:
+            continue
+        inserted += 1
+    return inserted
+
+
 class RBACRepository:
     """Repository untuk operasi database Role, Permission, dan relasinya."""
 
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    def get_version_signal(self) -> tuple[int, datetime | None, int, datetime | None]:
+        # Sinyal versi RBAC dalam satu query: (jumlah, updated_at terbaru) role
+        # dan permission. Perubahan relasi ikut menyentuh updated_at role/user.
+        query = select(
+            select(func.count(RoleEntity.id)).scalar_subquery().label("role_count"),
+            select(func.max(RoleEntity.updated_at))
+            .scalar_subquery()
+            .label("role_updated_at"),
+            select(func.count(PermissionEntity.id))
+            .scalar_subquery()
+            .label("permission_count"),
+            select(func.max(PermissionEntity.updated_at))
+            .scalar_subquery()
+            .label("permission_updated_at"),
+        )
+        row = self.db.execute(query).one()
+        return (
+            int(row.role_count or 0),
+            row.role_updated_at,
+            int(row.permission_count or 0),
+            row.permission_updated_at,
+        )
+
     def list_roles(self, skip: int, limit: int) -> list[RoleEntity]:
         query = (
             select(RoleEntity)
@@ -44,7 +115,9 @@ class RBACRepository:
     def create_role(self, payload: RoleCreate) -> RoleEntity:
         role = RoleEntity(**payload.dict())
         self.db.add(role)
+        bump_epochs(self.db, "rbac")
         self.db.commit()
+        response_cache.invalidate("rbac")
         self.db.refresh(role)
         return self.get_role_by_id(role.id)  # type: ignore[return-value]
 
@@ -52,12 +125,16 @@ class RBACRepository:
         changes = payload.dict(exclude_unset=True)
         for field_name, value in changes.items():
             setattr(role, field_name, value)
+        bump_epochs(self.db, "rbac")
         self.db.commit()
+        response_cache.invalidate("rbac")
         return self.get_role_by_id(role.id)  # type: ignore[return-value]
 
     def delete_role(self, role: RoleEntity) -> None:
         self.db.delete(role)
+        bump_epochs(self.db, "rbac")
         self.db.commit()
+        response_cache.invalidate("rbac")
 
     def list_permissions(self, skip: int, limit: int) -> list[PermissionEntity]:
         query = (
@@ -85,7 +162,10 @@ class RBACRepository:
     def create_permission(self, payload: PermissionCreate) -> PermissionEntity:
         permission = PermissionEntity(**payload.dict())
         self.db.add(permission)
+        bump_epochs(self.db, "rbac", "permission")
         self.db.commit()
+        response_cache.invalidate("rbac")
+        invalidate_registry()
         self.db.refresh(permission)
         return self.get_permission_by_id(permission.id)  # type: ignore[return-value]
 
@@ -95,12 +175,18 @@ class RBACRepository:
         changes = payload.dict(exclude_unset=True)
         for field_name, value in changes.items():
             setattr(permission, field_name, value)
+        bump_epochs(self.db, "rbac", "permission")
         self.db.commit()
+        response_cache.invalidate("rbac")
+        invalidate_registry()
         return self.get_permission_by_id(permission.id)  # type: ignore[return-value]
 
     def delete_permission(self, permission: PermissionEntity) -> None:
         self.db.delete(permission)
+        bump_epochs(self.db, "rbac", "permission")
         self.db.commit()
+        response_cache.invalidate("rbac")
+        invalidate_registry()
 
     def get_user_with_roles(self, user_id: int) -> UserEntity | None:
         query = (
@@ -110,30 +196,180 @@ class RBACRepository:
         )
         return self.db.scalar(query)
 
-    def assign_role_to_user(self, user: UserEntity, role: RoleEntity) -> UserEntity:
-        if role not in user.roles:
-            user.roles.append(role)
-            self.db.commit()
-        return self.get_user_with_roles(user.id)  # type: ignore[return-value]
+    def entities_exist(
+        self, first: tuple[type[Any], int], second: tuple[type[Any], int]
+    ) -> tuple[bool, bool]:
+        # Cek keberadaan dua entitas (misal user & role) dalam satu query.
+        (first_entity, first_id), (second_entity, second_id) = first, second
+        row = self.db.execute(
+            select(
+                select(first_entity.id).where(first_entity.id == first_id).exists(),
+                select(second_entity.id).where(second_entity.id == second_id).exists(),
+            )
+        ).one()
+        return bool(row[0]), bool(row[1])
 
-    def remove_role_from_user(self, user: UserEntity, role: RoleEntity) -> UserEntity:
-        if role in user.roles:
-            user.roles.remove(role)
+    def list_user_role_summaries(self, user_id: int) -> list[Any]:
+        # Query ramping: hanya kolom ringkas role milik user, tanpa graph ORM.
+        query = (
+            select(RoleEntity.id, RoleEntity.name, RoleEntity.description)
+            .join(UserRoleEntity, UserRoleEntity.role_id == RoleEntity.id)
+            .where(UserRoleEntity.user_id == user_id)
+            .order_by(RoleEntity.id)
+        )
+        return list(self.db.execute(query).all())
+
+    def list_role_permission_summaries(self, role_id: int) -> list[Any]:
+        query = (
+            select(PermissionEntity.id, PermissionEntity.code, PermissionEntity.description)
+            .join(
+                RolePermissionEntity,
+                RolePermissionEntity.permission_id == PermissionEntity.id,
+            )
+            .where(RolePermissionEntity.role_id == role_id)
+            .order_by(PermissionEntity.id)
+        )
+        return list(self.db.execute(query).all())
+
+    def assign_role_to_user(self, user_id: int, role_id: int) -> None:
+        # Tulis langsung ke user_roles; duplikat diabaikan oleh primary key komposit.
+        inserted = insert_ignore(
+            self.db,
+            UserRoleEntity.__table__,  # type: ignore[arg-type]
+            [{"user_id": user_id, "role_id": role_id}],
+        )
+        if inserted:
+            self._touch(UserEntity, user_id)
+            bump_epochs(self.db, "user")
             self.db.commit()
-        return self.get_user_with_roles(user.id)  # type: ignore[return-value]
+            response_cache.invalidate("user")
 
-    def assign_permission_to_role(
-        self, role: RoleEntity, permission: PermissionEntity
-    ) -> RoleEntity:
-        if permission not in role.permissions:
-            role.permissions.append(permission)
+    def remove_role_from_user(self, user_id: int, role_id: int) -> bool:
+        deleted = self.db.execute(
+            delete(UserRoleEntity).where(
+                UserRoleEntity.user_id == user_id, UserRoleEntity.role_id == role_id
+            )
+        ).rowcount
+        if not deleted:
+            self.db.rollback()
+            return False
+        self._touch(UserEntity, user_id)
+        bump_epochs(self.db, "user")
+        self.db.commit()
+        response_cache.invalidate("user")
+        return True
+
+    def assign_permission_to_role(self, role_id: int, permission_id: int) -> None:
+        inserted = insert_ignore(
+            self.db,
+            RolePermissionEntity.__table__,  # type: ignore[arg-type]
+            [{"role_id": role_id, "permission_id": permission_id}],
+        )
+        if inserted:
+            self._touch(RoleEntity, role_id)
+            bump_epochs(self.db, "rbac")
             self.db.commit()
-        return self.get_role_by_id(role.id)  # type: ignore[return-value]
+            response_cache.invalidate("rbac")
+
+    def remove_permission_from_role(self, role_id: int, permission_id: int) -> bool:
+        deleted = self.db.execute(
+            delete(RolePermissionEntity).where(
+                RolePermissionEntity.role_id == role_id,
+                RolePermissionEntity.permission_id == permission_id,
+            )
+        ).rowcount
+        if not deleted:
+            self.db.rollback()
+            return False
+        self._touch(RoleEntity, role_id)
+        bump_epochs(self.db, "rbac")
+        self.db.commit()
+        response_cache.invalidate("rbac")
+        return True
+
+    def _touch(self, entity: type[Any], entity_id: int) -> None:
+        # Perubahan relasi ikut menggeser updated_at pemiliknya (sinyal ETag).
+        self.db.execute(
+            update(entity).where(entity.id == entity_id).values(updated_at=utcnow())
+        )
+
+    def existing_user_ids(self, user_ids: Iterable[int]) -> set[int]:
+        query = select(UserEntity.id).where(UserEntity.id.in_(list(user_ids)))
+        return set(self.db.scalars(query).all())
+
+    def existing_role_ids(self, role_ids: Iterable[int]) -> set[int]:
+        query = select(RoleEntity.id).where(RoleEntity.id.in_(list(role_ids)))
+        return set(self.db.scalars(query).all())
+
+    def existing_permission_ids(self, permission_ids: Iterable[int]) -> set[int]:
+        query = select(PermissionEntity.id).where(
+            PermissionEntity.id.in_(list(permission_ids))
+        )
+        return set(self.db.scalars(query).all())
+
+    def bulk_assign_roles_to_users(self, pairs: Collection[tuple[int, int]]) -> int:
+        # Satu INSERT OR IGNORE untuk seluruh pasangan (user_id, role_id).
+        inserted = insert_ignore(
+            self.db,
+            UserRoleEntity.__table__,  # type: ignore[arg-type]
+            [{"user_id": user_id, "role_id": role_id} for user_id, role_id in pairs],
+        )
+        # Sentuh updated_at user terkait agar ETag /auth/me ikut berubah.
+        self.db.execute(
+            update(UserEntity)
+            .where(UserEntity.id.in_({user_id for user_id, _ in pairs}))
+            .values(updated_at=utcnow())
+        )
+        bump_epochs(self.db, "user")
+        self.db.commit()
+        response_cache.invalidate("user")
+        return inserted
+
+    def bulk_assign_permissions_to_roles(
+        self, pairs: Collection[tuple[int, int]]
+    ) -> int:
+        # Satu INSERT OR IGNORE untuk seluruh pasangan (role_id, permission_id).
+        inserted = insert_ignore(
+            self.db,
+            RolePermissionEntity.__table__,  # type: ignore[arg-type]
+            [
+                {"role_id": role_id, "permission_id": permission_id}
+                for role_id, permission_id in pairs
+            ],
+        )
+        self.db.execute(
+            update(RoleEntity)
+            .where(RoleEntity.id.in_({role_id for role_id, _ in pairs}))
+            .values(updated_at=utcnow())
+        )
+        bump_epochs(self.db, "rbac")
+        self.db.commit()
+        response_cache.invalidate("rbac")
+        return inserted
 
-    def remove_permission_from_role(
-        self, role: RoleEntity, permission: PermissionEntity
+    def replace_role_permissions(
+        self, role_id: int, permission_ids: Collection[int]
     ) -> RoleEntity:
-        if permission in role.permissions:
-            role.permissions.remove(permission)
-            self.db.commit()
-        return self.get_role_by_id(role.id)  # type: ignore[return-value]
+        # Selisih set dihitung di SQL: hapus yang tidak ada di set baru...
+        self.db.execute(
+            delete(RolePermissionEntity).where(
+                RolePermissionEntity.role_id == role_id,
+                RolePermissionEntity.permission_id.not_in(list(permission_ids)),
+            )
+        )
+        # ...lalu tambahkan yang belum ada dengan satu INSERT OR IGNORE.
+        insert_ignore(
+            self.db,
+            RolePermissionEntity.__table__,  # type: ignore[arg-type]
+            [
+                {"role_id": role_id, "permission_id": permission_id}
+                for permission_id in permission_ids
+            ],
+        )
+        self._touch(RoleEntity, role_id)
+        bump_epochs(self.db, "rbac")
+        self.db.commit()
+        response_cache.invalidate("rbac")
+        # Relasi di identity map sudah basi setelah write Core.
+        self.db.expire_all()
+        return self.get_role_by_id(role_id)  # type: ignore[return-value]
@@ -0,0 +1,39 @@
+"""Lapisan akses data (repository) untuk laporan import user massal."""
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import UserImport as UserImportEntity
+from app.models.user import UserImportReport
+
+
+class UserImportRepository:
+    """Repository untuk tabel user_imports (progress import, terbaca dari worker mana pun)."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get(self, import_id: str) -> UserImportEntity | None:
+        return self.db.get(UserImportEntity, import_id)
+
+    def create(self, report: UserImportReport) -> bool:
+        """Simpan laporan baru; False jika `import_id` sudah dipakai."""
+        try:
+            self.db.execute(insert(UserImportEntity).values(**report.dict()))
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            return False
+        return True
+
+    def save(self, report: UserImportReport) -> None:
+        # Transaksi sendiri: sisa transaksi chunk yang gagal dibuang lebih dulu
+        # (chunk yang berhasil sudah di-commit oleh `UserRepository.bulk_create`).
+        self.db.rollback()
+        self.db.execute(
+            update(UserImportEntity)
+            .where(UserImportEntity.import_id == report.import_id)
+            .values(**report.dict(exclude={"import_id"}))
+        )
+        self.db.commit()
@@ -1,8 +1,14 @@
 """Lapisan akses data (repository) untuk entitas user."""
 
-from sqlalchemy import select
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.cache_epochs import bump_epochs
+from app.core.response_cache import response_cache
 from app.models import User as UserEntity
 from app.models.user import UserCreate
 
@@ -23,6 +29,29 @@ class UserRepository:
     def get_by_email(self, email: str) -> UserEntity | None:
         return self.db.scalar(select(UserEntity).where(UserEntity.email == email))
 
+    def existing_emails(self, emails: Iterable[str]) -> set[str]:
+        # Cek banyak email sekaligus dengan satu query IN (...).
+        email_list = list(emails)
+        if not email_list:
+            return set()
+        query = select(UserEntity.email).where(UserEntity.email.in_(email_list))
+        return set(self.db.scalars(query).all())
+
+    def bulk_create(self, rows: Sequence[dict[str, Any]]) -> int:
+        # Satu INSERT multi-row untuk seluruh chunk, lalu satu commit.
+        if not rows:
+            return 0
+        try:
+            self.db.execute(insert(UserEntity), rows)
+            bump_epochs(self.db, "user")
+            self.db.commit()
+        except IntegrityError:
+            # Batalkan di sini agar session tetap bisa dipakai pemanggil (misal retry).
+            self.db.rollback()
+            raise
+        response_cache.invalidate("user")
+        return len(rows)
+
     def create(self, payload: UserCreate, password_hash: str) -> UserEntity:
         user = UserEntity(
             full_name=payload.full_name,
@@ -31,17 +60,23 @@ class UserRepository:
             is_active=payload.is_active,
         )
         self.db.add(user)
+        bump_epochs(self.db, "user")
         self.db.commit()
+        response_cache.invalidate("user")
         self.db.refresh(user)
         return user
 
     def update(self, user: UserEntity, changes: dict[str, object]) -> UserEntity:
         for field_name, value in changes.items():
             setattr(user, field_name, value)
+        bump_epochs(self.db, "user")
         self.db.commit()
+        response_cache.invalidate("user")
         self.db.refresh(user)
         return user
 
     def delete(self, user: UserEntity) -> None:
         self.db.delete(user)
+        bump_epochs(self.db, "user")
         self.db.commit()
+        response_cache.invalidate("user")
@@ -1,13 +1,74 @@
+"""Seed data sample (permission, role, user, dan menu) berbasis fingerprint.
+
+Seluruh spesifikasi seed (`PERMISSIONS`, `ROLES`, `USERS`, `MENU_SECTIONS`) di-hash
+menjadi fingerprint dan disimpan di tabel `seed_state`. Jika fingerprint tidak
+berubah, `run_seed` selesai dengan satu query. Jika berubah, hanya selisihnya
+yang ditulis: baris yang belum ada di-insert secara batch, menu yang berbeda
+di-update dengan bulk UPDATE per primary key, dan relasi role/permission serta
+user/role disamakan dengan spesifikasi. Password user yang sudah ada tidak
+di-hash ulang.
+"""
+
+import hashlib
+import json
 import re
+from collections.abc import Callable
 from typing import Any
 
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from app.models import Menu, Permission, Role, User
+from app.core.cache_epochs import FAMILIES, bump_epochs
+from app.core.database import utcnow
+from app.core.security import hash_password
+from app.models import Menu, Permission, Role, RolePermission, SeedState, User, UserRole
+from app.repository.rbac_repository import insert_ignore
+
+SEED_NAME = "sample"
+
+PERMISSIONS: dict[str, str] = {
+    "posts.read": "Read posts",
+    "posts.create": "Create posts",
+    "posts.update": "Update posts",
+    "posts.delete": "Delete posts",
+    "users.manage": "Manage users",
+    "menus.manage": "Manage menus",
+    "system.profile": "Profile requests",
+    "system.metrics": "Read Prometheus metrics",
+}
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+ROLES: dict[str, dict[str, Any]] = {
+    "admin": {"description": "Full system access", "permissions": list(PERMISSIONS)},
+    "editor": {
+        "description": "Edit and publish content",
+        "permissions": ["posts.read", "posts.create", "posts.update"],
+    },
+    "writer": {
+        "description": "Write and manage own content",
+        "permissions": ["posts.read", "posts.create"],
+    },
+}
+
+USERS: list[dict[str, Any]] = [
+    {
+        "full_name": "Admin Baldas",
+        "email": "admin@baldas.dev",
+        "password": "admin123",
+        "roles": ["admin"],
+    },
+    {
+        "full_name": "Editor Baldas",
+        "email": "editor@baldas.dev",
+        "password": "editor123",
+        "roles": ["editor"],
+    },
+    {
+        "full_name": "Writer Baldas",
+        "email": "writer@baldas.dev",
+        "password": "writer123",
+        "roles": ["writer"],
+    },
+]
 
 MENU_SECTIONS: list[dict[str, Any]] = [
     {
@@ -82,201 +143,226 @@ MENU_SECTIONS: list[dict[str, Any]] = [
 ]
 
 
-def _get_or_create_role(db: Session, name: str, description: str) -> Role:
-    role = db.scalar(select(Role).where(Role.name == name))
-    if role:
-        return role
-    role = Role(name=name, description=description)
-    db.add(role)
-    db.flush()
-    return role
-
-
-def _get_or_create_permission(db: Session, code: str, description: str) -> Permission:
-    permission = db.scalar(select(Permission).where(Permission.code == code))
-    if permission:
-        return permission
-    permission = Permission(code=code, description=description)
-    db.add(permission)
-    db.flush()
-    return permission
-
-
-def _get_or_create_user(db: Session, full_name: str, email: str, password: str) -> User:
-    user = db.scalar(select(User).where(User.email == email))
-    if user:
-        return user
-    user = User(
-        full_name=full_name,
-        email=email,
-        password_hash=pwd_context.hash(password),
-        is_active=True,
-    )
-    db.add(user)
-    db.flush()
-    return user
-
-
 def _slugify(value: str) -> str:
     return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
 
 
-def _upsert_menu(
-    db: Session,
-    *,
-    menu_key: str,
-    section_title: str,
-    parent_id: int | None,
-    label: str,
-    href: str | None,
-    icon: str | None,
-    list_id: str | None,
-    badge_text: str | None,
-    badge_class_name: str | None,
-    is_active: bool,
-    is_hidden: bool,
-    show_more_toggle: bool,
-    initially_open: bool,
-    depth: int,
-    sort_order: int,
-) -> Menu:
-    menu = db.scalar(select(Menu).where(Menu.menu_key == menu_key))
-    if not menu:
-        menu = Menu(
-            menu_key=menu_key,
-            section_title=section_title,
-            parent_id=parent_id,
-            label=label,
-            href=href,
-            icon=icon,
-            list_id=list_id,
-            badge_text=badge_text,
-            badge_class_name=badge_class_name,
-            is_active=is_active,
-            is_hidden=is_hidden,
-            show_more_toggle=show_more_toggle,
-            initially_open=initially_open,
-            depth=depth,
-            sort_order=sort_order,
-        )
-        db.add(menu)
-    else:
-        menu.section_title = section_title
-        menu.parent_id = parent_id
-        menu.label = label
-        menu.href = href
-        menu.icon = icon
-        menu.list_id = list_id
-        menu.badge_text = badge_text
-        menu.badge_class_name = badge_class_name
-        menu.is_active = is_active
-        menu.is_hidden = is_hidden
-        menu.show_more_toggle = show_more_toggle
-        menu.initially_open = initially_open
-        menu.depth = depth
-        menu.sort_order = sort_order
-
-    db.flush()
-    return menu
-
-
-def _seed_menu_items(
-    db: Session,
+def _flatten_menu_items(
+    items: list[dict[str, Any]],
     *,
     section_title: str,
-    items: list[dict[str, Any]],
     key_prefix: str,
-    parent_id: int | None = None,
+    parent_key: str | None = None,
     depth: int = 0,
-) -> None:
+) -> list[dict[str, Any]]:
+    """Ratakan tree menu menjadi baris berurutan parent-dulu dengan `parent_key`."""
+    rows: list[dict[str, Any]] = []
     for index, item in enumerate(items):
         badge = item.get("badge") or {}
-        label = item["label"]
-        item_slug = _slugify(label)
-        menu_key = f"{key_prefix}.{index}-{item_slug}"
-
-        menu = _upsert_menu(
-            db,
-            menu_key=menu_key,
-            section_title=section_title,
-            parent_id=parent_id,
-            label=label,
-            href=item.get("href"),
-            icon=item.get("icon"),
-            list_id=item.get("listId"),
-            badge_text=badge.get("text"),
-            badge_class_name=badge.get("className"),
-            is_active=bool(item.get("active", False)),
-            is_hidden=bool(item.get("hidden", False)),
-            show_more_toggle=bool(item.get("showMoreToggle", False)),
-            initially_open=bool(item.get("initiallyOpen", False)),
-            depth=depth,
-            sort_order=index,
+        menu_key = f"{key_prefix}.{index}-{_slugify(item['label'])}"
+        rows.append(
+            {
+                "menu_key": menu_key,
+                "parent_key": parent_key,
+                "section_title": section_title,
+                "label": item["label"],
+                "href": item.get("href"),
+                "icon": item.get("icon"),
+                "list_id": item.get("listId"),
+                "badge_text": badge.get("text"),
+                "badge_class_name": badge.get("className"),
+                "is_active": bool(item.get("active", False)),
+                "is_hidden": bool(item.get("hidden", False)),
+                "show_more_toggle": bool(item.get("showMoreToggle", False)),
+                "initially_open": bool(item.get("initiallyOpen", False)),
+                "depth": depth,
+                "sort_order": index,
+            }
         )
-
-        children = item.get("children") or []
-        if children:
-            _seed_menu_items(
-                db,
+        rows.extend(
+            _flatten_menu_items(
+                item.get("children") or [],
                 section_title=section_title,
-                items=children,
                 key_prefix=menu_key,
-                parent_id=menu.id,
+                parent_key=menu_key,
                 depth=depth + 1,
             )
+        )
+    return rows
 
 
-def _seed_menus(db: Session) -> None:
+def menu_rows() -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
     for section in MENU_SECTIONS:
-        section_title = section["title"]
-        _seed_menu_items(
-            db,
-            section_title=section_title,
-            items=section["items"],
-            key_prefix=_slugify(section_title),
+        rows.extend(
+            _flatten_menu_items(
+                section["items"],
+                section_title=section["title"],
+                key_prefix=_slugify(section["title"]),
+            )
         )
+    return rows
 
 
-def run_seed(db: Session) -> None:
-    permissions = {
-        "posts.read": "Read posts",
-        "posts.create": "Create posts",
-        "posts.update": "Update posts",
-        "posts.delete": "Delete posts",
-        "users.manage": "Manage users",
-    }
-    permission_map = {
-        code: _get_or_create_permission(db, code, description)
-        for code, description in permissions.items()
+def seed_fingerprint() -> str:
+    """Hash konten seluruh spesifikasi seed (urutan key dinormalisasi)."""
+    spec = {"permissions": PERMISSIONS, "roles": ROLES, "users": USERS, "menus": MENU_SECTIONS}
+    encoded = json.dumps(spec, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _ensure_rows(
+    db: Session,
+    entity: Any,
+    key_column: Any,
+    keys: list[str],
+    build: Callable[[str], dict[str, Any]],
+) -> dict[str, int]:
+    """Insert baris untuk key yang belum ada (lewat `build`); kembalikan peta key -> id."""
+    ids = dict(db.execute(select(key_column, entity.id).where(key_column.in_(keys))).all())
+    missing = [key for key in keys if key not in ids]
+    if missing:
+        db.execute(insert(entity), [build(key) for key in missing])
+        ids.update(
+            db.execute(select(key_column, entity.id).where(key_column.in_(missing))).all()
+        )
+    return ids
+
+
+def _sync_links(
+    db: Session,
+    owner: Any,
+    table: Any,
+    owner_column: Any,
+    target_column: Any,
+    owner_ids: list[int],
+    desired: set[tuple[int, int]],
+) -> None:
+    """Samakan relasi many-to-many milik `owner_ids` dengan pasangan `desired`."""
+    current = set(
+        db.execute(
+            select(owner_column, target_column).where(owner_column.in_(owner_ids))
+        ).all()
+    )
+    stale = current - desired
+    added = desired - current
+    if stale:
+        db.execute(delete(table).where(tuple_(owner_column, target_column).in_(stale)))
+    insert_ignore(
+        db,
+        table,
+        [{owner_column.key: owner_id, target_column.key: target} for owner_id, target in added],
+    )
+    # Seperti `RBACRepository._touch`: perubahan relasi menggeser updated_at pemiliknya
+    # agar sinyal ETag (`get_version_signal`) ikut berubah.
+    touched = {owner_id for owner_id, _ in stale | added}
+    if touched:
+        db.execute(update(owner).where(owner.id.in_(touched)).values(updated_at=utcnow()))
+
+
+def _sync_menus(db: Session) -> None:
+    rows = menu_rows()
+    fields = [key for key in rows[0] if key not in {"menu_key", "parent_key"}]
+    existing = {
+        menu.menu_key: menu
+        for menu in db.execute(
+            select(Menu.__table__).where(Menu.menu_key.in_([row["menu_key"] for row in rows]))
+        ).all()
     }
+    ids = {key: menu.id for key, menu in existing.items()}
+
+    # Per depth agar id parent sudah diketahui saat child di-insert/update.
+    for depth in sorted({row["depth"] for row in rows}):
+        inserts: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        for row in (row for row in rows if row["depth"] == depth):
+            values = {field: row[field] for field in fields}
+            values["parent_id"] = ids[row["parent_key"]] if row["parent_key"] else None
+            current = existing.get(row["menu_key"])
+            if current is None:
+                inserts.append({"menu_key": row["menu_key"], **values})
+            elif any(getattr(current, field) != value for field, value in values.items()):
+                updates.append({"id": current.id, **values})
+        if inserts:
+            db.execute(insert(Menu), inserts)
+            ids.update(
+                db.execute(
+                    select(Menu.menu_key, Menu.id).where(
+                        Menu.menu_key.in_([row["menu_key"] for row in inserts])
+                    )
+                ).all()
+            )
+        if updates:
+            now = utcnow()
+            db.execute(update(Menu), [{**row, "updated_at": now} for row in updates])
 
-    admin_role = _get_or_create_role(db, "admin", "Full system access")
-    editor_role = _get_or_create_role(db, "editor", "Edit and publish content")
-    writer_role = _get_or_create_role(db, "writer", "Write and manage own content")
 
-    admin_role.permissions = list(permission_map.values())
-    editor_role.permissions = [
-        permission_map["posts.read"],
-        permission_map["posts.create"],
-        permission_map["posts.update"],
-    ]
-    writer_role.permissions = [
-        permission_map["posts.read"],
-        permission_map["posts.create"],
-    ]
+def run_seed(db: Session) -> bool:
+    """Terapkan seed sample; kembalikan False jika dilewati karena fingerprint sama."""
+    fingerprint = seed_fingerprint()
+    state = db.get(SeedState, SEED_NAME)
+    if state is not None and state.fingerprint == fingerprint:
+        return False
 
-    admin_user = _get_or_create_user(db, "Admin Baldas", "admin@baldas.dev", "admin123")
-    editor_user = _get_or_create_user(
-        db, "Editor Baldas", "editor@baldas.dev", "editor123"
+    permission_ids = _ensure_rows(
+        db,
+        Permission,
+        Permission.code,
+        list(PERMISSIONS),
+        lambda code: {"code": code, "description": PERMISSIONS[code]},
+    )
+    role_ids = _ensure_rows(
+        db,
+        Role,
+        Role.name,
+        list(ROLES),
+        lambda name: {"name": name, "description": ROLES[name]["description"]},
     )
-    writer_user = _get_or_create_user(
-        db, "Writer Baldas", "writer@baldas.dev", "writer123"
+    _sync_links(
+        db,
+        Role,
+        RolePermission.__table__,
+        RolePermission.role_id,
+        RolePermission.permission_id,
+        list(role_ids.values()),
+        {
+            (role_ids[name], permission_ids[code])
+            for name, spec in ROLES.items()
+            for code in spec["permissions"]
+        },
     )
 
-    admin_user.roles = [admin_role]
-    editor_user.roles = [editor_role]
-    writer_user.roles = [writer_role]
+    users_by_email = {spec["email"]: spec for spec in USERS}
+    # `build` hanya dipanggil untuk user baru, jadi password user lama tidak di-hash ulang.
+    user_ids = _ensure_rows(
+        db,
+        User,
+        User.email,
+        list(users_by_email),
+        lambda email: {
+            "full_name": users_by_email[email]["full_name"],
+            "email": email,
+            "password_hash": hash_password(users_by_email[email]["password"]),
+            "is_active": True,
+        },
+    )
+    _sync_links(
+        db,
+        User,
+        UserRole.__table__,
+        UserRole.user_id,
+        UserRole.role_id,
+        list(user_ids.values()),
+        {(user_ids[spec["email"]], role_ids[name]) for spec in USERS for name in spec["roles"]},
+    )
 
-    _seed_menus(db)
+    _sync_menus(db)
 
+    if state is None:
+        db.add(SeedState(name=SEED_NAME, fingerprint=fingerprint))
+    else:
+        state.fingerprint = fingerprint
+    # Worker yang sedang berjalan membuang cache lokalnya saat melihat epoch baru.
+    bump_epochs(db, *FAMILIES)
     db.commit()
+    return True
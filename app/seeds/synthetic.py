@@ -0,0 +1,345 @@
+"""Generator dataset sintetis berskala besar untuk load/capacity testing.
+
+Contoh:
+
+    poetry run seed --scale users=1e6,roles=200,permissions=2000,menus=5000
+
+Data dibuat deterministik (RNG per batch diturunkan dari `--random-seed`, jenis
+data, dan nomor batch) dan terpisah dari data sample: email `@synthetic.dev`,
+role `syn-role-*`, permission `syn.*`, dan menu key `syn.*`. Generator bersifat
+additif: menjalankan ulang dengan skala lebih besar hanya menambah baris yang
+belum ada.
+
+Semua baris ditulis dengan INSERT Core multi-row per batch, satu commit per batch,
+dan satu hash bcrypt yang dipakai bersama semua user sintetis (password
+`synthetic123`). Id diberikan database (sequence PostgreSQL tetap sinkron dan
+aman dari insert paralel); id baris baru dibaca lewat `RETURNING` atau, untuk
+dialect tanpa dukungan itu, query ulang berdasarkan kunci unik yang deterministik.
+"""
+
+import random
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.security import hash_password
+from app.models import Menu, Permission, Role, RolePermission, User, UserRole
+
+SCALE_KEYS = ("users", "roles", "permissions", "menus")
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.dev"
+SYNTHETIC_PASSWORD = "synthetic123"
+ROLE_PREFIX = "syn-role-"
+PERMISSION_PREFIX = "syn."
+MENU_PREFIX = "syn."
+
+_FIRST_NAMES = (
+    "Adi", "Ayu", "Bima", "Citra", "Dewi", "Eka", "Fajar", "Gita", "Hadi", "Indah",
+    "Joko", "Kartika", "Lestari", "Made", "Nina", "Oki", "Putri", "Rizky", "Sari",
+    "Tono", "Udin", "Vina", "Wulan", "Yoga", "Zahra",
+)
+_LAST_NAMES = (
+    "Pratama", "Saputra", "Wijaya", "Hidayat", "Santoso", "Kusuma", "Nugroho",
+    "Lestari", "Siregar", "Nasution", "Hakim", "Utami", "Rahman", "Setiawan",
+    "Gunawan", "Purnomo", "Halim", "Susanto", "Firmansyah", "Ramadhan",
+)
+_RESOURCES = (
+    "posts", "users", "roles", "menus", "reports", "invoices", "orders", "products",
+    "customers", "payments", "settings", "audit", "files", "comments", "tags",
+)
+_ACTIONS = ("read", "create", "update", "delete", "export", "approve", "publish", "manage")
+_SECTIONS = (
+    "Dashboard", "Finance", "Sales", "Inventory", "Reports", "Settings", "Users",
+    "Content", "Marketing", "Support", "Analytics", "Billing",
+)
+_ICONS = ("home", "folder", "chart", "settings", "user", "file", "bell", "cart", None)
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_scale(spec: str) -> dict[str, int]:
+    """Parse `users=1e6,roles=200` menjadi dict jumlah baris per jenis data."""
+    scale: dict[str, int] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        key, _, value = part.partition("=")
+        key = key.strip()
+        if key not in SCALE_KEYS:
+            raise ValueError(f"Unknown scale key: {key} (allowed: {', '.join(SCALE_KEYS)})")
+        try:
+            count = int(float(value))
+        except ValueError as exc:
+            raise ValueError(f"Invalid scale value for {key}: {value!r}") from exc
+        if count < 0:
+            raise ValueError(f"Scale value for {key} must be >= 0")
+        scale[key] = count
+    return scale
+
+
+class SyntheticSeeder:
+    """Pembuat data sintetis per jenis dengan insert batch dan commit per batch."""
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        random_seed: int = 42,
+        batch_size: int = 10_000,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.db = db
+        self.random_seed = random_seed
+        self.batch_size = batch_size
+        self.log = log
+
+    def run(self, scale: dict[str, int]) -> dict[str, int]:
+        created: dict[str, int] = {}
+        # Urutan penting: permission & role dulu agar user/role bisa langsung dikaitkan.
+        for key, method in (
+            ("permissions", self.seed_permissions),
+            ("roles", self.seed_roles),
+            ("users", self.seed_users),
+            ("menus", self.seed_menus),
+        ):
+            if key in scale:
+                started = time.perf_counter()
+                created[key] = method(scale[key])
+                self.log(f"{key}: +{created[key]} rows in {time.perf_counter() - started:.1f}s")
+        return created
+
+    # --- util ----------------------------------------------------------------
+
+    def _rng(self, kind: str, batch_index: int) -> random.Random:
+        return random.Random(f"{self.random_seed}:{kind}:{batch_index}")
+
+    def _batches(
+        self, kind: str, start: int, stop: int
+    ) -> Iterator[tuple[random.Random, range]]:
+        """Batch `[start, stop)` sejajar kelipatan `batch_size` (deterministik saat resume)."""
+        batch_index = start // self.batch_size
+        while batch_index * self.batch_size < stop:
+            rng = self._rng(kind, batch_index)
+            lower = batch_index * self.batch_size
+            upper = min(lower + self.batch_size, stop)
+            yield rng, range(lower, upper)
+            batch_index += 1
+
+    def _insert(self, entity: Any, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            # Insert Core langsung ke tabel (tanpa lapisan ORM bulk) untuk throughput maksimal.
+            self.db.execute(insert(entity.__table__), rows)
+
+    def _insert_returning_ids(
+        self, entity: Any, rows: list[dict[str, Any]], key: str
+    ) -> dict[Any, int]:
+        """Insert batch lalu kembalikan peta nilai kolom unik `key` -> id dari database."""
+        if not rows:
+            return {}
+        table = entity.__table__
+        if self.db.get_bind().dialect.insert_executemany_returning:
+            result = self.db.execute(insert(table).returning(table.c[key], table.c.id), rows)
+            return {row[0]: row[1] for row in result}
+        self._insert(entity, rows)
+        keys = [row[key] for row in rows]
+        ids: dict[Any, int] = {}
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset : offset + 500]
+            query = select(table.c[key], table.c.id).where(table.c[key].in_(chunk))
+            ids.update({value: row_id for value, row_id in self.db.execute(query)})
+        return ids
+
+    def _synthetic_ids(self, entity: Any, column: Any, prefix: str) -> list[int]:
+        return list(
+            self.db.scalars(select(entity.id).where(column.like(f"{prefix}%")).order_by(entity.id))
+        )
+
+    # --- permissions ---------------------------------------------------------
+
+    def seed_permissions(self, target: int) -> int:
+        existing = self.db.scalar(
+            select(func.count(Permission.id)).where(Permission.code.like(f"{PERMISSION_PREFIX}%"))
+        )
+        combos = len(_RESOURCES) * len(_ACTIONS)
+        created = 0
+        for _, indexes in self._batches("permissions", existing, target):
+            rows = []
+            for index in indexes:
+                if index < existing:
+                    continue
+                resource = _RESOURCES[index % len(_RESOURCES)]
+                action = _ACTIONS[(index // len(_RESOURCES)) % len(_ACTIONS)]
+                generation = index // combos
+                suffix = f"{generation}" if generation else ""
+                rows.append(
+                    {
+                        "code": f"{PERMISSION_PREFIX}{resource}{suffix}.{action}",
+                        "description": f"{action.title()} {resource}",
+                        "created_at": _EPOCH,
+                        "updated_at": _EPOCH,
+                    }
+                )
+                created += 1
+            self._insert(Permission, rows)
+            self.db.commit()
+        return created
+
+    # --- roles ---------------------------------------------------------------
+
+    def seed_roles(self, target: int) -> int:
+        existing = self.db.scalar(
+            select(func.count(Role.id)).where(Role.name.like(f"{ROLE_PREFIX}%"))
+        )
+        permission_ids = self._synthetic_ids(Permission, Permission.code, PERMISSION_PREFIX)
+        created = 0
+        for rng, indexes in self._batches("roles", existing, target):
+            roles, grants = [], []
+            for index in indexes:
+                # RNG tetap dikonsumsi untuk index yang dilewati agar hasil deterministik.
+                grant_count = rng.randint(5, 50) if permission_ids else 0
+                granted = rng.sample(permission_ids, min(grant_count, len(permission_ids)))
+                if index < existing:
+                    continue
+                name = f"{ROLE_PREFIX}{index}"
+                roles.append(
+                    {
+                        "name": name,
+                        "description": f"Synthetic role {index}",
+                        "created_at": _EPOCH,
+                        "updated_at": _EPOCH,
+                    }
+                )
+                grants.append((name, granted))
+                created += 1
+            role_ids = self._insert_returning_ids(Role, roles, "name")
+            self._insert(
+                RolePermission,
+                [
+                    {"role_id": role_ids[name], "permission_id": pid}
+                    for name, granted in grants
+                    for pid in granted
+                ],
+            )
+            self.db.commit()
+        return created
+
+    # --- users ---------------------------------------------------------------
+
+    def seed_users(self, target: int) -> int:
+        existing = self.db.scalar(
+            select(func.count(User.id)).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}"))
+        )
+        if existing >= target:
+            return 0
+        role_ids = self._synthetic_ids(Role, Role.name, ROLE_PREFIX)
+        password_hash = hash_password(SYNTHETIC_PASSWORD)
+        created = 0
+        for rng, indexes in self._batches("users", existing, target):
+            users, assignments = [], []
+            for index in indexes:
+                first = rng.choice(_FIRST_NAMES)
+                last = rng.choice(_LAST_NAMES)
+                is_active = rng.random() >= 0.05
+                joined = _EPOCH + timedelta(seconds=rng.randrange(2 * 365 * 86400))
+                role_count = rng.randint(1, 3) if role_ids else 0
+                assigned = rng.sample(role_ids, min(role_count, len(role_ids)))
+                if index < existing:
+                    continue
+                email = f"{first.lower()}.{last.lower()}.{index}@{SYNTHETIC_EMAIL_DOMAIN}"
+                users.append(
+                    {
+                        "full_name": f"{first} {last}",
+                        "email": email,
+                        "password_hash": password_hash,
+                        "is_active": is_active,
+                        "created_at": joined,
+                        "updated_at": joined,
+                    }
+                )
+                assignments.append((email, assigned))
+                created += 1
+            user_ids = self._insert_returning_ids(User, users, "email")
+            self._insert(
+                UserRole,
+                [
+                    {"user_id": user_ids[email], "role_id": role_id}
+                    for email, assigned in assignments
+                    for role_id in assigned
+                ],
+            )
+            self.db.commit()
+            self.log(f"users: {existing + created}/{target}")
+        return created
+
+    # --- menus ---------------------------------------------------------------
+
+    def seed_menus(self, target: int) -> int:
+        rows = self.db.execute(
+            select(Menu.id, Menu.menu_key, Menu.section_title, Menu.depth)
+            .where(Menu.menu_key.like(f"{MENU_PREFIX}%"))
+            .order_by(Menu.id)
+        ).all()
+        existing = len(rows)
+        menu_ids = {row.menu_key: row.id for row in rows}
+        # Kandidat parent per section: node dengan depth < 2 (tree maksimal 3 level),
+        # disimpan per menu_key karena id baris baru baru diketahui setelah insert.
+        parents: dict[str, list[tuple[str, int]]] = {}
+        for row in rows:
+            if row.depth < 2:
+                parents.setdefault(row.section_title, []).append((row.menu_key, row.depth))
+        created = 0
+        for rng, indexes in self._batches("menus", existing, target):
+            batch: list[tuple[str | None, dict[str, Any]]] = []
+            for index in indexes:
+                section = _SECTIONS[index % len(_SECTIONS)]
+                candidates = parents.get(section, [])
+                is_root = not candidates or rng.random() < 0.1
+                parent_choice = None if is_root else rng.choice(candidates)
+                icon = rng.choice(_ICONS)
+                is_hidden = rng.random() < 0.03
+                if index < existing:
+                    continue
+                menu_key = f"{MENU_PREFIX}{section.lower()}.{index}"
+                parent_key, depth = (None, 0) if parent_choice is None else (
+                    parent_choice[0],
+                    parent_choice[1] + 1,
+                )
+                batch.append(
+                    (
+                        parent_key,
+                        {
+                            "menu_key": menu_key,
+                            "section_title": section,
+                            "label": f"{section} item {index}",
+                            "href": f"/{section.lower()}/item-{index}",
+                            "icon": icon,
+                            "list_id": None,
+                            "badge_text": None,
+                            "badge_class_name": None,
+                            "is_active": False,
+                            "is_hidden": is_hidden,
+                            "show_more_toggle": False,
+                            "initially_open": False,
+                            "depth": depth,
+                            "sort_order": index,
+                            "created_at": _EPOCH,
+                            "updated_at": _EPOCH,
+                        },
+                    )
+                )
+                if depth < 2:
+                    parents.setdefault(section, []).append((menu_key, depth))
+                created += 1
+            # Parent selalu satu level di atas anaknya: insert per depth agar id parent
+            # (termasuk yang dibuat di batch ini) sudah diketahui.
+            for level in range(3):
+                level_rows = [
+                    {**row, "parent_id": menu_ids[parent_key] if parent_key else None}
+                    for parent_key, row in batch
+                    if row["depth"] == level
+                ]
+                menu_ids.update(self._insert_returning_ids(Menu, level_rows, "menu_key"))
+            self.db.commit()
+        return created
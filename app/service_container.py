@@ -6,10 +6,12 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.repository.menu_repository import MenuRepository
 from app.repository.rbac_repository import RBACRepository
+from app.repository.user_import_repository import UserImportRepository
 from app.repository.user_repository import UserRepository
 from app.services.datatables_service import DataTablesService
 from app.services.menu_service import MenuService
 from app.services.rbac_service import RBACService
+from app.services.user_import_service import UserImportService
 from app.services.user_service import UserService
 
 
@@ -37,6 +39,19 @@ def get_user_service(
     return UserService(repository)
 
 
+def get_user_import_repository(db: Session = Depends(get_db)) -> UserImportRepository:
+    """Dependency provider: injeksi repository laporan import dengan Session database."""
+    return UserImportRepository(db)
+
+
+def get_user_import_service(
+    repository: UserRepository = Depends(get_user_repository),
+    reports: UserImportRepository = Depends(get_user_import_repository),
+) -> UserImportService:
+    """Dependency provider: injeksi service import user massal dengan repository."""
+    return UserImportService(repository, reports)
+
+
 def get_datatables_service(db: Session = Depends(get_db)) -> DataTablesService:
     """Dependency provider: injeksi service DataTables generik."""
     return DataTablesService(db)
@@ -1,9 +1,11 @@
 """Lapisan business logic untuk operasi CRUD menu."""
 
+from datetime import datetime
+
 from fastapi import HTTPException, status
 
 from app.models import Menu as MenuEntity
-from app.models.menu import MenuCreate, MenuUpdate
+from app.models.menu import MenuBulkUpdate, MenuCreate, MenuUpdate
 from app.repository.menu_repository import MenuRepository
 
 
@@ -29,6 +31,10 @@ class MenuService:
         # Kembalikan menu yang valid.
         return menu
 
+    def get_menu_updated_at(self, menu_id: int) -> datetime | None:
+        # Validator ETag ringan; None berarti menu tidak ada (404 ditangani get_menu).
+        return self.repository.get_updated_at(menu_id)
+
     def create_menu(self, payload: MenuCreate) -> MenuEntity:
         # Validasi menu_key harus unik sebelum insert.
         if self.repository.get_by_key(payload.menu_key):
@@ -83,6 +89,77 @@ class MenuService:
         # Proses update data di repository.
         return self.repository.update(menu, payload)
 
+    def get_tree_version(self) -> str:
+        # Versi tree = jumlah menu + timestamp updated_at terbaru.
+        count, latest = self.repository.get_version_signal()
+        stamp = latest.strftime("%Y%m%d%H%M%S%f") if latest else "0"
+        return f"{count}-{stamp}"
+
+    def bulk_update_menus(self, payload: MenuBulkUpdate) -> int:
+        # Satu snapshot (id -> menu_key, parent_id) dipakai untuk semua validasi.
+        snapshot = self.repository.get_tree_snapshot()
+        keys = {menu_id: key for menu_id, (key, _) in snapshot.items()}
+        parents = {menu_id: parent for menu_id, (_, parent) in snapshot.items()}
+
+        changes: list[dict] = []
+        seen_ids: set[int] = set()
+        for item in payload.items:
+            change = item.dict(exclude_unset=True)
+            menu_id = change["id"]
+            if menu_id not in snapshot:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Menu not found: {menu_id}",
+                )
+            if menu_id in seen_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Duplicate menu id in payload: {menu_id}",
+                )
+            if change.get("menu_key"):
+                keys[menu_id] = change["menu_key"]
+            if "parent_id" in change:
+                parent_id = change["parent_id"]
+                if parent_id == menu_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="parent_id cannot reference itself",
+                    )
+                if parent_id is not None and parent_id not in snapshot:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="parent_id is invalid",
+                    )
+                parents[menu_id] = parent_id
+            seen_ids.add(menu_id)
+            changes.append(change)
+
+        # Validasi menu_key tetap unik setelah seluruh perubahan diterapkan.
+        if len(set(keys.values())) != len(keys):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="menu_key already exists",
+            )
+
+        # Validasi perubahan parent tidak membentuk siklus di tree.
+        for change in changes:
+            if "parent_id" not in change:
+                continue
+            visited = {change["id"]}
+            current = parents.get(change["id"])
+            while current is not None:
+                if current in visited:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="parent_id creates a cycle",
+                    )
+                visited.add(current)
+                current = parents.get(current)
+
+        # Terapkan semua perubahan dalam satu transaksi.
+        self.repository.bulk_update(changes)
+        return len(changes)
+
     def delete_menu(self, menu_id: int) -> None:
         # Pastikan data yang akan dihapus ada.
         menu = self.get_menu(menu_id)
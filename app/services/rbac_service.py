@@ -1,7 +1,11 @@
 """Lapisan business logic untuk operasi RBAC."""
 
+from collections.abc import Callable
+from typing import Any
+
 from fastapi import HTTPException, status
 
+from app.core.audit import audit_log
 from app.models import Permission as PermissionEntity
 from app.models import Role as RoleEntity
 from app.models import User as UserEntity
@@ -9,10 +13,15 @@ from app.models.roles_permission import (
     PermissionCreate,
     PermissionUpdate,
     RoleCreate,
+    RolePermissionBulkAssign,
+    RolePermissionReplace,
     RoleUpdate,
+    UserRoleBulkAssign,
 )
 from app.repository.rbac_repository import RBACRepository
 
+_ENTITY_LABELS = {UserEntity: "User", RoleEntity: "Role", PermissionEntity: "Permission"}
+
 
 class RBACService:
     """Service untuk validasi dan orkestrasi operasi RBAC."""
@@ -20,6 +29,19 @@ class RBACService:
     def __init__(self, repository: RBACRepository) -> None:
         self.repository = repository
 
+    def get_version(self) -> str:
+        # Versi RBAC = jumlah + updated_at terbaru dari role dan permission.
+        role_count, role_latest, permission_count, permission_latest = (
+            self.repository.get_version_signal()
+        )
+        parts = [
+            str(role_count),
+            role_latest.strftime("%Y%m%d%H%M%S%f") if role_latest else "0",
+            str(permission_count),
+            permission_latest.strftime("%Y%m%d%H%M%S%f") if permission_latest else "0",
+        ]
+        return "-".join(parts)
+
     def list_roles(self, skip: int, limit: int) -> list[RoleEntity]:
         return self.repository.list_roles(skip=skip, limit=limit)
 
@@ -37,7 +59,9 @@ class RBACService:
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Role name already exists",
             )
-        return self.repository.create_role(payload)
+        role = self.repository.create_role(payload)
+        audit_log.record("role.create", "role", role.id, {"name": role.name})
+        return role
 
     def update_role(self, role_id: int, payload: RoleUpdate) -> RoleEntity:
         role = self.get_role(role_id)
@@ -50,11 +74,15 @@ class RBACService:
                     status_code=status.HTTP_409_CONFLICT,
                     detail="Role name already exists",
                 )
-        return self.repository.update_role(role, payload)
+        role = self.repository.update_role(role, payload)
+        audit_log.record("role.update", "role", role_id, changes)
+        return role
 
     def delete_role(self, role_id: int) -> None:
         role = self.get_role(role_id)
+        name = role.name
         self.repository.delete_role(role)
+        audit_log.record("role.delete", "role", role_id, {"name": name})
 
     def list_permissions(self, skip: int, limit: int) -> list[PermissionEntity]:
         return self.repository.list_permissions(skip=skip, limit=limit)
@@ -73,7 +101,11 @@ class RBACService:
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Permission code already exists",
             )
-        return self.repository.create_permission(payload)
+        permission = self.repository.create_permission(payload)
+        audit_log.record(
+            "permission.create", "permission", permission.id, {"code": permission.code}
+        )
+        return permission
 
     def update_permission(
         self, permission_id: int, payload: PermissionUpdate
@@ -88,11 +120,15 @@ class RBACService:
                     status_code=status.HTTP_409_CONFLICT,
                     detail="Permission code already exists",
                 )
-        return self.repository.update_permission(permission, payload)
+        permission = self.repository.update_permission(permission, payload)
+        audit_log.record("permission.update", "permission", permission_id, changes)
+        return permission
 
     def delete_permission(self, permission_id: int) -> None:
         permission = self.get_permission(permission_id)
+        code = permission.code
         self.repository.delete_permission(permission)
+        audit_log.record("permission.delete", "permission", permission_id, {"code": code})
 
     def get_user_roles(self, user_id: int) -> UserEntity:
         user = self.repository.get_user_with_roles(user_id)
@@ -102,37 +138,131 @@ class RBACService:
             )
         return user
 
-    def assign_role_to_user(self, user_id: int, role_id: int) -> UserEntity:
-        user = self.get_user_roles(user_id)
-        role = self.get_role(role_id)
-        return self.repository.assign_role_to_user(user, role)
+    def assign_role_to_user(self, user_id: int, role_id: int) -> list[Any]:
+        self._ensure_pair_exists((UserEntity, user_id), (RoleEntity, role_id))
+        self.repository.assign_role_to_user(user_id, role_id)
+        audit_log.record("user_role.assign", "user", user_id, {"role_id": role_id})
+        return self.repository.list_user_role_summaries(user_id)
 
-    def remove_role_from_user(self, user_id: int, role_id: int) -> UserEntity:
-        user = self.get_user_roles(user_id)
-        role = self.get_role(role_id)
-        if role not in user.roles:
+    def remove_role_from_user(self, user_id: int, role_id: int) -> list[Any]:
+        if not self.repository.remove_role_from_user(user_id, role_id):
+            # Tidak ada baris terhapus: bedakan entitas tidak ada vs belum di-assign.
+            self._ensure_pair_exists((UserEntity, user_id), (RoleEntity, role_id))
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Role assignment not found for user",
             )
-        return self.repository.remove_role_from_user(user, role)
+        audit_log.record("user_role.remove", "user", user_id, {"role_id": role_id})
+        return self.repository.list_user_role_summaries(user_id)
 
     def get_role_permissions(self, role_id: int) -> RoleEntity:
         return self.get_role(role_id)
 
-    def assign_permission_to_role(self, role_id: int, permission_id: int) -> RoleEntity:
-        role = self.get_role(role_id)
-        permission = self.get_permission(permission_id)
-        return self.repository.assign_permission_to_role(role, permission)
+    def assign_permission_to_role(self, role_id: int, permission_id: int) -> list[Any]:
+        self._ensure_pair_exists(
+            (RoleEntity, role_id), (PermissionEntity, permission_id)
+        )
+        self.repository.assign_permission_to_role(role_id, permission_id)
+        audit_log.record(
+            "role_permission.assign", "role", role_id, {"permission_id": permission_id}
+        )
+        return self.repository.list_role_permission_summaries(role_id)
 
     def remove_permission_from_role(
         self, role_id: int, permission_id: int
-    ) -> RoleEntity:
-        role = self.get_role(role_id)
-        permission = self.get_permission(permission_id)
-        if permission not in role.permissions:
+    ) -> list[Any]:
+        if not self.repository.remove_permission_from_role(role_id, permission_id):
+            self._ensure_pair_exists(
+                (RoleEntity, role_id), (PermissionEntity, permission_id)
+            )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Permission assignment not found for role",
             )
-        return self.repository.remove_permission_from_role(role, permission)
+        audit_log.record(
+            "role_permission.remove", "role", role_id, {"permission_id": permission_id}
+        )
+        return self.repository.list_role_permission_summaries(role_id)
+
+    def _ensure_pair_exists(
+        self, first: tuple[type[Any], int], second: tuple[type[Any], int]
+    ) -> None:
+        first_exists, second_exists = self.repository.entities_exist(first, second)
+        for entity, exists in ((first[0], first_exists), (second[0], second_exists)):
+            if not exists:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"{_ENTITY_LABELS[entity]} not found",
+                )
+
+    def bulk_assign_roles_to_users(self, payload: UserRoleBulkAssign) -> int:
+        pairs = {(pair.user_id, pair.role_id) for pair in payload.pairs}
+        self._ensure_exist(
+            "Users",
+            {user_id for user_id, _ in pairs},
+            self.repository.existing_user_ids,
+        )
+        self._ensure_exist(
+            "Roles",
+            {role_id for _, role_id in pairs},
+            self.repository.existing_role_ids,
+        )
+        inserted = self.repository.bulk_assign_roles_to_users(pairs)
+        audit_log.record(
+            "user_role.bulk_assign",
+            "user_role",
+            details={"pairs": sorted(pairs), "inserted": inserted},
+        )
+        return inserted
+
+    def bulk_assign_permissions_to_roles(
+        self, payload: RolePermissionBulkAssign
+    ) -> int:
+        pairs = {(pair.role_id, pair.permission_id) for pair in payload.pairs}
+        self._ensure_exist(
+            "Roles",
+            {role_id for role_id, _ in pairs},
+            self.repository.existing_role_ids,
+        )
+        self._ensure_exist(
+            "Permissions",
+            {permission_id for _, permission_id in pairs},
+            self.repository.existing_permission_ids,
+        )
+        inserted = self.repository.bulk_assign_permissions_to_roles(pairs)
+        audit_log.record(
+            "role_permission.bulk_assign",
+            "role_permission",
+            details={"pairs": sorted(pairs), "inserted": inserted},
+        )
+        return inserted
+
+    def replace_role_permissions(
+        self, role_id: int, payload: RolePermissionReplace
+    ) -> RoleEntity:
+        self._ensure_exist("Roles", {role_id}, self.repository.existing_role_ids)
+        permission_ids = set(payload.permission_ids)
+        if permission_ids:
+            self._ensure_exist(
+                "Permissions", permission_ids, self.repository.existing_permission_ids
+            )
+        role = self.repository.replace_role_permissions(role_id, permission_ids)
+        audit_log.record(
+            "role_permission.replace",
+            "role",
+            role_id,
+            {"permission_ids": sorted(permission_ids)},
+        )
+        return role
+
+    @staticmethod
+    def _ensure_exist(
+        label: str, ids: set[int], lookup: Callable[[set[int]], set[int]]
+    ) -> None:
+        # Satu query IN (...) per jenis entitas untuk memvalidasi semua id.
+        missing = ids - lookup(ids)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{label} not found: {sorted(missing)}",
+            )
@@ -0,0 +1,251 @@
+"""Import user massal dari stream CSV / NDJSON.
+
+Alur per chunk (`USER_IMPORT_BATCH_SIZE` baris):
+1. Validasi tiap baris dengan `UserCreate`; baris gagal dicatat di laporan error.
+2. Cek email yang sudah terdaftar sekaligus dengan satu query `IN (...)`.
+3. Hash password paralel di process pool (bcrypt terikat CPU).
+4. Simpan semua baris valid dengan satu INSERT multi-row dan satu commit.
+
+Body request dibaca bertahap, sehingga memori tetap terbatas berapapun ukuran
+file. Progress import disimpan ke tabel `user_imports` setiap selesai satu chunk,
+sehingga `GET /user/import/{import_id}` bisa dilayani worker mana pun selama dan
+setelah proses berjalan.
+"""
+
+import codecs
+import csv
+import json
+import multiprocessing
+import threading
+import uuid
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.core.audit import audit_log
+from app.core.config import UserImportSettings
+from app.core.database import utcnow
+from app.core.security import hash_password
+from app.models.user import UserCreate, UserImportReport, UserImportRowError
+from app.repository.user_import_repository import UserImportRepository
+from app.repository.user_repository import UserRepository
+
+settings = UserImportSettings()
+
+# Batas percobaan ulang insert chunk setelah bentrok email dengan insert paralel.
+_INSERT_ATTEMPTS = 3
+
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
+
+
+def _hash_password(password: str) -> str:
+    # Fungsi top-level agar bisa di-pickle ke worker process.
+    return hash_password(password)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor | None:
+    global _hash_pool
+    if settings.hash_workers <= 1:
+        return None
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # `spawn` menghindari fork dari proses yang sudah punya thread/koneksi DB.
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _hash_pool
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    pool = _get_hash_pool()
+    if pool is None or len(passwords) < 2:
+        return [_hash_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (settings.hash_workers * 4))
+    return list(pool.map(_hash_password, passwords, chunksize=chunksize))
+
+
+async def iter_records(
+    stream: AsyncIterator[bytes], fmt: str
+) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Parse body stream menjadi `(nomor_baris, record, error_parse)` per baris.
+
+    Record CSV harus satu baris (tanpa newline di dalam field), baris pertama
+    adalah header kolom (`full_name,email,password,is_active`).
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    header: list[str] | None = None
+    row_number = 0
+
+    def parse(line: str) -> tuple[dict[str, Any] | None, str | None]:
+        nonlocal header
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                return None, f"Invalid JSON: {exc.msg}"
+            if not isinstance(record, dict):
+                return None, "Each line must be a JSON object"
+            return record, None
+        columns = header or []
+        values = next(csv.reader([line]))
+        if len(values) != len(columns):
+            return None, f"Expected {len(columns)} columns, got {len(values)}"
+        # Kolom kosong dibuang agar default `UserCreate` (misal is_active) berlaku.
+        return {key: value for key, value in zip(columns, values) if value != ""}, None
+
+    async def lines() -> AsyncIterator[str]:
+        nonlocal buffer
+        async for chunk in stream:
+            buffer += decoder.decode(chunk)
+            *complete, buffer = buffer.split("\n")
+            for line in complete:
+                yield line
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer
+
+    async for raw_line in lines():
+        line = raw_line.rstrip("\r")
+        if not line.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [column.strip() for column in next(csv.reader([line]))]
+            continue
+        row_number += 1
+        record, error = parse(line)
+        yield row_number, record, error
+
+
+class UserImportService:
+    """Service untuk memproses chunk import user secara batch."""
+
+    def __init__(
+        self, repository: UserRepository, reports: UserImportRepository
+    ) -> None:
+        self.repository = repository
+        self.reports = reports
+        self._seen_emails: set[str] = set()
+
+    def start(self, import_id: str | None = None) -> UserImportReport:
+        report = UserImportReport(
+            import_id=import_id or uuid.uuid4().hex, started_at=utcnow()
+        )
+        if not self.reports.create(report):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail="Import id is already in use"
+            )
+        return report
+
+    def finish(self, report: UserImportReport, outcome: str) -> None:
+        report.status = outcome
+        report.finished_at = utcnow()
+        self.reports.save(report)
+
+    def get_report(self, import_id: str) -> UserImportReport | None:
+        entity = self.reports.get(import_id)
+        return UserImportReport.from_orm(entity) if entity else None
+
+    def import_chunk(
+        self,
+        report: UserImportReport,
+        chunk: Iterable[tuple[int, dict[str, Any] | None, str | None]],
+    ) -> None:
+        candidates: list[tuple[int, UserCreate]] = []
+        for row_number, record, parse_error in chunk:
+            report.processed += 1
+            if parse_error is not None or record is None:
+                self._fail(report, row_number, None, parse_error or "Empty record")
+                continue
+            try:
+                payload = UserCreate(**record)
+            except ValidationError as exc:
+                message = "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                    for err in exc.errors()
+                )
+                self._fail(report, row_number, record.get("email"), message)
+                continue
+            email = str(payload.email)
+            if email in self._seen_emails:
+                self._fail(report, row_number, email, "Duplicate email in import")
+                continue
+            self._seen_emails.add(email)
+            candidates.append((row_number, payload))
+
+        existing = self.repository.existing_emails(
+            str(payload.email) for _, payload in candidates
+        )
+        fresh: list[tuple[int, UserCreate]] = []
+        for row_number, payload in candidates:
+            if str(payload.email) in existing:
+                self._fail(
+                    report, row_number, str(payload.email), "Email is already registered"
+                )
+            else:
+                fresh.append((row_number, payload))
+
+        password_hashes = hash_passwords([payload.password for _, payload in fresh])
+        rows = [
+            (
+                row_number,
+                {
+                    "full_name": payload.full_name,
+                    "email": str(payload.email),
+                    "password_hash": password_hash,
+                    "is_active": payload.is_active,
+                },
+            )
+            for (row_number, payload), password_hash in zip(fresh, password_hashes)
+        ]
+        created = self._create_rows(report, rows)
+        report.created += created
+        if created:
+            audit_log.record("user.import", "import", report.import_id, {"created": created})
+        report.chunks += 1
+        self.reports.save(report)
+
+    def _create_rows(
+        self, report: UserImportReport, rows: list[tuple[int, dict[str, Any]]]
+    ) -> int:
+        """Insert baris chunk dan kembalikan jumlah user yang dibuat.
+
+        Jika insert bentrok dengan import/registrasi paralel, hanya email yang
+        benar-benar sudah terdaftar yang dilaporkan gagal; sisanya dicoba ulang.
+        """
+        for _ in range(_INSERT_ATTEMPTS):
+            if not rows:
+                return 0
+            try:
+                return self.repository.bulk_create([row for _, row in rows])
+            except IntegrityError:
+                taken = self.repository.existing_emails(row["email"] for _, row in rows)
+            if not taken:
+                break
+            for row_number, row in rows:
+                if row["email"] in taken:
+                    self._fail(report, row_number, row["email"], "Email is already registered")
+            rows = [(row_number, row) for row_number, row in rows if row["email"] not in taken]
+        for row_number, row in rows:
+            self._fail(report, row_number, row["email"], "Could not insert user")
+        return 0
+
+    @staticmethod
+    def _fail(
+        report: UserImportReport, row_number: int, email: Any, error: str
+    ) -> None:
+        report.failed += 1
+        if len(report.errors) >= settings.max_errors:
+            report.errors_truncated = True
+            return
+        report.errors.append(
+            UserImportRowError(
+                row=row_number, email=str(email) if email else None, error=error
+            )
+        )
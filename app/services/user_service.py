@@ -1,14 +1,13 @@
 """Lapisan business logic untuk operasi CRUD user."""
 
 from fastapi import HTTPException, status
-from passlib.context import CryptContext
 
+from app.core.audit import audit_log
+from app.core.security import hash_password
 from app.models import User as UserEntity
 from app.models.user import UserCreate, UserUpdate
 from app.repository.user_repository import UserRepository
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class UserService:
     """Service untuk validasi dan orkestrasi operasi user."""
@@ -34,8 +33,10 @@ class UserService:
                 detail="Email is already registered",
             )
 
-        password_hash = pwd_context.hash(payload.password)
-        return self.repository.create(payload=payload, password_hash=password_hash)
+        password_hash = hash_password(payload.password)
+        user = self.repository.create(payload=payload, password_hash=password_hash)
+        audit_log.record("user.create", "user", user.id, {"email": user.email})
+        return user
 
     def update_user(self, user_id: int, payload: UserUpdate) -> UserEntity:
         user = self.get_user(user_id)
@@ -52,11 +53,17 @@ class UserService:
             changes["email"] = str(new_email)
 
         new_password = changes.pop("password", None)
+        # Detail audit tidak pernah memuat password maupun hash-nya.
+        details = {**changes, "password_changed": bool(new_password)}
         if new_password:
-            changes["password_hash"] = pwd_context.hash(new_password)
+            changes["password_hash"] = hash_password(new_password)
 
-        return self.repository.update(user=user, changes=changes)
+        user = self.repository.update(user=user, changes=changes)
+        audit_log.record("user.update", "user", user_id, details)
+        return user
 
     def delete_user(self, user_id: int) -> None:
         user = self.get_user(user_id)
+        email = user.email
         self.repository.delete(user)
+        audit_log.record("user.delete", "user", user_id, {"email": email})
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def plan_check_dialect(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Database SQLite temporary yang dimigrasi dan di-seed sekali untuk semua test."""
+    from app.bench.plan_check import prepare_database
+
+    path = tmp_path_factory.mktemp("plan-check") / "plan-check.db"
+    return prepare_database(f"sqlite:///{path}")
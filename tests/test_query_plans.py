@@ -0,0 +1,11 @@
+from app.bench.plan_check import check_plans, load_snapshot
+
+
+def test_query_plans_use_indexes(plan_check_dialect: str) -> None:
+    plans, violations = check_plans()
+
+    assert violations == []
+    assert plans == load_snapshot(plan_check_dialect)["plans"], (
+        "Plan query berbeda dari snapshot; jalankan `poetry run plan-check --update` "
+        "jika perubahan disengaja."
+    )
@@ -0,0 +1,11 @@
+from app.bench.plan_check import count_statements, load_snapshot
+
+
+def test_statement_counts_within_budget(plan_check_dialect: str) -> None:
+    counts, violations = count_statements()
+
+    assert violations == []
+    assert counts == load_snapshot(plan_check_dialect)["statements"], (
+        "Jumlah statement berbeda dari snapshot; jalankan `poetry run plan-check --update` "
+        "jika perubahan disengaja."
+    )